@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""Mode batch: menjalankan file berisi banyak query pencarian tanpa menu.
+
+Contoh:
+    python batch_search.py queries.jsonl --output hasil.jsonl --workers 4
+
+Format input:
+  - JSONL: satu objek per baris, misal
+    {"id": "u21_cb", "country": "Spain", "age": [18, 21], "positions": ["CB"], "top": 20}
+  - CSV: kolom id, name, club, league, country, potential_min, potential_max,
+    age_min, age_max, overall_min, overall_max, positions (misal "CB|LB"),
+    position_mode, top, by
+
+Data dimuat sekali. Di Linux/macOS worker dibuat dengan fork sehingga
+berbagi memori dengan proses utama; di Windows setiap worker memuat
+snapshot .npy lewat memory-map. Data tidak pernah di-pickle ke worker.
+Hasil ditulis bertahap ke JSONL atau CSV sesuai urutan query.
+"""
+import argparse
+import csv
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+
+import player_profile as profile
+from player_query import SPEC_RANGES, build_query, load_dataset
+from player_store import DEFAULT_CSV_PATH
+
+# Kolom yang ditulis untuk setiap pemain hasil query
+OUTPUT_COLUMNS = [
+    'sofifa_id', 'long_name', 'short_name', 'age', 'player_positions',
+    'overall', 'potential', 'club_name', 'league_name', 'nationality_name',
+]
+# Batas hasil per query jika spesifikasi tidak menyebut `top`
+DEFAULT_TOP = 20
+
+# Dataset milik proses worker (diisi sebelum fork atau oleh initializer)
+_DATASET = None
+
+def read_specs(path):
+    """Membaca spesifikasi query dari file JSONL atau CSV secara bertahap"""
+    if path.lower().endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            for i, row in enumerate(csv.DictReader(f), 1):
+                yield spec_from_csv_row(row, i)
+    else:
+        with open(path, encoding='utf-8') as f:
+            for i, line in enumerate(f, 1):
+                line = line.strip()
+                if line:
+                    spec = json.loads(line)
+                    spec.setdefault('id', str(i))
+                    yield spec
+
+def spec_from_csv_row(row, line_number):
+    """Mengubah satu baris CSV menjadi spesifikasi query (dict)"""
+    row = {key: (value or '').strip() for key, value in row.items() if key}
+    spec = {'id': row.get('id') or str(line_number)}
+    for key in ('name', 'club', 'league', 'country', 'positions', 'position_mode', 'by'):
+        if row.get(key):
+            spec[key] = row[key]
+    for key in SPEC_RANGES:
+        low, high = row.get(key + '_min'), row.get(key + '_max')
+        if low or high:
+            spec[key] = [float(low) if low else -math.inf, float(high) if high else math.inf]
+    if row.get('top'):
+        spec['top'] = int(row['top'])
+    return spec
+
+def plain_value(value):
+    """Nilai NaN menjadi None agar aman untuk JSON/CSV"""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+def run_spec(dataset, spec):
+    """Menjalankan satu spesifikasi query dan mengembalikan record hasil"""
+    try:
+        spec = dict(spec)
+        spec.setdefault('top', DEFAULT_TOP)
+        with profile.query(f'query {spec.get("id")}'):
+            query = build_query(dataset, spec)
+            columns = [c for c in OUTPUT_COLUMNS if c in dataset.df.columns]
+            rows = query.row_ids()
+            with profile.stage('render', len(rows)):
+                players = [
+                    {col: plain_value(value) for col, value in record.items()}
+                    for record in query.records(columns, rows)
+                ]
+            return {'id': spec['id'], 'total': int(query.count()), 'players': players}
+    except Exception as e:
+        return {'id': spec.get('id'), 'error': str(e)}
+
+def _init_worker(csv_path):
+    """Initializer untuk worker spawn: memuat snapshot lewat memory-map"""
+    global _DATASET
+    if _DATASET is None:
+        _DATASET = load_dataset(csv_path)
+
+def _run_chunk(specs):
+    return [run_spec(_DATASET, spec) for spec in specs]
+
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class ResultWriter:
+    """Menulis hasil query bertahap ke JSONL (per query) atau CSV (per pemain)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.is_csv = path.lower().endswith('.csv')
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        if self.is_csv:
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(['query_id', 'rank', 'total', 'error'] + OUTPUT_COLUMNS)
+
+    def write(self, record):
+        if not self.is_csv:
+            self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        elif 'error' in record:
+            self.writer.writerow([record['id'], '', '', record['error']] + [''] * len(OUTPUT_COLUMNS))
+        elif not record['players']:
+            # Tetap satu baris agar query tanpa hasil terlihat di output
+            self.writer.writerow([record['id'], '', record['total'], ''] + [''] * len(OUTPUT_COLUMNS))
+        else:
+            for rank, player in enumerate(record['players'], 1):
+                self.writer.writerow([record['id'], rank, record['total'], '']
+                                     + [player.get(col, '') for col in OUTPUT_COLUMNS])
+
+    def close(self):
+        self.file.close()
+
+def make_pool(workers, csv_path):
+    """Process pool yang berbagi dataset tanpa pickle"""
+    if 'fork' in multiprocessing.get_all_start_methods():
+        # Worker hasil fork mewarisi _DATASET milik proses utama (copy-on-write)
+        return multiprocessing.get_context('fork').Pool(workers)
+    # Tanpa fork (Windows): worker memuat snapshot .npy lewat memory-map
+    return multiprocessing.get_context('spawn').Pool(
+        workers, initializer=_init_worker, initargs=(csv_path,))
+
+def run_batch(input_path, output_path, csv_path=DEFAULT_CSV_PATH, workers=None, chunk_size=16):
+    """Menjalankan semua query pada file input; mengembalikan (jumlah query, jumlah error)"""
+    global _DATASET
+    workers = workers or os.cpu_count() or 1
+    # Dataset dimuat sekali di proses utama (sekaligus memastikan snapshot ada)
+    _DATASET = load_dataset(csv_path)
+    chunks = chunked(read_specs(input_path), chunk_size)
+    pool = make_pool(workers, csv_path) if workers > 1 else None
+    writer = ResultWriter(output_path)
+    done = errors = 0
+    try:
+        result_chunks = pool.imap(_run_chunk, chunks) if pool else map(_run_chunk, chunks)
+        for records in result_chunks:
+            for record in records:
+                writer.write(record)
+                done += 1
+                errors += 'error' in record
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.terminate()
+    return done, errors
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Menjalankan file query pencarian pemain (JSONL/CSV)')
+    parser.add_argument('input', help='File query (.jsonl atau .csv)')
+    parser.add_argument('--output', '-o', required=True, help='File hasil (.jsonl atau .csv)')
+    parser.add_argument('--data', default=DEFAULT_CSV_PATH, help='Lokasi fifa_players.csv')
+    parser.add_argument('--workers', '-w', type=int, default=None,
+                        help='Jumlah proses worker (default: jumlah core)')
+    parser.add_argument('--chunk-size', type=int, default=16,
+                        help='Jumlah query per tugas worker')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        done, errors = run_batch(args.input, args.output, args.data,
+                                 workers=args.workers, chunk_size=args.chunk_size)
+    except FileNotFoundError as e:
+        print('[ERROR] File tidak ditemukan:', e.filename)
+        return 1
+    elapsed = time.perf_counter() - start
+    print(f'[OK] {done} query selesai dalam {elapsed:.2f} detik ({errors} error) -> {args.output}')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
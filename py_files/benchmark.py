@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+"""Benchmark pemuatan dan pencarian pemain pada dataset sintetis berbagai ukuran.
+
+Untuk setiap ukuran, file sintetis dibuat sekali (generate_players.py) lalu
+diukur di proses terpisah agar memori puncak (RSS) tercatat per ukuran:
+load (CSV dan snapshot), setiap jenis pencarian menu, rantai filter,
+tampilan hasil (top-k + format halaman), dan ekspor. Hasil disimpan sebagai
+JSON dan bisa dibandingkan dengan hasil commit lain.
+
+Waktu start search_players.py (import modul dan waktu sampai menu pertama
+muncul) juga diukur dan dibandingkan dengan batas STARTUP_BUDGET_MS.
+
+Contoh:
+    python benchmark.py --sizes 20000 200000 1000000 --output bench.json
+    python benchmark.py --sizes 20000 --output baru.json --compare bench.json
+    python benchmark.py --startup-only
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from generate_players import generate
+from player_query import load_dataset
+from player_render import ResultCursor, export_rows, format_blocks, format_table
+from player_store import fold_text, snapshot_dir
+
+DEFAULT_SIZES = [20000, 200000, 1000000]
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'csv_files', 'benchmark')
+QUERIES_PER_CASE = 50
+# Rasio median terhadap hasil pembanding yang dianggap regresi
+REGRESSION_RATIO = 1.25
+# Batas waktu sampai menu pertama search_players.py muncul
+STARTUP_BUDGET_MS = 300
+STARTUP_RUNS = 7
+SEARCH_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'search_players.py')
+MENU_PROMPT = b'Masukkan pilihan'
+
+def peak_rss_mb():
+    """Memori puncak proses ini (MB), atau None jika tidak tersedia (Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS byte
+    return round(peak / (1 << 20 if sys.platform == 'darwin' else 1 << 10), 1)
+
+def summarize(durations):
+    """Statistik waktu (detik) sekumpulan operasi"""
+    total = sum(durations)
+    ordered = sorted(durations)
+    return {
+        'ops': len(durations),
+        'total_s': round(total, 4),
+        'median_ms': round(statistics.median(ordered) * 1000, 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000, 3),
+        'ops_per_s': round(len(durations) / total, 1) if total else None,
+    }
+
+def time_case(func, inputs, before=None):
+    """Menjalankan func untuk setiap input dan mencatat waktu per operasi.
+
+    `before(item)` dipanggil di luar pengukuran, misal untuk mengosongkan cache.
+    """
+    durations = []
+    for item in inputs:
+        if before is not None:
+            before(item)
+        start = time.perf_counter()
+        func(item)
+        durations.append(time.perf_counter() - start)
+    return summarize(durations)
+
+def make_inputs(dataset, rng, count=QUERIES_PER_CASE):
+    """Input query realistis yang diambil dari isi dataset"""
+    n = len(dataset)
+    names = dataset.column('long_name')[rng.integers(n, size=count)]
+    words = [str(name).split()[-1] for name in names]
+    # Potongan nama (4-6 huruf) dan versi salah ketik (satu huruf diganti)
+    partial = [word[:int(rng.integers(4, 7))] for word in words]
+    typos = [w[:len(w) // 2] + 'x' + w[len(w) // 2 + 1:] if len(w) > 3 else w + 'x' for w in words]
+    clubs = dataset.indexes.hierarchy.clubs.labels()
+    countries = dataset.indexes.nations.labels()
+    positions = ['GK', 'CB', 'LB', 'RB', 'CDM', 'CM', 'CAM', 'LW', 'RW', 'ST']
+    low = rng.integers(60, 86, size=count)
+    young = rng.integers(16, 30, size=count)
+    return {
+        'name': partial,
+        'fuzzy': typos,
+        'club': [clubs[i] for i in rng.integers(len(clubs), size=count)],
+        'country': [countries[i] for i in rng.integers(len(countries), size=count)],
+        'potential': [(int(lo), int(lo) + 8) for lo in low],
+        'age': [(int(a), int(a) + 3) for a in young],
+        'position': [[positions[i] for i in rng.choice(len(positions), 2, replace=False)]
+                     for _ in range(count)],
+    }
+
+def run_cases(dataset, inputs):
+    """Mengukur setiap jenis pencarian seperti yang dipanggil menu.
+
+    Cache hasil dikosongkan sebelum setiap operasi, sehingga input yang
+    berulang tetap mengukur jalur query; jalur cache diukur terpisah
+    pada kasus *_cached (input yang sama sudah dijalankan sekali).
+    """
+    def cold(item):
+        dataset.cache.clear()
+
+    def search_name(text):
+        query = dataset.query().name(text)
+        query.count()
+        query.refine().top(10).row_ids()
+
+    def search_fuzzy(text):
+        dataset.indexes.names.fuzzy(fold_text(text), limit=20)
+
+    def top20(query, by='overall'):
+        query.count()
+        query.refine().top(20, by=by).row_ids()
+
+    def filter_chain(i):
+        # Urutan seperti apply_filter: setiap langkah menampilkan sisa pemain
+        query = dataset.query().name(inputs['name'][i])
+        query.count()
+        for step in (lambda q: q.country(inputs['country'][i]),
+                     lambda q: q.age(*inputs['age'][i]),
+                     lambda q: q.positions(inputs['position'][i], 'any')):
+            query = step(query.refine())
+            query.count()
+        query.refine().top(20).row_ids()
+
+    def display_page(low):
+        # Seperti display_results: halaman pertama lalu berikutnya, diperingkat bertahap
+        query = dataset.query().overall(low, 99)
+        cursor = ResultCursor(lambda k: query.refine().top(k, by='overall').row_ids(),
+                              query.count(), page_size=20)
+        format_blocks(dataset, cursor.current())
+        format_blocks(dataset, cursor.next())
+
+    def display_table(low):
+        query = dataset.query().overall(low, 99)
+        rows = query.refine().top(100, by='overall').row_ids()
+        format_table(dataset, rows)
+
+    count = len(inputs['name'])
+    return {
+        'search_name': time_case(search_name, inputs['name'], cold),
+        'search_fuzzy': time_case(search_fuzzy, inputs['fuzzy'], cold),
+        'search_club': time_case(lambda club: top20(dataset.query().club(club)), inputs['club'], cold),
+        'search_country': time_case(lambda c: top20(dataset.query().country(c)), inputs['country'], cold),
+        'search_potential': time_case(lambda r: top20(dataset.query().potential(*r), 'potential'),
+                                      inputs['potential'], cold),
+        'search_age': time_case(lambda r: top20(dataset.query().age(*r)), inputs['age'], cold),
+        'search_position': time_case(lambda p: top20(dataset.query().positions(p, 'any')),
+                                     inputs['position'], cold),
+        'filter_chain': time_case(filter_chain, range(count), cold),
+        'display_page': time_case(display_page, [60, 70, 80, 85, 90] * 2, cold),
+        'display_table': time_case(display_table, [60, 70, 80, 85, 90] * 2, cold),
+        # Jalur cache: input yang sama dijalankan sekali dulu (tidak diukur)
+        'filter_chain_cached': time_case(filter_chain, range(count), filter_chain),
+        'display_page_cached': time_case(display_page, [60, 70, 80, 85, 90] * 2, display_page),
+    }
+
+def bench_file(csv_path, seed=0):
+    """Benchmark lengkap satu file (dijalankan di proses anak)"""
+    shutil.rmtree(snapshot_dir(csv_path), ignore_errors=True)
+    cases = {}
+    start = time.perf_counter()
+    dataset = load_dataset(csv_path)
+    cases['load_csv'] = summarize([time.perf_counter() - start])
+    start = time.perf_counter()
+    dataset = load_dataset(csv_path)
+    cases['load_snapshot'] = summarize([time.perf_counter() - start])
+    rss_after_load = peak_rss_mb()
+
+    cases.update(run_cases(dataset, make_inputs(dataset, np.random.default_rng(seed))))
+
+    rows = dataset.query().overall(70, 99).row_ids()
+    with tempfile.TemporaryDirectory() as folder:
+        start = time.perf_counter()
+        export_rows(dataset, rows, os.path.join(folder, 'hasil.csv'))
+        cases['export_csv'] = summarize([time.perf_counter() - start])
+    cases['export_csv']['rows'] = len(rows)
+    return {
+        'rows': len(dataset),
+        'file_mb': round(os.path.getsize(csv_path) / (1 << 20), 1),
+        'peak_rss_after_load_mb': rss_after_load,
+        'peak_rss_mb': peak_rss_mb(),
+        'cache': dataset.cache.stats(),
+        'cases': cases,
+    }
+
+def import_time_ms():
+    """Waktu import search_players (kumulatif, dari python -X importtime)"""
+    child = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import search_players'],
+                           capture_output=True, text=True, cwd=os.path.dirname(SEARCH_SCRIPT), check=True)
+    for line in reversed(child.stderr.splitlines()):
+        # Format baris: "import time: self [us] | cumulative | imported package"
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] == 'search_players':
+            return int(parts[1]) / 1000
+    raise RuntimeError('search_players tidak ditemukan di output -X importtime')
+
+def first_prompt_ms(csv_path=None):
+    """Waktu dari start proses sampai menu search_players meminta input"""
+    command = [sys.executable, SEARCH_SCRIPT] + (['--csv', csv_path] if csv_path else [])
+    start = time.perf_counter()
+    child = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                             stderr=subprocess.DEVNULL)
+    output = b''
+    while MENU_PROMPT not in output:
+        chunk = os.read(child.stdout.fileno(), 4096)
+        if not chunk:
+            break
+        output += chunk
+    elapsed = (time.perf_counter() - start) * 1000
+    child.communicate(b'0\n')
+    if MENU_PROMPT not in output:
+        raise RuntimeError('Menu search_players tidak muncul')
+    return elapsed
+
+def bench_startup(csv_path=None, runs=STARTUP_RUNS):
+    """Median waktu import dan waktu sampai menu pertama (ms)"""
+    imports = [import_time_ms() for _ in range(runs)]
+    prompts = [first_prompt_ms(csv_path) for _ in range(runs)]
+    return {
+        'runs': runs,
+        'import_ms': round(statistics.median(imports), 1),
+        'first_prompt_ms': round(statistics.median(prompts), 1),
+        'first_prompt_max_ms': round(max(prompts), 1),
+    }
+
+def print_startup(startup):
+    ok = startup['first_prompt_ms'] <= STARTUP_BUDGET_MS
+    print(f'\n{"[OK]" if ok else "[X]"} Start search_players.py: import {startup["import_ms"]:.1f} ms, '
+          f'menu pertama {startup["first_prompt_ms"]:.1f} ms (batas {STARTUP_BUDGET_MS} ms)')
+    return ok
+
+def ensure_data(size, data_dir, seed):
+    """Lokasi file sintetis untuk satu ukuran; dibuat jika belum ada"""
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f'players_{size}.csv')
+    if not os.path.exists(path):
+        print(f'[INFO] Membuat data sintetis {size} baris -> {path}')
+        generate(size, path, seed=seed)
+    return path
+
+def git_commit():
+    """Commit saat ini (untuk membandingkan hasil antar commit), atau None"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(previous, current):
+    """Mencetak perbandingan median per kasus; mengembalikan jumlah regresi"""
+    old = {(r['rows'], name): case for r in previous['results'] for name, case in r['cases'].items()}
+    regressions = 0
+    print(f'\nPerbandingan dengan commit {previous.get("commit")}:')
+    before, after = previous.get('startup'), current.get('startup')
+    if before and after:
+        for name in ('import_ms', 'first_prompt_ms'):
+            ratio = after[name] / before[name]
+            mark = '[X]' if ratio > REGRESSION_RATIO else '[OK]'
+            regressions += ratio > REGRESSION_RATIO
+            print(f'{mark} {"start":>9} {name:<20} {before[name]:>10.3f} -> '
+                  f'{after[name]:>10.3f} ms (x{ratio:.2f})')
+    for result in current['results']:
+        for name, case in result['cases'].items():
+            before = old.get((result['rows'], name))
+            if not before or not before['median_ms']:
+                continue
+            ratio = case['median_ms'] / before['median_ms']
+            mark = '[X]' if ratio > REGRESSION_RATIO else '[OK]'
+            regressions += ratio > REGRESSION_RATIO
+            print(f'{mark} {result["rows"]:>9} {name:<20} {before["median_ms"]:>10.3f} -> '
+                  f'{case["median_ms"]:>10.3f} ms (x{ratio:.2f})')
+    return regressions
+
+def print_result(result):
+    print(f'\n[OK] {result["rows"]} baris ({result["file_mb"]} MB), '
+          f'RSS puncak {result["peak_rss_mb"]} MB')
+    for name, case in result['cases'].items():
+        print(f'    {name:<20} median {case["median_ms"]:>10.3f} ms  '
+              f'p95 {case["p95_ms"]:>10.3f} ms  {case["ops_per_s"] or 0:>10.1f} op/detik')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark pencarian pemain')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Jumlah baris dataset sintetis (20000 sampai 10000000)')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='Folder data sintetis')
+    parser.add_argument('--output', '-o', default='benchmark_results.json', help='File hasil JSON')
+    parser.add_argument('--compare', help='File JSON hasil sebelumnya untuk dibandingkan')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--startup-only', action='store_true',
+                        help='Hanya ukur waktu start search_players.py')
+    parser.add_argument('--csv', help='File data untuk benchmark start (default: file bawaan menu)')
+    parser.add_argument('--single', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single:
+        # Mode proses anak: cetak hasil satu file sebagai JSON
+        print(json.dumps(bench_file(args.single, args.seed)))
+        return 0
+
+    report = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': [],
+    }
+    report['startup'] = bench_startup(args.csv)
+    within_budget = print_startup(report['startup'])
+    for size in ([] if args.startup_only else args.sizes):
+        path = ensure_data(size, args.data_dir, args.seed)
+        child = subprocess.run([sys.executable, os.path.abspath(__file__), '--single', path,
+                                '--seed', str(args.seed)], capture_output=True, text=True)
+        if child.returncode != 0:
+            print(f'[ERROR] Benchmark {size} baris gagal:\n{child.stderr}')
+            return 1
+        result = json.loads(child.stdout.strip().splitlines()[-1])
+        report['results'].append(result)
+        print_result(result)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f'\n[OK] Hasil disimpan ke {args.output}')
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(json.load(f), report)
+        if regressions:
+            print(f'[X] {regressions} kasus lebih lambat dari x{REGRESSION_RATIO}')
+            return 1
+    return 0 if within_budget else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
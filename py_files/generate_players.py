@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""Generator dataset pemain sintetis dengan skema fifa_players.csv.
+
+Distribusi dibuat mirip data asli: liga dengan jumlah klub berbeda, negara
+dengan bobot ala Zipf, posisi utama plus posisi tetangga, rating normal
+yang bergantung umur, nilai pasar eksponensial terhadap overall, dan
+atribut kosong untuk kiper. Baris ditulis per chunk sehingga 10 juta baris
+pun tidak perlu muat di memori.
+
+Contoh:
+    python generate_players.py 100000 ../csv_files/synthetic_100k.csv --seed 1
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 200000
+
+# Liga -> klub (sebagian nama asli, sisanya dilengkapi nama sintetis)
+LEAGUES = {
+    'English Premier League': ['Manchester City', 'Liverpool', 'Chelsea', 'Arsenal',
+                               'Manchester United', 'Tottenham Hotspur'],
+    'Spain Primera Division': ['Real Madrid CF', 'FC Barcelona', 'Atlético de Madrid',
+                               'Sevilla FC', 'Real Sociedad', 'Villarreal CF'],
+    'German 1. Bundesliga': ['FC Bayern München', 'Borussia Dortmund', 'RB Leipzig',
+                             'Bayer 04 Leverkusen', 'VfL Wolfsburg'],
+    'Italian Serie A': ['Inter', 'Milan', 'Juventus', 'Napoli', 'Atalanta', 'Roma'],
+    'French Ligue 1': ['Paris Saint-Germain', 'Olympique Lyonnais', 'AS Saint-Étienne',
+                       'LOSC Lille', 'AS Monaco', 'Olympique de Marseille'],
+    'Portuguese Liga ZON SAGRES': ['SL Benfica', 'FC Porto', 'Sporting CP'],
+    'Holland Eredivisie': ['Ajax', 'PSV', 'Feyenoord'],
+    'Turkish Süper Lig': ['Galatasaray SK', 'Fenerbahçe SK', 'Beşiktaş JK'],
+    'Campeonato Brasileiro Série A': ['Flamengo', 'Palmeiras', 'São Paulo'],
+    'Argentina Primera División': ['River Plate', 'Boca Juniors', 'Racing Club'],
+    'USA Major League Soccer': ['LA Galaxy', 'Inter Miami', 'Seattle Sounders FC'],
+    'Korean K League 1': ['Jeonbuk Hyundai Motors', 'Ulsan Hyundai FC'],
+    'Japanese J. League Division 1': ['Kawasaki Frontale', 'Yokohama F. Marinos'],
+    'English League Championship': ['Norwich City', 'Watford', 'Fulham'],
+    'Spain Segunda Division': ['Real Valladolid CF', 'SD Eibar', 'UD Almería'],
+    'Danish Superliga': ['FC København', 'Brøndby IF', 'FC Midtjylland'],
+    'Norwegian Eliteserien': ['Bodø/Glimt', 'Molde FK', 'Rosenborg BK'],
+    'Polish T-Mobile Ekstraklasa': ['Legia Warszawa', 'Lech Poznań', 'Raków Częstochowa'],
+}
+CLUBS_PER_LEAGUE = (16, 24)
+CLUB_SUFFIXES = ['FC', 'United', 'City', 'Athletic', 'Rovers', 'SC', 'CF', 'AC']
+CITIES = ['Nordhavn', 'Valdemora', 'San Telmo', 'Kristiansund', 'Łódź', 'Čakovec',
+          'Großhafen', 'Çayırova', 'Østby', 'Almería Norte', 'Saint-Rémy', 'Ribeirão',
+          'Vila Nova', 'Kőszeg', 'Żabki', 'Ängelholm', 'Hradec', 'Mönchfeld', 'Porto Alegre',
+          'Tórshavn', 'Yokosuka', 'Gimcheon', 'Bursa', 'Oviedo', 'Leuven', 'Brno', 'Craiova']
+
+# Negara dengan bobot relatif (kira-kira sesuai jumlah pemain di FIFA)
+NATIONS = {
+    'England': 1700, 'Germany': 1200, 'Spain': 1100, 'France': 1000, 'Argentina': 950,
+    'Brazil': 850, 'Japan': 500, 'Netherlands': 450, 'Italy': 450, 'United States': 400,
+    'Poland': 380, 'Korea Republic': 350, 'Portugal': 350, 'Denmark': 340, 'Norway': 330,
+    'Sweden': 320, 'Republic of Ireland': 300, 'Colombia': 300, 'Belgium': 280,
+    'Mexico': 280, 'Scotland': 270, 'Austria': 260, 'Turkey': 250, 'Switzerland': 240,
+    'Chile': 230, 'China PR': 220, 'Uruguay': 200, 'Croatia': 180, 'Serbia': 170,
+    'Nigeria': 160, 'Senegal': 150, "Côte d'Ivoire": 140, 'Ghana': 130, 'Cameroon': 120,
+    'Czech Republic': 120, 'Morocco': 110, 'Egypt': 60, 'Iceland': 40, 'Guinea': 50,
+    'Equatorial Guinea': 10, 'Bosnia and Herzegovina': 70, 'Ukraine': 90, 'Greece': 90,
+}
+
+# Posisi utama dengan bobot, dan posisi tambahan yang umum untuknya
+POSITIONS = {
+    'GK': (11, []), 'CB': (18, ['CDM', 'RB', 'LB']), 'RB': (6, ['RWB', 'RM', 'CB']),
+    'LB': (6, ['LWB', 'LM', 'CB']), 'RWB': (1, ['RB', 'RM']), 'LWB': (1, ['LB', 'LM']),
+    'CDM': (7, ['CM', 'CB']), 'CM': (12, ['CDM', 'CAM', 'RM', 'LM']),
+    'CAM': (6, ['CM', 'CF', 'RW', 'LW']), 'RM': (5, ['RW', 'RB', 'CM']),
+    'LM': (5, ['LW', 'LB', 'CM']), 'RW': (3, ['RM', 'LW', 'ST']), 'LW': (3, ['LM', 'RW', 'ST']),
+    'CF': (1, ['ST', 'CAM']), 'ST': (15, ['CF', 'LW', 'RW']),
+}
+
+FIRST_NAMES = ['Lionel', 'Kylian', 'Erling', 'Kevin', 'Thomas', 'Álex', 'João', 'Mohamed',
+               'Heung-min', 'Luka', 'Sergio', 'Pedro', 'Jürgen', 'François', 'Raphaël',
+               'Gonzalo', 'Iñaki', 'Søren', 'Martin', 'Zlatan', 'Bruno', 'Jan', 'Marco',
+               'Łukasz', 'Dušan', 'Ömer', 'Takumi', 'Ji-sung', 'Sadio', 'Achraf', 'Rúben',
+               'Andrés', 'Mats', 'Kai', 'Virgil', 'Antoine', 'Cristiano', 'Karim', 'Paulo']
+LAST_NAMES = ['Messi', 'Mbappé', 'Haaland', 'De Bruyne', 'Müller', 'Balde', 'Félix', 'Salah',
+              'Son', 'Modrić', 'Ramos', 'González', 'Silva', 'Lloris', 'Varane', 'Higuaín',
+              'Williams', 'Kjær', 'Ødegaard', 'Ibrahimović', 'Fernandes', 'Oblak', 'Reus',
+              'Lewandowski', 'Vlahović', 'Çalhanoğlu', 'Minamino', 'Park', 'Mané', 'Hakimi',
+              'Dias', 'Iniesta', 'Hummels', 'Havertz', 'van Dijk', 'Griezmann', 'Ronaldo',
+              'Benzema', 'Dybala', 'Šimić', 'Nørgaard', 'Sánchez', 'Pérez', 'Rodríguez']
+
+# Atribut kiper (di CSV FIFA 22 terisi untuk semua pemain, termasuk non-kiper)
+GOALKEEPING_COLUMNS = ['goalkeeping_diving', 'goalkeeping_handling', 'goalkeeping_kicking',
+                       'goalkeeping_positioning', 'goalkeeping_reflexes']
+# Kolom output (urutan seperti CSV FIFA 22, dipangkas ke kolom yang relevan)
+COLUMNS = [
+    'sofifa_id', 'player_url', 'short_name', 'long_name', 'player_positions',
+    'overall', 'potential', 'value_eur', 'wage_eur', 'age', 'dob', 'height_cm',
+    'weight_kg', 'club_name', 'league_name', 'nationality_name', 'preferred_foot',
+    'pace', 'shooting', 'passing', 'dribbling', 'defending', 'physic',
+] + GOALKEEPING_COLUMNS
+# Atribut utama: (kolom, bobot per kelompok posisi GK/DEF/MID/ATT)
+ATTRIBUTE_BIAS = {
+    'pace': (0, -3, 0, 5), 'shooting': (0, -18, -3, 6), 'passing': (0, -8, 4, -2),
+    'dribbling': (0, -10, 3, 4), 'defending': (0, 10, -8, -25), 'physic': (0, 6, 0, 0),
+}
+POSITION_GROUPS = {'GK': 0, 'CB': 1, 'RB': 1, 'LB': 1, 'RWB': 1, 'LWB': 1,
+                   'CDM': 2, 'CM': 2, 'CAM': 2, 'RM': 2, 'LM': 2,
+                   'RW': 3, 'LW': 3, 'CF': 3, 'ST': 3}
+
+def build_clubs(rng):
+    """Daftar (liga, klub): klub asli ditambah klub sintetis sampai 16-24 per liga"""
+    pairs = []
+    for league, clubs in LEAGUES.items():
+        target = rng.integers(*CLUBS_PER_LEAGUE, endpoint=True)
+        names = list(clubs)
+        while len(names) < target:
+            name = f'{CITIES[rng.integers(len(CITIES))]} {CLUB_SUFFIXES[rng.integers(len(CLUB_SUFFIXES))]}'
+            if name not in names:
+                names.append(name)
+        pairs.extend((league, club) for club in names)
+    return pairs
+
+def make_positions(rng, primary):
+    """String player_positions: posisi utama + 0-2 posisi tetangga"""
+    codes = list(POSITIONS)
+    extra_count = rng.choice(3, size=len(primary), p=[0.45, 0.4, 0.15])
+    picks = rng.random((len(primary), 2))
+    result = []
+    for code, count, pick in zip(primary, extra_count, picks):
+        position = codes[code]
+        neighbours = POSITIONS[position][1]
+        chosen = [position]
+        for p in pick[:count if neighbours else 0]:
+            candidate = neighbours[int(p * len(neighbours))]
+            if candidate not in chosen:
+                chosen.append(candidate)
+        result.append(', '.join(chosen))
+    return result
+
+def generate_chunk(rng, size, ids, clubs):
+    """Satu chunk baris sintetis sebagai DataFrame"""
+    codes = list(POSITIONS)
+    weights = np.array([POSITIONS[p][0] for p in codes], dtype=float)
+    primary = rng.choice(len(codes), size=size, p=weights / weights.sum())
+    group = np.array([POSITION_GROUPS[p] for p in codes])[primary]
+    is_gk = group == 0
+
+    age = np.clip(np.round(rng.gamma(9.0, 2.9, size) + 1), 16, 44).astype(np.int64)
+    # Overall naik sampai umur ~28 lalu turun pelan
+    peak = -0.12 * (age - 28) ** 2
+    overall = np.clip(np.round(rng.normal(66 + peak * 0.15, 6.8)), 40, 93).astype(np.int64)
+    growth = np.where(age < 29, rng.gamma(2.0, 1.0 + np.maximum(29 - age, 0) * 0.6), 0)
+    potential = np.clip(overall + np.round(growth), overall, 95).astype(np.int64)
+
+    value = np.round(np.exp(0.19 * (overall - 45) + rng.normal(0, 0.35, size)) * 15000
+                     * np.where(age < 24, 1.4, np.where(age > 31, 0.5, 1.0)), -3)
+    value = np.where(rng.random(size) < 0.003, np.nan, np.clip(value, 10000, 200000000))
+    wage = np.clip(np.round(np.exp(0.13 * (overall - 45) + rng.normal(0, 0.3, size)) * 500, -3),
+                   500, 500000)
+
+    club_index = rng.integers(len(clubs), size=size)
+    free_agent = rng.random(size) < 0.005
+    league_name = np.array([clubs[i][0] for i in club_index], dtype=object)
+    club_name = np.array([clubs[i][1] for i in club_index], dtype=object)
+    league_name[free_agent] = np.nan
+    club_name[free_agent] = np.nan
+
+    nations = list(NATIONS)
+    nation_weights = np.array(list(NATIONS.values()), dtype=float)
+    nationality = np.array(nations, dtype=object)[
+        rng.choice(len(nations), size=size, p=nation_weights / nation_weights.sum())]
+
+    first = np.array(FIRST_NAMES, dtype=object)[rng.integers(len(FIRST_NAMES), size=size)]
+    last = np.array(LAST_NAMES, dtype=object)[rng.integers(len(LAST_NAMES), size=size)]
+    long_name = first + ' ' + last
+    short_name = np.array([f[0] + '. ' for f in first], dtype=object) + last
+
+    data = {
+        'sofifa_id': ids,
+        'player_url': [f'https://sofifa.com/player/{i}' for i in ids],
+        'short_name': short_name,
+        'long_name': long_name,
+        'player_positions': make_positions(rng, primary),
+        'overall': overall,
+        'potential': potential,
+        'value_eur': value,
+        'wage_eur': wage,
+        'age': age,
+        'dob': [f'{2022 - a}-{m:02d}-{d:02d}' for a, m, d in
+                zip(age, rng.integers(1, 13, size), rng.integers(1, 29, size))],
+        'height_cm': np.clip(np.round(rng.normal(181, 6.5, size) + is_gk * 6), 155, 206).astype(np.int64),
+        'weight_kg': np.clip(np.round(rng.normal(75, 6.5, size) + is_gk * 6), 52, 110).astype(np.int64),
+        'club_name': club_name,
+        'league_name': league_name,
+        'nationality_name': nationality,
+        'preferred_foot': np.where(rng.random(size) < 0.24, 'Left', 'Right'),
+    }
+    bias = np.array(list(ATTRIBUTE_BIAS.values()), dtype=float)
+    for i, col in enumerate(ATTRIBUTE_BIAS):
+        values = np.clip(np.round(overall + bias[i][group] + rng.normal(0, 6, size)), 15, 97)
+        data[col] = np.where(is_gk, np.nan, values)
+    # Atribut kiper ada untuk semua pemain; pemain non-kiper bernilai rendah
+    for col in GOALKEEPING_COLUMNS:
+        keeper = overall + rng.normal(0, 5, size)
+        data[col] = np.clip(np.round(np.where(is_gk, keeper, rng.normal(11, 3, size))), 5, 95)
+    return pd.DataFrame(data, columns=COLUMNS)
+
+def generate(rows, path, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Menulis `rows` baris sintetis ke `path` (UTF-8) per chunk"""
+    rng = np.random.default_rng(seed)
+    clubs = build_clubs(rng)
+    # sofifa_id unik: permutasi acak dari rentang yang sedikit lebih lebar
+    id_start = 20000
+    ids = id_start + rng.permutation(rows + rows // 10)[:rows]
+    for start in range(0, rows, chunk_rows):
+        size = min(chunk_rows, rows - start)
+        chunk = generate_chunk(rng, size, ids[start:start + size], clubs)
+        chunk.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0,
+                     index=False, encoding='utf-8')
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Membuat fifa_players.csv sintetis')
+    parser.add_argument('rows', type=int, help='Jumlah baris (misal 20000 sampai 10000000)')
+    parser.add_argument('output', help='Lokasi file CSV hasil')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    generate(args.rows, args.output, seed=args.seed, chunk_rows=args.chunk_rows)
+    print(f'[OK] {args.rows} baris ditulis ke {args.output} dalam {time.perf_counter() - start:.1f} detik')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""Pipeline papan peringkat (top-N CSV + grafik PNG) dari satu konfigurasi.
+
+Setiap papan didefinisikan di BOARDS (atau file JSON lewat --config):
+filter, kolom peringkat (kolom pertama utama, sisanya penentu seri), N,
+dan kolom CSV. Semua papan dihitung dalam satu kali jalan atas data yang
+sudah dimuat: mask setiap predikat dibuat sekali dan dipakai bersama, dan
+papan dengan filter + peringkat yang sama berbagi satu seleksi top-k.
+Grafik dirender paralel di proses worker.
+
+Hanya papan yang berubah yang dibuat ulang. Hash definisi papan dan hash
+data sumber (isi CSV beserta delta yang diterapkan) disimpan di file state; jika keduanya sama dan output masih
+ada, papan dilewati tanpa memuat data. Jika data berubah tetapi isi top-N
+tetap sama, CSV dan grafik tidak ditulis ulang.
+
+Contoh:
+    python leaderboards.py                    (hanya papan yang berubah)
+    python leaderboards.py --board top_10_passers --force
+    python leaderboards.py --config papan.json --workers 4
+"""
+import argparse
+import concurrent.futures
+import csv
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+import player_profile as profile
+from player_index import POSITION_MODES, position_filter, top_k
+from player_render import export_values
+from player_store import DEFAULT_CSV_PATH, data_signature
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), '..')
+DEFAULT_CSV_DIR = os.path.join(BASE_DIR, 'csv_files')
+DEFAULT_PNG_DIR = os.path.join(BASE_DIR, 'png_files')
+STATE_NAME = 'leaderboards.state.json'
+# Naikkan jika cara menghitung atau menggambar papan berubah (memaksa regenerasi)
+PIPELINE_VERSION = 1
+
+BOARDS = [
+    {
+        'name': 'top_10_potential',
+        'title': 'Top 10 Pemain dengan Potential Tertinggi',
+        'filter': {},
+        'rank': ['potential', 'overall'],
+        'n': 10,
+        'columns': ['short_name', 'club_name', 'nationality_name', 'potential', 'overall', 'age'],
+    },
+    {
+        'name': 'top_10_potential_u20',
+        'title': 'Top 10 Pemain Muda (Umur < 20) - Potential Tertinggi',
+        'filter': {'age': [None, 19]},
+        'rank': ['potential', 'overall'],
+        'n': 10,
+        'columns': ['short_name', 'club_name', 'nationality_name', 'potential', 'overall', 'age'],
+    },
+    {
+        'name': 'top_10_passers',
+        'title': 'Top 10 Pemain dengan Passing Tertinggi',
+        'filter': {},
+        'rank': ['passing', 'overall'],
+        'n': 10,
+        'columns': ['short_name', 'club_name', 'nationality_name', 'passing', 'overall', 'age'],
+    },
+    {
+        'name': 'top_10_defenders_u18',
+        'title': 'Top 10 Defender Muda (Umur < 18) - Potential Tertinggi',
+        'filter': {'age': [None, 17], 'positions': ['CB', 'LB', 'RB', 'LWB', 'RWB', 'CDM']},
+        'rank': ['potential', 'overall'],
+        'n': 10,
+        'columns': ['short_name', 'club_name', 'nationality_name', 'player_positions',
+                    'potential', 'overall', 'defending', 'age'],
+        'label_age': True,
+    },
+]
+
+# Kunci filter categorical -> kolom (sama dengan spesifikasi batch)
+CATEGORY_FILTERS = {'club': 'club_name', 'league': 'league_name', 'country': 'nationality_name'}
+
+def definition_hash(board):
+    """Hash definisi papan (termasuk versi pipeline)"""
+    text = json.dumps({'board': board, 'version': PIPELINE_VERSION}, sort_keys=True)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def data_hash(csv_path):
+    """Sidik data sumber: isi CSV beserta delta yang sudah diterapkan"""
+    return data_signature(csv_path)
+
+def filter_keys(board):
+    """Predikat papan dalam bentuk kanonik (kunci mask bersama)"""
+    spec = board.get('filter') or {}
+    keys = []
+    for key, value in sorted(spec.items()):
+        if key == 'position_mode':
+            continue
+        if key == 'positions':
+            mode = spec.get('position_mode') or 'any'
+            if mode not in POSITION_MODES:
+                raise ValueError(f'{board["name"]}: position_mode tidak dikenal: {mode}')
+            keys.append(('positions', mode, tuple(sorted(value))))
+        elif key in CATEGORY_FILTERS:
+            keys.append(('category', CATEGORY_FILTERS[key], value))
+        elif isinstance(value, (list, tuple)) and len(value) == 2:
+            keys.append(('range', key, value[0], value[1]))
+        else:
+            raise ValueError(f'{board["name"]}: filter tidak dikenal: {key}')
+    return tuple(keys)
+
+def predicate_mask(dataset, key):
+    """Mask boolean seluruh baris untuk satu predikat kanonik"""
+    kind = key[0]
+    if kind == 'positions':
+        return position_filter(dataset.column('position_mask'),
+                               dataset.column('primary_position_mask'), key[2], key[1])
+    if kind == 'category':
+        categories = dataset.df[key[1]].cat.categories
+        code = categories.get_loc(key[2]) if key[2] in categories else -2
+        return dataset.codes(key[1]) == code
+    column, low, high = key[1], key[2], key[3]
+    if column not in dataset.df.columns:
+        raise ValueError(f'Kolom tidak ditemukan: {column}')
+    values = dataset.column(column)
+    mask = ~np.isnan(values) if values.dtype.kind == 'f' else np.ones(len(values), dtype=bool)
+    if low is not None:
+        mask &= values >= low
+    if high is not None:
+        mask &= values <= high
+    return mask
+
+def rank_rows(dataset, rows, columns, n):
+    """n baris teratas menurut columns (menurun; seri -> kolom berikutnya, lalu posisi baris)"""
+    primary = dataset.column(columns[0])[rows]
+    if primary.dtype.kind == 'f':
+        keep = ~np.isnan(primary)
+        rows, primary = rows[keep], primary[keep]
+    if len(rows) == 0:
+        return rows
+    # Batas nilai ke-n dari top_k; semua baris yang seri di batas ikut diurutkan
+    boundary = primary[top_k(primary, min(n, len(rows)))[-1]]
+    tied = rows[primary >= boundary]
+    keys = [tied] + [-dataset.column(col)[tied].astype(np.float64) for col in reversed(columns)]
+    return tied[np.lexsort(keys)][:n]
+
+def compute_boards(dataset, boards):
+    """Menghitung semua papan sekaligus; mengembalikan {nama: posisi baris}"""
+    masks = {}
+    groups = {}
+    for board in boards:
+        keys = filter_keys(board)
+        for key in keys:
+            if key not in masks:
+                label = key[0] if key[0] == 'positions' else key[1]
+                with profile.stage('mask ' + label, len(dataset)) as stage:
+                    masks[key] = predicate_mask(dataset, key)
+                    if stage:
+                        stage.rows_out = int(np.count_nonzero(masks[key]))
+        group = (keys, tuple(board['rank']))
+        groups[group] = max(groups.get(group, 0), int(board['n']))
+
+    ranked = {}
+    for (keys, columns), n in groups.items():
+        with profile.stage('top ' + columns[0], len(dataset)) as stage:
+            if keys:
+                mask = np.logical_and.reduce([masks[key] for key in keys])
+                rows = np.flatnonzero(mask)
+            else:
+                rows = np.arange(len(dataset))
+            ranked[(keys, columns)] = rank_rows(dataset, rows, list(columns), n)
+            stage.rows_out = len(ranked[(keys, columns)])
+    return {board['name']: ranked[(filter_keys(board), tuple(board['rank']))][:int(board['n'])]
+            for board in boards}
+
+def board_table(dataset, board, rows):
+    """Isi CSV papan sebagai teks"""
+    columns = [col for col in board['columns'] if col in dataset.df.columns]
+    values = {col: export_values(dataset.column(col)[rows]) for col in columns}
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(columns)
+    writer.writerows(zip(*(values[col] for col in columns)))
+    return out.getvalue()
+
+def chart_data(dataset, board, rows, path):
+    """Data grafik (tipe Python biasa) untuk dikirim ke worker render"""
+    metric = board['rank'][0]
+    compare = board.get('compare', 'potential' if metric == 'overall' else 'overall')
+    names = dataset.column('short_name')[rows].tolist()
+    if board.get('label_age'):
+        names = [f'{name} ({age})' for name, age in zip(names, dataset.column('age')[rows].tolist())]
+    return {
+        'path': path,
+        'title': board.get('title') or board['name'],
+        'labels': names,
+        'metric': metric.capitalize(),
+        'values': export_values(dataset.column(metric)[rows]),
+        'compare': compare.capitalize(),
+        'compare_values': export_values(dataset.column(compare)[rows]),
+    }
+
+def render_chart(chart):
+    """Menggambar grafik satu papan (dijalankan di worker); mengembalikan path"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    labels = chart['labels']
+    values = [np.nan if v is None else v for v in chart['values']]
+    compare = [np.nan if v is None else v for v in chart['compare_values']]
+    positions = np.arange(len(labels))
+    with plt.style.context('seaborn-v0_8-whitegrid'):
+        fig, (top, bottom) = plt.subplots(2, 1, figsize=(14, max(8, 0.9 * len(labels) + 4)))
+        top.barh(positions, values, color=plt.cm.viridis(np.linspace(0, 0.8, len(labels))))
+        top.set_yticks(positions, labels)
+        top.invert_yaxis()
+        for y, value in zip(positions, values):
+            top.text(value + 0.5, y, f'{value:g}', va='center', fontweight='bold')
+        top.set_xlabel(f'{chart["metric"]} Rating', fontweight='bold')
+        top.set_title(chart['title'], fontsize=14, fontweight='bold')
+
+        width = 0.35
+        bottom.bar(positions - width / 2, values, width, label=chart['metric'], color='steelblue')
+        bottom.bar(positions + width / 2, compare, width, label=chart['compare'], color='coral')
+        bottom.set_xticks(positions, labels, rotation=45, ha='right')
+        bottom.set_ylabel('Rating')
+        bottom.set_title(f'Perbandingan {chart["metric"]} vs {chart["compare"]} Rating')
+        bottom.legend()
+        fig.tight_layout()
+        fig.savefig(chart['path'], dpi=150)
+        plt.close(fig)
+    return chart['path']
+
+def render_charts(charts, workers):
+    """Merender grafik paralel di proses worker (langsung jika hanya satu)"""
+    if workers <= 1 or len(charts) <= 1:
+        return [render_chart(chart) for chart in charts]
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+    with concurrent.futures.ProcessPoolExecutor(min(workers, len(charts)), mp_context=context) as pool:
+        return list(pool.map(render_chart, charts))
+
+def load_boards(path):
+    """Daftar papan dari file JSON (list definisi papan)"""
+    with open(path, encoding='utf-8') as f:
+        boards = json.load(f)
+    for board in boards:
+        for key in ('name', 'rank', 'n', 'columns'):
+            if key not in board:
+                raise ValueError(f'Papan {board.get("name", "?")} tidak punya kunci {key}')
+    return boards
+
+def read_state(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_state(path, state):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+def run_pipeline(boards, csv_path=DEFAULT_CSV_PATH, csv_dir=DEFAULT_CSV_DIR,
+                 png_dir=DEFAULT_PNG_DIR, workers=None, force=False):
+    """Membuat ulang papan yang berubah; mengembalikan {nama: status}"""
+    state_path = os.path.join(csv_dir, STATE_NAME)
+    state = read_state(state_path)
+    saved = state.get('boards', {})
+    source = data_hash(csv_path)
+    paths = {board['name']: (os.path.join(csv_dir, board['name'] + '.csv'),
+                             os.path.join(png_dir, board['name'] + '.png')) for board in boards}
+
+    stale = []
+    status = {}
+    for board in boards:
+        entry = saved.get(board['name'], {})
+        fresh = (entry.get('definition') == definition_hash(board) and entry.get('data') == source
+                 and all(os.path.exists(p) for p in paths[board['name']]))
+        if fresh and not force:
+            status[board['name']] = 'tetap'
+        else:
+            stale.append(board)
+    if not stale:
+        return status
+
+    # Data hanya dimuat jika ada papan yang perlu dihitung ulang
+    from player_query import load_dataset
+    dataset = load_dataset(csv_path)
+    results = compute_boards(dataset, stale)
+    charts = []
+    for board in stale:
+        name = board['name']
+        csv_out, png_out = paths[name]
+        text = board_table(dataset, board, results[name])
+        result = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        entry = saved.get(name, {})
+        changed = (force or entry.get('result') != result
+                   or entry.get('definition') != definition_hash(board))
+        if changed or not os.path.exists(csv_out):
+            os.makedirs(csv_dir, exist_ok=True)
+            with open(csv_out, 'w', encoding='utf-8', newline='') as f:
+                f.write(text)
+        if (changed or not os.path.exists(png_out)) and len(results[name]):
+            os.makedirs(png_dir, exist_ok=True)
+            charts.append(chart_data(dataset, board, results[name], png_out))
+        status[name] = 'dibuat ulang' if changed else 'isi sama'
+        saved[name] = {'definition': definition_hash(board), 'data': source, 'result': result}
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    with profile.stage('render charts', len(charts)):
+        render_charts(charts, workers)
+    state['boards'] = saved
+    write_state(state_path, state)
+    return status
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Membuat papan peringkat top-N (CSV + grafik)')
+    parser.add_argument('--csv', default=DEFAULT_CSV_PATH, help='Lokasi dataset pemain')
+    parser.add_argument('--config', help='File JSON berisi daftar papan (default: BOARDS)')
+    parser.add_argument('--board', action='append', help='Hanya papan ini (boleh berulang)')
+    parser.add_argument('--csv-dir', default=DEFAULT_CSV_DIR, help='Folder output CSV')
+    parser.add_argument('--png-dir', default=DEFAULT_PNG_DIR, help='Folder output grafik')
+    parser.add_argument('--workers', type=int, default=None, help='Jumlah proses render grafik')
+    parser.add_argument('--force', action='store_true', help='Buat ulang semua papan')
+    args = parser.parse_args(argv)
+
+    try:
+        boards = load_boards(args.config) if args.config else BOARDS
+        if args.board:
+            unknown = set(args.board) - {board['name'] for board in boards}
+            if unknown:
+                print('[X] Papan tidak dikenal:', ', '.join(sorted(unknown)))
+                return 1
+            boards = [board for board in boards if board['name'] in args.board]
+        start = time.perf_counter()
+        status = run_pipeline(boards, args.csv, args.csv_dir, args.png_dir,
+                              workers=args.workers, force=args.force)
+    except FileNotFoundError as e:
+        print('[ERROR] File tidak ditemukan:', e.filename)
+        return 1
+    except (ValueError, KeyError) as e:
+        print('[ERROR] Konfigurasi papan tidak valid:', e)
+        return 1
+    for name, result in status.items():
+        print(f'[{"INFO" if result == "tetap" else "OK"}] {name}: {result}')
+    print(f'[OK] {len(status)} papan selesai dalam {time.perf_counter() - start:.2f} detik')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Uji beban sederhana untuk search_server.py.
+
+Beberapa klien asyncio (masing-masing satu koneksi keep-alive) mengirim
+request secara bersamaan, lalu latensi p50/p95/p99 dan throughput dicetak.
+
+Contoh:
+    python load_test.py --concurrency 32 --requests 2000 --p99-target 100
+    python load_test.py --queries queries.jsonl     (POST /search per baris)
+
+Exit code 1 jika p99 melebihi --p99-target (ms) atau ada request gagal.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from search_server import DEFAULT_HOST, DEFAULT_PORT
+
+# Campuran request default: query cepat (indeks) dan lambat (fuzzy/tanpa filter)
+DEFAULT_PATHS = [
+    '/search?name=silva',
+    '/search?country=Spain&age=18-21&positions=CB,LB',
+    '/search?potential=80-99&by=potential&page_size=50',
+    '/search?overall=70-80&positions=ST&position_mode=primary',
+    '/search?age=-21&by=potential',
+    '/fuzzy?name=ronaldho&max_edits=2',
+    '/leagues',
+    '/countries',
+]
+
+def percentile(sorted_values, q):
+    """Persentil (nearest-rank) dari list yang sudah terurut"""
+    if not sorted_values:
+        return float('nan')
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def load_requests(path):
+    """Request POST /search dari file JSONL spesifikasi (format mode batch)"""
+    requests = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                requests.append(('POST', '/search', line.strip().encode('utf-8')))
+    return requests
+
+async def send(reader, writer, host, method, path, body):
+    """Mengirim satu request HTTP/1.1 dan membaca responsnya; mengembalikan status"""
+    head = (f'{method} {path} HTTP/1.1\r\nHost: {host}\r\n'
+            f'Content-Length: {len(body)}\r\nContent-Type: application/json\r\n\r\n')
+    writer.write(head.encode('latin-1') + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+async def client(host, port, requests, counter, total, latencies, failures):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while counter[0] < total:
+            i = counter[0]
+            counter[0] += 1
+            method, path, body = requests[i % len(requests)]
+            start = time.perf_counter()
+            status = await send(reader, writer, host, method, path, body)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                failures.append((status, path))
+    finally:
+        writer.close()
+
+async def run_load(host, port, requests, concurrency, total):
+    """Menjalankan uji beban; mengembalikan (latensi ms, kegagalan, durasi detik)"""
+    latencies, failures, counter = [], [], [0]
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, requests, counter, total, latencies, failures)
+                           for _ in range(concurrency)))
+    return latencies, failures, time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Uji beban server pencarian pemain')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--concurrency', '-c', type=int, default=16, help='Jumlah klien bersamaan')
+    parser.add_argument('--requests', '-n', type=int, default=1000, help='Jumlah total request')
+    parser.add_argument('--queries', help='File JSONL spesifikasi (dikirim sebagai POST /search)')
+    parser.add_argument('--p99-target', type=float, default=None, help='Batas p99 dalam ms')
+    args = parser.parse_args(argv)
+    if args.requests < 1 or args.concurrency < 1:
+        parser.error('--requests dan --concurrency minimal 1')
+
+    if args.queries:
+        requests = load_requests(args.queries)
+        if not requests:
+            print('[ERROR] File query kosong:', args.queries)
+            return 1
+    else:
+        requests = [('GET', path, b'') for path in DEFAULT_PATHS]
+    try:
+        latencies, failures, elapsed = asyncio.run(
+            run_load(args.host, args.port, requests, args.concurrency, args.requests))
+    except OSError as e:
+        print('[ERROR] Tidak dapat terhubung ke server:', e)
+        return 1
+
+    latencies.sort()
+    print(f'[INFO] {len(latencies)} request, {args.concurrency} klien, {elapsed:.2f} detik '
+          f'({len(latencies) / elapsed:.1f} req/detik)')
+    print(f'[INFO] Latensi ms: p50={percentile(latencies, 50):.1f} '
+          f'p95={percentile(latencies, 95):.1f} p99={percentile(latencies, 99):.1f} '
+          f'max={latencies[-1]:.1f}')
+    if failures:
+        print(f'[X] {len(failures)} request gagal, contoh: {failures[0]}')
+        return 1
+    if args.p99_target is not None:
+        p99 = percentile(latencies, 99)
+        if p99 > args.p99_target:
+            print(f'[X] p99 {p99:.1f} ms melebihi target {args.p99_target:.1f} ms')
+            return 1
+        print(f'[OK] p99 {p99:.1f} ms dalam target {args.p99_target:.1f} ms')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
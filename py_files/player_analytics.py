@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""Cube agregat untuk analisis klub, liga, negara, posisi, dan kelompok umur.
+
+Semua pemain diringkas sekali menjadi sel dasar per kombinasi dimensi
+(liga, klub, negara, posisi utama, kelompok umur). Setiap sel menyimpan
+jumlah pemain, jumlah/minimum/maksimum beberapa ukuran (overall, potential,
+umur, nilai pasar, gaji), dan histogram rating. Agregat per kelompok
+dimensi (cuboid, misal klub x posisi) diturunkan dari sel dasar, bukan dari
+baris pemain; cuboid yang dipakai menu dibangun saat cube dibuat, cuboid
+lain sekali saat pertama diminta.
+
+Kunci cuboid tersusun dengan dimensi filter di depan, jadi satu query
+(misal semua posisi di satu klub) adalah satu rentang kunci terurut: waktu
+query tidak bergantung pada jumlah pemain.
+
+Contoh:
+    cube = analytics_cube(dataset)
+    cube.query(['league'])                            # roll-up per liga
+    cube.query(['club'], league='Spain Primera Division')   # drill-down
+    cube.summary(club='FC Barcelona')                 # satu baris sebagai dict
+    cube.histogram('potential', nationality='Brazil')
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+import player_profile as profile
+from player_index import POSITION_CODES
+
+DIMENSIONS = ['league', 'club', 'nationality', 'position', 'age_band']
+CATEGORY_DIMENSIONS = {'league': 'league_name', 'club': 'club_name', 'nationality': 'nationality_name'}
+MEASURES = ['overall', 'potential', 'age', 'value_eur', 'wage_eur']
+HISTOGRAM_MEASURES = ['overall', 'potential']
+# Histogram rating per 5 poin (0-4, 5-9, ..., 100)
+HISTOGRAM_WIDTH = 5
+HISTOGRAM_BINS = 100 // HISTOGRAM_WIDTH + 1
+# Batas bawah kelompok umur setelah kelompok pertama
+AGE_BAND_EDGES = [21, 24, 28, 32]
+AGE_BANDS = ['<=20', '21-23', '24-27', '28-31', '32+']
+# Cuboid yang dipakai menu ringkasan klub/liga, dibangun bersama cube; urutan
+# dari yang halus ke kasar agar cuboid kasar diturunkan dari cuboid kecil
+PRECOMPUTED = [
+    ('league', 'club', 'position'), ('league', 'club', 'age_band'),
+    ('league', 'club'), ('league', 'position'), ('league', 'age_band'),
+    ('club', 'position'), ('club', 'age_band'), ('club', 'nationality'),
+    ('league', 'nationality'), ('nationality', 'position'),
+    ('league',), ('club',), ('nationality',), ('position',), ('age_band',),
+]
+MISSING_LABEL = '-'
+
+def group_sorted(keys, columns):
+    """Mengelompokkan baris berkunci sama; kolom berisi (array, ufunc reduksi).
+
+    Jumlahan (np.add, juga kolom 2-D seperti histogram) dihitung dengan
+    bincount; minimum/maksimum dengan reduceat atas baris terurut.
+    Mengembalikan (kunci unik, {nama: hasil reduksi}, grup per baris).
+    """
+    order = np.argsort(keys, kind='stable')
+    ordered = keys[order]
+    boundary = np.concatenate(([True], ordered[1:] != ordered[:-1])) if len(keys) else ordered[:0] > 0
+    starts = np.flatnonzero(boundary)
+    groups = np.empty(len(keys), dtype=np.int64)
+    groups[order] = np.cumsum(boundary) - 1
+    size = len(starts)
+    reduced = {}
+    for name, (values, ufunc) in columns.items():
+        if not size:
+            reduced[name] = values[:0]
+        elif ufunc is np.add and values.ndim == 2:
+            width = values.shape[1]
+            flat = (groups[:, None] * width + np.arange(width)).ravel()
+            reduced[name] = np.bincount(flat, values.ravel(), minlength=size * width).reshape(
+                size, width).astype(values.dtype)
+        elif ufunc is np.add:
+            reduced[name] = np.bincount(groups, values, minlength=size).astype(values.dtype)
+        else:
+            reduced[name] = ufunc.reduceat(values[order], starts)
+    return ordered[starts], reduced, groups
+
+class Cuboid:
+    """Agregat per kombinasi beberapa dimensi, kunci mixed-radix terurut"""
+
+    def __init__(self, dims, sizes, keys, values):
+        self.dims = tuple(dims)
+        self.sizes = tuple(sizes)
+        self.keys = keys
+        self.values = values
+
+    def __len__(self):
+        return len(self.keys)
+
+    def span(self, prefix):
+        """Rentang sel [awal, akhir) yang kode dimensi depannya sama dengan `prefix`"""
+        rest = int(np.prod(self.sizes[len(prefix):], dtype=np.int64))
+        low = 0
+        for code, size in zip(prefix, self.sizes):
+            low = low * size + code
+        return np.searchsorted(self.keys, [low * rest, (low + 1) * rest])
+
+    def codes(self, start, end):
+        """Kode per dimensi untuk sel [start, end)"""
+        return np.unravel_index(self.keys[start:end], self.sizes)
+
+class AnalyticsCube:
+    """Sel dasar semua dimensi beserta cuboid turunannya"""
+
+    def __init__(self, dataset):
+        with profile.stage('build cube', len(dataset)) as stage:
+            self.labels, self._codes = {}, {}
+            dim_codes = [self._dimension(dataset, dim) for dim in DIMENSIONS]
+            self.sizes = tuple(len(self.labels[dim]) for dim in DIMENSIONS)
+            self.base = self._base_cells(dataset, dim_codes)
+            self._cuboids = {self.base.dims: self.base}
+            for dims in PRECOMPUTED:
+                self.cuboid(dims)
+            stage.rows_out = len(self.base)
+
+    def _dimension(self, dataset, dim):
+        """Kode per baris untuk satu dimensi; nilai kosong memakai kode terakhir"""
+        if dim in CATEGORY_DIMENSIONS:
+            column = CATEGORY_DIMENSIONS[dim]
+            categories = list(dataset.df[column].cat.categories)
+            display = dataset.labels(column)
+            labels = [display.get(value, value) for value in categories]
+            codes = dataset.codes(column).astype(np.int64)
+        elif dim == 'position':
+            categories = labels = list(POSITION_CODES)
+            primary = dataset.column('primary_position_mask').astype(np.int64)
+            # Posisi utama berupa satu bit; nomor bit = kode posisi
+            codes = np.where(primary > 0, np.log2(np.maximum(primary, 1)).astype(np.int64), -1)
+        else:
+            categories = labels = list(AGE_BANDS)
+            age = dataset.column('age').astype(np.float64)
+            codes = np.where(np.isnan(age), -1, np.searchsorted(AGE_BAND_EDGES, age, side='right'))
+        self._codes[dim] = {value: code for code, value in enumerate(categories)}
+        self.labels[dim] = np.array(labels + [MISSING_LABEL], dtype=object)
+        return np.where(codes >= 0, codes, len(categories))
+
+    def _base_cells(self, dataset, dim_codes):
+        """Cuboid semua dimensi, diagregasi langsung dari baris pemain"""
+        keys = np.ravel_multi_index(dim_codes, self.sizes).astype(np.int64)
+        columns = {'players': (np.ones(len(keys), dtype=np.int64), np.add)}
+        ratings = {}
+        for measure in MEASURES:
+            values = dataset.column(measure).astype(np.float64)
+            valid = ~np.isnan(values)
+            columns[f'n_{measure}'] = (valid.astype(np.int64), np.add)
+            columns[f'sum_{measure}'] = (np.where(valid, values, 0.0), np.add)
+            columns[f'min_{measure}'] = (np.where(valid, values, np.inf), np.minimum)
+            columns[f'max_{measure}'] = (np.where(valid, values, -np.inf), np.maximum)
+            if measure in HISTOGRAM_MEASURES:
+                ratings[measure] = (values, valid)
+        cells, values, groups = group_sorted(keys, columns)
+        for measure, (rating, valid) in ratings.items():
+            bins = np.clip(rating // HISTOGRAM_WIDTH, 0, HISTOGRAM_BINS - 1)
+            flat = groups[valid] * HISTOGRAM_BINS + bins[valid].astype(np.int64)
+            values[f'hist_{measure}'] = np.bincount(
+                flat, minlength=len(cells) * HISTOGRAM_BINS).reshape(len(cells), HISTOGRAM_BINS)
+        return Cuboid(DIMENSIONS, self.sizes, cells, values)
+
+    def cuboid(self, dims):
+        """Cuboid untuk dimensi `dims` (urutan = urutan kunci), dibangun sekali.
+
+        Diturunkan dari cuboid terkecil yang sudah ada dan memuat semua
+        dimensi tersebut (paling buruk sel dasar).
+        """
+        dims = tuple(dims)
+        if dims not in self._cuboids:
+            parent = min((c for c in self._cuboids.values() if set(dims) <= set(c.dims)), key=len)
+            sizes = [self.sizes[DIMENSIONS.index(dim)] for dim in dims]
+            if dims:
+                codes = dict(zip(parent.dims, parent.codes(0, len(parent))))
+                keys = np.ravel_multi_index([codes[dim] for dim in dims], sizes).astype(np.int64)
+            else:
+                keys = np.zeros(len(parent), dtype=np.int64)
+            columns = {name: (values, np.minimum if name.startswith('min_') else
+                              np.maximum if name.startswith('max_') else np.add)
+                       for name, values in parent.values.items()}
+            cells, values, _ = group_sorted(keys, columns)
+            self._cuboids[dims] = Cuboid(dims, sizes, cells, values)
+        return self._cuboids[dims]
+
+    def _locate(self, group_by, where):
+        """Cuboid dan rentang sel untuk filter `where`; None jika ada nilai tidak dikenal"""
+        for dim in list(group_by) + list(where):
+            if dim not in DIMENSIONS:
+                raise ValueError(f'Dimensi tidak dikenal: {dim}')
+        filters = [dim for dim in DIMENSIONS if dim in where]
+        group = [dim for dim in group_by if dim not in where]
+        prefix = [self._codes[dim].get(where[dim]) for dim in filters]
+        if any(code is None for code in prefix):
+            return None, 0, 0
+        cuboid = self.cuboid(filters + group)
+        start, end = cuboid.span(prefix)
+        return cuboid, start, end
+
+    def _columns(self, group, where):
+        """Kolom hasil (dict array) untuk query; dipakai query() dan summary()"""
+        cuboid, start, end = self._locate(group, where)
+        columns = {}
+        if cuboid is not None:
+            codes = cuboid.codes(start, end) if group else ()
+            for dim in group:
+                columns[dim] = self.labels[dim][codes[cuboid.dims.index(dim)]]
+            values = {name: array[start:end] for name, array in cuboid.values.items()}
+        else:
+            columns.update((dim, np.array([], dtype=object)) for dim in group)
+            values = {name: array[:0] for name, array in self.base.values.items()}
+        columns['players'] = values['players']
+        for measure in MEASURES:
+            count = values[f'n_{measure}']
+            with np.errstate(invalid='ignore', divide='ignore'):
+                columns[f'avg_{measure}'] = np.where(count > 0, values[f'sum_{measure}'] / count, np.nan)
+            columns[f'min_{measure}'] = np.where(count > 0, values[f'min_{measure}'], np.nan)
+            columns[f'max_{measure}'] = np.where(count > 0, values[f'max_{measure}'], np.nan)
+            columns[f'sum_{measure}'] = values[f'sum_{measure}']
+        return columns
+
+    def query(self, group_by=(), **where):
+        """Agregat per kelompok `group_by` untuk pemain yang cocok dengan `where`.
+
+        where: dimensi=nilai asli (misal club='FC Barcelona', age_band='<=20').
+        Mengembalikan DataFrame: kolom dimensi (label tampilan), players,
+        lalu avg_/min_/max_/sum_ untuk setiap ukuran.
+        """
+        group = [dim for dim in group_by if dim not in where]
+        return pd.DataFrame(self._columns(group, where))
+
+    def summary(self, **where):
+        """Satu ringkasan (dict) untuk pemain yang cocok dengan `where`"""
+        columns = self._columns([], where)
+        if not len(columns['players']):
+            return {'players': 0}
+        return {name: values[0].item() for name, values in columns.items()}
+
+    def histogram(self, measure='overall', **where):
+        """Jumlah pemain per rentang rating (Series berlabel '70-74'), tanpa rentang kosong di tepi"""
+        if measure not in HISTOGRAM_MEASURES:
+            raise ValueError(f'Histogram hanya tersedia untuk {", ".join(HISTOGRAM_MEASURES)}')
+        cuboid, start, end = self._locate((), where)
+        counts = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+        if cuboid is not None:
+            counts += cuboid.values[f'hist_{measure}'][start:end].sum(axis=0)
+        labels = [f'{i * HISTOGRAM_WIDTH}-{i * HISTOGRAM_WIDTH + HISTOGRAM_WIDTH - 1}'
+                  for i in range(HISTOGRAM_BINS)]
+        used = np.flatnonzero(counts)
+        if not len(used):
+            return pd.Series([], dtype=np.int64, name=measure)
+        keep = slice(used[0], used[-1] + 1)
+        return pd.Series(counts[keep], index=labels[keep], name=measure)
+
+def analytics_cube(dataset):
+    """AnalyticsCube dataset (dibangun sekali, di-cache di dataset)"""
+    return dataset.cached('analytics', AnalyticsCube)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ringkasan agregat pemain per liga/klub/negara/posisi/umur')
+    parser.add_argument('group_by', nargs='*', help=f'Dimensi pengelompokan: {", ".join(DIMENSIONS)}')
+    parser.add_argument('--csv', default=None, help='Lokasi dataset pemain')
+    for dim in DIMENSIONS:
+        parser.add_argument('--' + dim.replace('_', '-'), dest=dim, help=f'Filter {dim} (nilai asli)')
+    parser.add_argument('--sort', default='players', help='Kolom pengurutan (menurun)')
+    parser.add_argument('--output', '-o', help='File CSV hasil (default: cetak ke layar)')
+    args = parser.parse_args(argv)
+
+    from player_query import load_dataset
+    from player_store import DEFAULT_CSV_PATH
+
+    try:
+        dataset = load_dataset(args.csv or DEFAULT_CSV_PATH)
+    except FileNotFoundError:
+        print('[ERROR] File tidak ditemukan di', args.csv or DEFAULT_CSV_PATH)
+        return 1
+    where = {dim: getattr(args, dim) for dim in DIMENSIONS if getattr(args, dim) is not None}
+    try:
+        frame = analytics_cube(dataset).query(args.group_by, **where)
+    except ValueError as e:
+        print('[X]', e)
+        return 1
+    if args.sort not in frame.columns:
+        print('[X] Kolom pengurutan tidak dikenal:', args.sort)
+        return 1
+    frame = frame.sort_values(args.sort, ascending=False, kind='stable')
+    if args.output:
+        frame.to_csv(args.output, index=False)
+        print(f'[OK] {len(frame)} baris disimpan ke {args.output}')
+    else:
+        print(frame.round(2).to_string(index=False))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
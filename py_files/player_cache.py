@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""Cache hasil query (posisi baris) dengan eviction LRU.
+
+Kunci cache adalah bentuk kanonik kumpulan predikat (frozenset kunci
+predikat), jadi urutan filter tidak berpengaruh. Nilai yang disimpan hanya
+array posisi baris (read-only), bukan salinan DataFrame. Query yang
+predikatnya merupakan superset dari entri cache cukup dievaluasi atas baris
+entri tersebut; misal "klub X + umur 18-21" memakai hasil "klub X" yang
+sudah ada.
+
+Ukuran dibatasi jumlah entri dan total byte array; entri yang paling lama
+tidak dipakai dibuang lebih dulu.
+"""
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 << 20
+
+class ResultCache:
+    """Cache LRU {kunci predikat: posisi baris} dengan statistik hit/miss"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        # Server mode thread memakai satu dataset (dan cache) dari banyak thread
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.subset_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Posisi baris untuk kunci yang sama persis, atau None (tidak dihitung sebagai miss)"""
+        with self._lock:
+            rows = self._entries.get(key)
+            if rows is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return rows
+
+    def subset(self, key):
+        """Entri terkecil yang predikatnya subset dari `key`: (kunci, baris) atau (None, None).
+
+        Dipanggil setelah get() gagal; jika tidak ada entri yang cocok,
+        dihitung sebagai miss.
+        """
+        with self._lock:
+            best_key, best_rows = None, None
+            for cached_key, rows in self._entries.items():
+                if cached_key < key and (best_rows is None or len(rows) < len(best_rows)):
+                    best_key, best_rows = cached_key, rows
+            if best_key is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(best_key)
+                self.subset_hits += 1
+            return best_key, best_rows
+
+    def put(self, key, rows):
+        """Menyimpan hasil (array dijadikan read-only); mengembalikan array tersimpan"""
+        rows.flags.writeable = False
+        if rows.nbytes > self.max_bytes:
+            return rows
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[key] = rows
+            self._bytes += rows.nbytes
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+        return rows
+
+    def clear(self):
+        """Mengosongkan cache (misal setelah data berubah); statistik tetap"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Statistik cache sebagai dict"""
+        with self._lock:
+            lookups = self.hits + self.subset_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'subset_hits': self.subset_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round((self.hits + self.subset_hits) / lookups, 4) if lookups else None,
+            }
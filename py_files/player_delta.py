@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""Update delta (tambah/ubah/hapus pemain per sofifa_id) tanpa memuat ulang data.
+
+File delta berisi satu perubahan per baris, dikunci sofifa_id. JSONL:
+    {"sofifa_id": 158023, "club_name": "Paris Saint-Germain", "overall": 93}
+    {"sofifa_id": 990001, "short_name": "A. Muda", "long_name": "Anak Muda", "age": 16}
+    {"op": "delete", "sofifa_id": 20801}
+CSV: kolom sofifa_id, op (opsional: upsert/delete), lalu kolom yang diubah.
+Nilai kosong/null berarti tidak berubah. Pemain yang belum ada ditambahkan;
+beberapa perubahan untuk pemain yang sama digabung (yang terakhir menang).
+
+apply_delta() membuat versi dataset baru (copy-on-write): kolom yang tidak
+berubah dipakai bersama, kolom turunan (normalisasi, tampilan, posisi)
+hanya dihitung untuk baris yang berubah, kamus categorical ditambah, dan
+indeks diperbarui dengan membuang/menyisipkan entri baris yang berubah.
+Dataset lama tidak diubah sama sekali, jadi query yang sedang berjalan tetap
+memakai versi lama sampai pemanggil beralih ke versi baru.
+
+File delta yang disimpan ke snapshot juga disalin ke log `<nama_csv>.deltas/`.
+Jika snapshot dibangun ulang dari CSV (CSV berubah atau format snapshot baru),
+log ini diterapkan ulang secara berurutan; setelah CSV baru sudah memuat
+semua perubahan tersebut, kosongkan log dengan --clear-log.
+
+Contoh:
+    python player_delta.py transfer_hari_ini.csv      # terapkan lalu simpan ke snapshot
+    python player_delta.py --clear-log                # CSV sudah memuat semua delta
+    python player_delta.py update.jsonl --no-save --verify  # cek indeks hasil patch
+    dataset, summary = apply_delta(dataset, read_delta('update.jsonl'))
+"""
+import argparse
+import csv
+import datetime
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import player_profile as profile
+from player_index import RowPatch, build_indexes
+from player_query import PlayerDataset, load_dataset
+from player_store import (CATEGORICAL_COLUMNS, DEFAULT_CSV_PATH, DELTA_LOG_NAME, DISPLAY_COLUMNS,
+                          INGEST_DTYPES, NORMALIZED_COLUMNS, USED_COLUMNS, add_derived_columns,
+                          delta_log_dir, derived_values, file_hash, load_snapshot, map_unique,
+                          read_delta_log, read_manifest, repair_values, snapshot_dir, write_snapshot)
+
+DELTA_OPS = ('upsert', 'delete')
+# Kolom turunan yang ikut berubah jika kolom asalnya berubah
+DERIVED_COLUMNS = {
+    source: [target for target in (NORMALIZED_COLUMNS.get(source), DISPLAY_COLUMNS.get(source)) if target]
+    for source in USED_COLUMNS
+}
+DERIVED_COLUMNS['player_positions'] = ['position_mask', 'primary_position_mask']
+
+def is_blank(value):
+    return value is None or (isinstance(value, str) and not value.strip()) or \
+        (isinstance(value, float) and np.isnan(value))
+
+class Delta:
+    """Perubahan yang sudah digabung per sofifa_id.
+
+    upserts: DataFrame ber-index sofifa_id (NaN = tidak berubah);
+    deletes: array sofifa_id yang dihapus; replaced: sofifa_id yang dihapus
+    lalu ditambahkan lagi dalam delta yang sama (semua kolom diganti).
+    """
+
+    def __init__(self, records):
+        pending, deleted, replaced = {}, set(), set()
+        self.ignored = set()
+        for number, record in enumerate(records, 1):
+            record = dict(record)
+            op = str(record.pop('op', None) or 'upsert').strip().lower()
+            if op not in DELTA_OPS:
+                raise ValueError(f'Baris delta {number}: operasi tidak dikenal: {op}')
+            try:
+                player_id = int(float(record.pop('sofifa_id')))
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f'Baris delta {number}: sofifa_id tidak valid') from None
+            if op == 'delete':
+                pending.pop(player_id, None)
+                replaced.discard(player_id)
+                deleted.add(player_id)
+                continue
+            if player_id in deleted:
+                deleted.discard(player_id)
+                replaced.add(player_id)
+            fields = pending.setdefault(player_id, {})
+            for col, value in record.items():
+                if col not in USED_COLUMNS:
+                    self.ignored.add(col)
+                elif not is_blank(value):
+                    fields[col] = value
+        columns = [col for col in USED_COLUMNS
+                   if col != 'sofifa_id' and any(col in fields for fields in pending.values())]
+        self.upserts = pd.DataFrame.from_dict(pending, orient='index', columns=columns, dtype=object)
+        self.upserts.index = self.upserts.index.astype(np.int64)
+        self.deletes = np.array(sorted(deleted), dtype=np.int64)
+        self.replaced = replaced
+
+    def __len__(self):
+        return len(self.upserts) + len(self.deletes)
+
+def read_delta(path):
+    """Membaca file delta .csv atau .jsonl"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            return Delta(csv.DictReader(f))
+    if extension in ('.jsonl', '.json'):
+        with open(path, encoding='utf-8') as f:
+            return Delta(json.loads(line) for line in f if line.strip())
+    raise ValueError(f'Format delta tidak didukung: {extension} (gunakan .csv atau .jsonl)')
+
+def numeric_values(col, values, dtype):
+    """Nilai numerik delta dan tipe kolom hasilnya (int menjadi float32 jika ada nilai kosong)"""
+    try:
+        values = np.asarray(values, dtype=object).astype(np.float64)
+    except (TypeError, ValueError):
+        raise ValueError(f'Nilai kolom {col} harus berupa angka') from None
+    if dtype.kind not in 'iu':
+        return values, dtype
+    missing = np.isnan(values)
+    present = values[~missing]
+    info = np.iinfo(dtype)
+    if len(present) and (present.min() < info.min or present.max() > info.max or (present % 1 != 0).any()):
+        raise ValueError(f'Nilai kolom {col} tidak muat di tipe {dtype}')
+    return values, np.dtype(np.float32) if missing.any() else dtype
+
+def category_indexes(indexes):
+    """Indeks baris per kategori untuk kolom categorical yang punya kolom turunan"""
+    return {'club_name': indexes.hierarchy.clubs, 'league_name': indexes.hierarchy.leagues,
+            'nationality_name': indexes.nations}
+
+def sample_rows(index, values):
+    """Satu posisi baris lama per nilai yang kategorinya sudah terpakai, -1 jika belum ada"""
+    codes = index.categories.get_indexer(pd.Index(values, dtype=object))
+    starts = index.offsets[codes]
+    used = (codes >= 0) & (index.offsets[codes + 1] > starts)
+    return np.where(used, index.rows[np.minimum(starts, len(index.rows) - 1)], -1)
+
+def inserted_values(dataset, delta, changed, order):
+    """Nilai setiap kolom untuk baris patch.inserted ({kolom: array}).
+
+    Nilai lama ditimpa nilai delta; kolom turunan hanya dihitung ulang untuk
+    nilai asal yang berubah. Untuk klub/liga/negara yang sudah ada, nilai
+    turunannya disalin dari salah satu baris lama.
+    """
+    df = dataset.df
+    categories = category_indexes(dataset.indexes)
+    updates = delta.upserts.iloc[order]
+    # Pemain baru dan pemain yang diganti penuh: semua kolom berasal dari delta
+    fresh = np.ones(len(order), dtype=bool)
+    fresh[:len(changed)] = updates.index[:len(changed)].isin(list(delta.replaced))
+    values, given = {}, {}
+    for col in df.columns:
+        old = np.asarray(df[col].array.take(changed), dtype=object if col in USED_COLUMNS else None)
+        column = np.full(len(order), np.nan if old.dtype.kind == 'O' else 0, dtype=old.dtype)
+        column[:len(changed)] = old
+        column[fresh] = np.nan if column.dtype.kind == 'O' else 0
+        values[col] = column
+    values['sofifa_id'] = updates.index.to_numpy()
+    for col in updates.columns:
+        new = updates[col].to_numpy(dtype=object, copy=True)
+        given[col] = ~pd.isna(new)
+        if col not in INGEST_DTYPES:
+            text = pd.Series(new[given[col]].astype(str), dtype=object)
+            new[given[col]] = map_unique(text, repair_values).to_numpy()
+        values[col][given[col]] = new[given[col]]
+    # Nilai kosong menghasilkan kolom turunan kosong, jadi cukup nilai yang diisi delta
+    for source, mask in given.items():
+        if not DERIVED_COLUMNS.get(source) or not mask.any():
+            continue
+        recompute = np.flatnonzero(mask)
+        if source in categories and len(df):
+            rows = sample_rows(categories[source], values[source][recompute])
+            for target in DERIVED_COLUMNS[source]:
+                if target in values:
+                    values[target][recompute[rows >= 0]] = \
+                        df[target].take(rows[rows >= 0]).to_numpy(dtype=values[target].dtype)
+            recompute = recompute[rows < 0]
+        if len(recompute):
+            derived = derived_values(source, pd.Series(values[source][recompute], dtype=object))
+            for target, result in derived.items():
+                if target in values:
+                    values[target][recompute] = result
+    return values
+
+def patched_column(df, col, values, patch):
+    """Kolom versi baru: nilai lama pada posisi baru, nilai baris patch.inserted diganti"""
+    series = df[col]
+    if col in CATEGORICAL_COLUMNS:
+        categories = series.cat.categories
+        labels = np.asarray(values[~pd.isna(values)], dtype=object)
+        extra = np.setdiff1d(labels, np.asarray(categories, dtype=object)) if len(labels) else labels
+        if len(extra):
+            # Kategori tetap terurut alfabetis: kode lama dipetakan ke posisi barunya
+            categories = pd.Index(np.union1d(np.asarray(categories, dtype=object), extra),
+                                  dtype=categories.dtype)
+        remap = np.append(categories.get_indexer(series.cat.categories), -1)
+        codes = remap[patch.carry(series.cat.codes.to_numpy().astype(np.int64), -1)]
+        codes[patch.inserted] = categories.get_indexer(pd.Index(values, dtype=object))
+        return pd.Categorical.from_codes(codes, categories=categories)
+    if col in INGEST_DTYPES:
+        old = series.to_numpy()
+        values, dtype = numeric_values(col, values, old.dtype)
+        column = patch.carry(old.astype(dtype, copy=False), np.nan if dtype.kind == 'f' else 0)
+        column[patch.inserted] = values
+        return column
+    if pd.api.types.is_numeric_dtype(series):
+        column = patch.carry(series.to_numpy(), 0)
+        column[patch.inserted] = values
+        return column
+    if series.dtype == object:
+        column = patch.carry(series.to_numpy(), np.nan)
+        column[patch.inserted] = values
+        return pd.Series(column, dtype=object, copy=False)
+    # Kolom teks: take() pada array pandas tidak memvalidasi ulang seluruh string
+    column = series.array.take(patch.carry(np.arange(len(series)), -1), allow_fill=True)
+    column[patch.inserted] = values
+    return pd.Series(column, copy=False)
+
+def apply_delta(dataset, delta):
+    """Menerapkan delta; mengembalikan (dataset versi baru, ringkasan dict).
+
+    Dataset lama tidak diubah; kolom dan indeks yang tidak tersentuh dipakai bersama.
+    """
+    start = time.perf_counter()
+    with profile.stage('apply delta', len(dataset)) as stage:
+        df = dataset.df
+        upsert_ids = delta.upserts.index.to_numpy()
+        upsert_rows = dataset.indexes.ids.lookup(upsert_ids)
+        delete_rows = dataset.indexes.ids.lookup(delta.deletes)
+        existing = upsert_rows >= 0
+        changed = upsert_rows[existing]
+        # Urutan baris delta mengikuti patch.inserted: baris lama yang berubah, lalu pemain baru
+        order = np.concatenate((np.flatnonzero(existing), np.flatnonzero(~existing)))
+        patch = RowPatch(len(df), delete_rows[delete_rows >= 0], changed, int((~existing).sum()))
+        with profile.stage('derived columns', len(order)):
+            inserted = inserted_values(dataset, delta, changed, order)
+        touched = set()
+        for col in delta.upserts.columns if not delta.replaced else USED_COLUMNS:
+            touched.update([col] + DERIVED_COLUMNS.get(col, []))
+        data = {}
+        for col in df.columns:
+            if not patch.structural and col not in touched:
+                data[col] = df[col]
+            else:
+                data[col] = patched_column(df, col, inserted[col], patch)
+        new_df = pd.DataFrame(data, copy=False)
+        with profile.stage('patch indexes', len(order)):
+            indexes = dataset.indexes.patched(new_df, patch, touched)
+        stage.rows_out = len(new_df)
+    summary = {
+        'updated': int(existing.sum()),
+        'added': int((~existing).sum()),
+        'deleted': int((delete_rows >= 0).sum()),
+        'missing_deletes': int((delete_rows < 0).sum()),
+        'rows': len(new_df),
+        'ms': round((time.perf_counter() - start) * 1000, 3),
+    }
+    return PlayerDataset(new_df, indexes, from_snapshot=dataset.from_snapshot), summary
+
+def verify_indexes(dataset):
+    """Nama indeks hasil patch yang berbeda dari indeks yang dibangun ulang dari DataFrame-nya"""
+    with profile.stage('verify indexes', len(dataset)):
+        return dataset.indexes.differences(build_indexes(dataset.df, lazy=True))
+
+def log_deltas(csv_path, paths, summaries):
+    """Menyalin file delta ke log delta; mengembalikan entri log yang ditambahkan"""
+    folder = delta_log_dir(csv_path)
+    os.makedirs(folder, exist_ok=True)
+    log = read_delta_log(csv_path)
+    entries = []
+    for path, summary in zip(paths, summaries):
+        # Nomor urut di depan nama: file dengan nama sama tidak saling menimpa
+        name = f'{len(log) + len(entries) + 1:04d}_{os.path.basename(path)}'
+        shutil.copyfile(path, os.path.join(folder, name))
+        entries.append(dict(summary, file=name, source=os.path.basename(path), sha1=file_hash(path),
+                            applied=datetime.datetime.now().isoformat(timespec='seconds')))
+    tmp = os.path.join(folder, DELTA_LOG_NAME + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(log + entries, f, indent=2)
+    os.replace(tmp, os.path.join(folder, DELTA_LOG_NAME))
+    return entries
+
+def replay_delta_log(csv_path):
+    """Menerapkan ulang log delta pada snapshot yang baru dibangun dari CSV.
+
+    Dipanggil player_store.build_snapshot; mengembalikan jumlah pemain.
+    Delta yang gagal (file hilang/berubah) menghentikan replay dan dilaporkan.
+    """
+    manifest = read_manifest(csv_path)
+    df = load_snapshot(csv_path, manifest)
+    add_derived_columns(df)
+    dataset = PlayerDataset(df, build_indexes(df, lazy=True), from_snapshot=True)
+    folder = delta_log_dir(csv_path)
+    log = read_delta_log(csv_path)
+    applied = []
+    for entry in log:
+        path = os.path.join(folder, entry['file'])
+        try:
+            if file_hash(path) != entry['sha1']:
+                raise ValueError('isi file berbeda dari saat diterapkan')
+            dataset, _ = apply_delta(dataset, read_delta(path))
+        except (OSError, ValueError) as e:
+            print(f'[ERROR] Delta {entry["file"]} dari log gagal diterapkan ulang: {e}')
+            break
+        applied.append(entry)
+    write_snapshot(csv_path, dataset.df, dict(manifest, deltas=applied))
+    print(f'[INFO] Snapshot dibangun ulang dari CSV: {len(applied)} dari {len(log)} delta di '
+          f'{folder} diterapkan ulang (jalankan player_delta.py --clear-log jika CSV sudah memuatnya)')
+    return len(dataset)
+
+def clear_log(csv_path):
+    """Menghapus log delta beserta snapshot, agar data berikutnya dimuat dari CSV saja"""
+    shutil.rmtree(delta_log_dir(csv_path), ignore_errors=True)
+    shutil.rmtree(snapshot_dir(csv_path), ignore_errors=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Menerapkan file delta (upsert/hapus per sofifa_id)')
+    parser.add_argument('deltas', nargs='*', help='File delta .csv atau .jsonl (diterapkan berurutan)')
+    parser.add_argument('--csv', default=DEFAULT_CSV_PATH, help='Lokasi dataset pemain')
+    parser.add_argument('--no-save', action='store_true', help='Hanya uji coba, snapshot tidak diubah')
+    parser.add_argument('--verify', action='store_true',
+                        help='Bandingkan semua indeks hasil patch dengan indeks yang dibangun ulang')
+    parser.add_argument('--clear-log', action='store_true',
+                        help='Kosongkan log delta (CSV sudah memuat semua delta) dan bangun ulang snapshot')
+    args = parser.parse_args(argv)
+
+    if args.clear_log:
+        count = len(read_delta_log(args.csv))
+        clear_log(args.csv)
+        print(f'[OK] Log delta dikosongkan ({count} delta); snapshot dibangun ulang saat data dimuat')
+        if not args.deltas:
+            return 0
+    elif not args.deltas:
+        parser.error('Masukkan minimal satu file delta, atau --clear-log')
+
+    try:
+        dataset = load_dataset(args.csv)
+    except FileNotFoundError:
+        print('[ERROR] File tidak ditemukan di', args.csv)
+        return 1
+    manifest = read_manifest(args.csv)
+    if manifest is None and not args.no_save:
+        print('[ERROR] Snapshot tidak tersedia untuk', args.csv)
+        return 1
+    if args.verify:
+        # Semua indeks dibangun dulu, supaya semuanya ikut di-patch dan diperiksa
+        dataset.indexes.warm()
+    summaries = []
+    for path in args.deltas:
+        try:
+            delta = read_delta(path)
+            dataset, summary = apply_delta(dataset, delta)
+        except (OSError, ValueError) as e:
+            print(f'[ERROR] Delta {path} gagal diterapkan: {e}')
+            return 1
+        if delta.ignored:
+            print('[INFO] Kolom diabaikan:', ', '.join(sorted(delta.ignored)))
+        if summary['missing_deletes']:
+            print(f'[INFO] {summary["missing_deletes"]} sofifa_id yang dihapus tidak ditemukan')
+        print(f'[OK] {path}: {summary["updated"]} diubah, {summary["added"]} ditambah, '
+              f'{summary["deleted"]} dihapus dalam {summary["ms"]:.1f} ms ({summary["rows"]} pemain)')
+        summaries.append(summary)
+    if args.verify:
+        mismatched = verify_indexes(dataset)
+        if mismatched:
+            print('[X] Indeks hasil patch berbeda dari indeks yang dibangun ulang:', ', '.join(mismatched))
+            return 1
+        print('[OK] Semua indeks hasil patch sama dengan indeks yang dibangun ulang')
+    if args.no_save:
+        return 0
+    # Log ditulis lebih dulu: jika snapshot dibangun ulang dari CSV, delta ini diterapkan ulang
+    applied = log_deltas(args.csv, args.deltas, summaries)
+    # Sumber CSV tetap sama, jadi snapshot ini tetap dipakai sampai CSV-nya berubah
+    write_snapshot(args.csv, dataset.df, {'source': manifest['source'], 'encoding': manifest.get('encoding'),
+                                          'deltas': manifest.get('deltas', []) + applied})
+    print('[OK] Snapshot diperbarui:', len(dataset), 'pemain;', len(applied), 'delta dicatat di',
+          delta_log_dir(args.csv))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,717 @@
+# -*- coding: utf-8 -*-
+"""Indeks pencarian yang dibangun sekali setelah data dimuat.
+
+Semua indeks menyimpan posisi baris (0..n-1) pada DataFrame, sehingga hasil
+pencarian cukup diambil dengan `df.iloc[row_ids]`.
+"""
+import threading
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+import player_profile as profile
+
+# Pemisah antar kolom nama; tidak pernah muncul di input pengguna,
+# sehingga trigram tidak pernah cocok melintasi dua kolom
+FIELD_SEPARATOR = '\x01'
+NGRAM = 3
+# Jumlah baris yang diproses sekaligus saat membangun indeks (membatasi memori)
+BUILD_CHUNK_ROWS = 50000
+# Batas kandidat yang diverifikasi dengan edit distance per query fuzzy
+MAX_EDIT_CANDIDATES = 500
+
+# Kode posisi FIFA; urutan menentukan nomor bit pada kolom position_mask
+POSITION_CODES = [
+    'GK', 'RB', 'RWB', 'CB', 'LB', 'LWB', 'CDM', 'CM', 'CAM',
+    'RM', 'LM', 'RW', 'LW', 'CF', 'ST', 'RF', 'LF',
+]
+POSITION_BITS = {code: 1 << i for i, code in enumerate(POSITION_CODES)}
+# Mode pencocokan posisi untuk position_filter
+POSITION_MODES = ('any', 'all', 'primary')
+
+# Kolom numerik yang diberi indeks range (permutasi terurut)
+RANGE_COLUMNS = [
+    'age', 'overall', 'potential', 'value_eur', 'wage_eur',
+    'pace', 'shooting', 'passing', 'dribbling', 'defending', 'physic',
+]
+
+def encode_grams(codepoints):
+    """Menggabungkan 3 code point berurutan menjadi satu kunci uint64"""
+    c = codepoints.astype(np.uint64)
+    return (c[..., :-2] << np.uint64(42)) | (c[..., 1:-1] << np.uint64(21)) | c[..., 2:]
+
+def text_grams(text):
+    """Kunci trigram unik (terurut) dari satu teks"""
+    if len(text) < NGRAM:
+        return np.empty(0, dtype=np.uint64)
+    codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    return np.unique(encode_grams(codepoints))
+
+def substring_distance(pattern, text):
+    """Edit distance minimum antara pattern dan substring mana pun dari text"""
+    previous = list(range(len(pattern) + 1))
+    best = previous[-1]
+    for ch in text:
+        # Baris pertama selalu 0: kecocokan boleh dimulai di posisi mana pun
+        current = [0]
+        for i, p in enumerate(pattern, 1):
+            cost = 0 if p == ch else 1
+            current.append(min(previous[i] + 1, current[i - 1] + 1, previous[i - 1] + cost))
+        best = min(best, current[-1])
+        previous = current
+    return best
+
+class RowPatch:
+    """Perubahan posisi baris dari satu versi DataFrame ke versi berikutnya.
+
+    deleted: posisi lama yang dihapus; changed: posisi lama yang nilainya
+    berubah; appended: jumlah baris baru di akhir. Baris yang tersisa tetap
+    berurutan, jadi posisi lama cukup digeser (`remap`). Entri indeks untuk
+    baris `stale` dibuang lalu baris `inserted` (posisi baru) disisipkan ulang.
+    """
+
+    def __init__(self, old_size, deleted, changed, appended):
+        keep = np.ones(old_size, dtype=bool)
+        keep[deleted] = False
+        self.old_size = old_size
+        self.remap = np.cumsum(keep) - 1
+        self.remap[~keep] = -1
+        kept = int(keep.sum())
+        self.size = kept + appended
+        self.structural = kept != old_size or appended > 0
+        self.stale = ~keep
+        self.stale[changed] = True
+        self.changed = self.remap[changed]
+        self.appended = np.arange(kept, self.size)
+        self.inserted = np.concatenate((self.changed, self.appended))
+        self.keep = keep
+
+    def carry(self, values, fill):
+        """Array nilai lama pada posisi baru (baris baru diisi `fill`), belum diubah"""
+        values = values[self.keep] if self.structural else values.copy()
+        if len(self.appended):
+            values = np.concatenate((values, np.full(len(self.appended), fill, dtype=values.dtype)))
+        return values
+
+def same_state(a, b):
+    """True jika dua indeks (lihat state()) berisi data yang sama"""
+    if a is None or b is None:
+        return a is b
+    left, right = a.state(), b.state()
+    if left.keys() != right.keys():
+        return False
+    for key, value in left.items():
+        other = right[key]
+        if isinstance(value, np.ndarray):
+            if value.shape != np.shape(other) or not np.array_equal(value, other):
+                return False
+        elif value != other:
+            return False
+    return True
+
+def block_positions(rows, starts, ends, new_rows, descending=False):
+    """Posisi sisip setiap new_rows di dalam blok terurut rows[starts:ends].
+
+    Bisection dijalankan serentak untuk semua entri baru, jadi biayanya
+    sebanding dengan jumlah entri baru x log(ukuran blok), bukan ukuran indeks.
+    """
+    lo, hi = starts.astype(np.int64), ends.astype(np.int64)
+    active = lo < hi
+    while active.any():
+        mid = (lo + hi) // 2
+        probe = rows[np.minimum(mid, len(rows) - 1)]
+        before = active & ((probe > new_rows) if descending else (probe < new_rows))
+        lo = np.where(before, mid + 1, lo)
+        hi = np.where(active & ~before, mid, hi)
+        active = lo < hi
+    return lo
+
+def patch_postings(offsets, rows, patch, key_map, new_keys, new_rows, num_keys):
+    """CSR (offsets, rows) versi baru: entri baris stale dibuang, posisi digeser, entri baru disisipkan.
+
+    key_map memetakan kunci lama ke kunci baru; entri baru harus terurut (kunci, baris).
+    """
+    keep = ~patch.stale[rows]
+    dropped = np.flatnonzero(~keep)
+    counts = np.zeros(num_keys, dtype=np.int64)
+    counts[key_map] = np.diff(offsets) - np.bincount(np.searchsorted(offsets, dropped, side='right') - 1,
+                                                     minlength=len(offsets) - 1)
+    rows = rows[keep]
+    if patch.structural:
+        rows = patch.remap[rows]
+    starts = np.concatenate(([0], np.cumsum(counts)))
+    at = block_positions(rows, starts[new_keys], starts[new_keys + 1], new_rows)
+    counts += np.bincount(new_keys, minlength=num_keys)
+    return (np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+            np.insert(rows, at, new_rows).astype(np.int32, copy=False))
+
+class NameIndex:
+    """Indeks terbalik trigram atas nama pemain yang sudah dinormalisasi.
+
+    Posting list disimpan dalam format CSR: `keys` (trigram terurut),
+    `offsets`, dan `rows` (posisi baris, terurut per trigram).
+    """
+
+    def __init__(self, texts):
+        self.texts = np.asarray(texts, dtype=object)
+        keys, rows = [], []
+        for start in range(0, len(self.texts), BUILD_CHUNK_ROWS):
+            chunk_keys, chunk_rows = self._chunk_grams(self.texts[start:start + BUILD_CHUNK_ROWS])
+            keys.append(chunk_keys)
+            rows.append(chunk_rows + start)
+        keys = np.concatenate(keys) if keys else np.empty(0, dtype=np.uint64)
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        order = np.lexsort((rows, keys))
+        keys, rows = keys[order], rows[order]
+        # Satu trigram bisa muncul berkali-kali dalam satu nama: simpan sekali
+        keep = np.ones(len(keys), dtype=bool)
+        keep[1:] = (keys[1:] != keys[:-1]) | (rows[1:] != rows[:-1])
+        keys, rows = keys[keep], rows[keep]
+        self.keys, starts = np.unique(keys, return_index=True)
+        self.offsets = np.append(starts, len(keys)).astype(np.int64)
+        self.rows = rows.astype(np.int32)
+        self.gram_counts = np.bincount(self.rows, minlength=len(self.texts))
+
+    @staticmethod
+    def _chunk_grams(texts):
+        """Pasangan (trigram, baris) untuk satu blok teks, dihitung secara vektor"""
+        if len(texts) == 0:
+            return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+        codepoints = np.array(texts, dtype=str)
+        width = codepoints.dtype.itemsize // 4
+        if width < NGRAM:
+            return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+        codepoints = codepoints.view(np.uint32).reshape(len(texts), width)
+        grams = encode_grams(codepoints)
+        # Trigram yang menyentuh padding (code point 0) bukan bagian dari teks
+        valid = (codepoints[:, :-2] != 0) & (codepoints[:, 1:-1] != 0) & (codepoints[:, 2:] != 0)
+        rows = np.broadcast_to(np.arange(len(texts))[:, None], grams.shape)
+        return grams[valid], rows[valid]
+
+    @staticmethod
+    def frame_texts(df, columns=('normalized_name', 'normalized_short_name'), rows=None):
+        """Teks terindeks per baris: kolom nama ternormalisasi dipisah FIELD_SEPARATOR"""
+        columns = [c for c in columns if c in df.columns]
+        parts = [df[c] if rows is None else df[c].iloc[rows] for c in columns]
+        parts = [part.fillna('').astype(str).to_numpy(dtype=object) for part in parts]
+        texts = parts[0]
+        for part in parts[1:]:
+            texts = texts + FIELD_SEPARATOR + part
+        return texts
+
+    @classmethod
+    def from_frame(cls, df, columns=('normalized_name', 'normalized_short_name')):
+        """Membangun indeks dari kolom nama ternormalisasi pada DataFrame"""
+        return cls(cls.frame_texts(df, columns))
+
+    def patched(self, df, patch):
+        """Indeks baru setelah perubahan baris; hanya nama baris `patch.inserted` yang diproses"""
+        texts = patch.carry(self.texts, '')
+        new_texts = self.frame_texts(df, rows=patch.inserted)
+        texts[patch.inserted] = new_texts
+        grams, local = self._chunk_grams(new_texts)
+        new_rows = patch.inserted[local]
+        order = np.lexsort((new_rows, grams))
+        grams, new_rows, local = grams[order], new_rows[order], local[order]
+        unique = np.ones(len(grams), dtype=bool)
+        unique[1:] = (grams[1:] != grams[:-1]) | (new_rows[1:] != new_rows[:-1])
+        grams, new_rows, local = grams[unique], new_rows[unique], local[unique]
+        # Trigram yang belum ada disisipkan ke daftar kunci; kunci lama bergeser
+        distinct = grams[np.concatenate(([True], grams[1:] != grams[:-1]))] if len(grams) else grams
+        found = np.searchsorted(self.keys, distinct)
+        known = found < len(self.keys)
+        known[known] = self.keys[found[known]] == distinct[known]
+        extra = distinct[~known]
+        keys = np.insert(self.keys, np.searchsorted(self.keys, extra), extra)
+        key_map = np.arange(len(self.keys)) + np.searchsorted(extra, self.keys)
+        index = NameIndex.__new__(NameIndex)
+        index.texts = texts
+        index.keys = keys
+        index.offsets, index.rows = patch_postings(self.offsets, self.rows, patch, key_map,
+                                                   np.searchsorted(keys, grams), new_rows, len(keys))
+        index.gram_counts = patch.carry(self.gram_counts, 0)
+        index.gram_counts[patch.inserted] = np.bincount(local, minlength=len(patch.inserted))
+        return index
+
+    def state(self):
+        """Isi indeks dalam bentuk kanonik (trigram tanpa baris tidak ikut), untuk perbandingan"""
+        counts = np.diff(self.offsets)
+        return {'texts': self.texts, 'keys': self.keys[counts > 0], 'counts': counts[counts > 0],
+                'rows': self.rows, 'gram_counts': self.gram_counts}
+
+    def __len__(self):
+        return len(self.texts)
+
+    def postings(self, key):
+        """Posisi baris yang mengandung satu kunci trigram"""
+        i = np.searchsorted(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            return self.rows[:0]
+        return self.rows[self.offsets[i]:self.offsets[i + 1]]
+
+    def search(self, query):
+        """Pencarian substring persis; mengembalikan posisi baris terurut"""
+        if not query:
+            return np.arange(len(self.texts))
+        grams = text_grams(query)
+        if len(grams) == 0:
+            return self._search_short(query)
+        else:
+            lists = sorted((self.postings(g) for g in grams), key=len)
+            candidates = lists[0]
+            for postings in lists[1:]:
+                if len(candidates) == 0:
+                    break
+                candidates = np.intersect1d(candidates, postings, assume_unique=True)
+        if len(query) == NGRAM:
+            # Satu trigram: posting list sudah merupakan hasil persis
+            return candidates
+        # Trigram yang sama belum tentu berurutan: verifikasi substring
+        texts = self.texts[candidates]
+        matched = np.fromiter((query in t for t in texts), dtype=bool, count=len(texts))
+        return candidates[matched]
+
+    def _search_short(self, query):
+        """Query 1-2 karakter: gabungkan posting list trigram yang memuatnya"""
+        mask = np.uint64((1 << 21) - 1)
+        chars = [(self.keys >> np.uint64(42)) & mask, (self.keys >> np.uint64(21)) & mask, self.keys & mask]
+        codes = [ord(c) for c in query]
+        matched = np.zeros(len(self.keys), dtype=bool)
+        for offset in range(NGRAM - len(codes) + 1):
+            hit = np.ones(len(self.keys), dtype=bool)
+            for i, code in enumerate(codes):
+                hit &= chars[offset + i] == code
+            matched |= hit
+        hits = np.zeros(len(self.texts), dtype=bool)
+        for i in np.flatnonzero(matched):
+            hits[self.rows[self.offsets[i]:self.offsets[i + 1]]] = True
+        # Nama yang lebih pendek dari satu trigram tidak punya posting list
+        short = np.flatnonzero(self.gram_counts == 0)
+        hits[short[[query in t for t in self.texts[short]]]] = True
+        return np.flatnonzero(hits)
+
+    def fuzzy(self, query, threshold=0.5, limit=20, max_edits=None):
+        """Pencarian toleran salah ketik berdasarkan kemiripan trigram.
+
+        Skor = proporsi trigram query yang ditemukan di nama. Jika `max_edits`
+        diisi, kandidat juga harus cocok dengan substring nama dalam maksimal
+        `max_edits` operasi edit. Mengembalikan (row_ids, scores) terurut.
+        """
+        grams = text_grams(query)
+        if len(grams) == 0:
+            rows = self.search(query)[:limit]
+            return rows, np.ones(len(rows))
+        lists = [self.postings(g) for g in grams]
+        rows, shared = np.unique(np.concatenate(lists), return_counts=True)
+        scores = shared / len(grams)
+        keep = scores >= threshold
+        if max_edits is not None:
+            # Setiap edit merusak paling banyak NGRAM trigram (q-gram lemma)
+            keep &= shared >= len(grams) - NGRAM * max_edits
+        rows, shared, scores = rows[keep], shared[keep], scores[keep]
+        # Pemecah skor seri: Jaccard, agar nama yang lebih pendek/tepat di atas
+        jaccard = shared / (len(grams) + self.gram_counts[rows] - shared)
+        order = np.lexsort((-jaccard, -scores))
+        rows, scores = rows[order], scores[order]
+        if max_edits is None:
+            return rows[:limit], scores[:limit]
+        selected = []
+        for i, row in enumerate(rows[:MAX_EDIT_CANDIDATES]):
+            if substring_distance(query, self.texts[row]) <= max_edits:
+                selected.append(i)
+                if len(selected) == limit:
+                    break
+        selected = np.array(selected, dtype=np.int64)
+        return rows[selected], scores[selected]
+
+def parse_positions(series):
+    """Mengubah player_positions menjadi bitmask semua posisi dan posisi utama.
+
+    Setiap string unik hanya di-parse sekali. Mengembalikan dua array uint32:
+    (mask semua posisi, mask posisi utama / posisi pertama).
+    """
+    codes, uniques = pd.factorize(series)
+    # Elemen terakhir (0) dipakai untuk kode -1 (NaN)
+    masks = np.zeros(len(uniques) + 1, dtype=np.uint32)
+    primary = np.zeros(len(uniques) + 1, dtype=np.uint32)
+    for i, value in enumerate(uniques):
+        tokens = [token.strip() for token in str(value).split(',')]
+        for token in tokens:
+            masks[i] |= POSITION_BITS.get(token, 0)
+        primary[i] = POSITION_BITS.get(tokens[0], 0)
+    return masks[codes], primary[codes]
+
+def position_bits(positions):
+    """Bitmask gabungan untuk sekumpulan kode posisi"""
+    bits = 0
+    for position in positions:
+        if position not in POSITION_BITS:
+            raise ValueError(f'Posisi tidak dikenal: {position}')
+        bits |= POSITION_BITS[position]
+    return np.uint32(bits)
+
+def positions_in(masks):
+    """Kode posisi yang muncul minimal sekali pada array bitmask"""
+    present = int(np.bitwise_or.reduce(masks, initial=0))
+    return [code for code in POSITION_CODES if present & POSITION_BITS[code]]
+
+def position_filter(masks, primary, positions, mode='any'):
+    """Mask boolean untuk query posisi.
+
+    mode 'any': bermain di salah satu posisi, 'all': bermain di semua posisi,
+    'primary': posisi utama adalah salah satu posisi.
+    """
+    bits = position_bits(positions)
+    if mode == 'any':
+        return (masks & bits) != 0
+    if mode == 'all':
+        return (masks & bits) == bits
+    if mode == 'primary':
+        return (primary & bits) != 0
+    raise ValueError(f'Mode posisi tidak dikenal: {mode}')
+
+def present_categories(series):
+    """Kategori (terurut) yang benar-benar muncul pada kolom categorical"""
+    codes = np.unique(series.cat.codes.to_numpy())
+    return list(series.cat.categories[codes[codes >= 0]])
+
+class CategoryIndex:
+    """Posisi baris per kategori untuk satu kolom categorical.
+
+    Baris dikelompokkan per kode kategori (CSR), sehingga memilih satu
+    klub/negara cukup satu lookup lalu `df.iloc[rows]`.
+    """
+
+    def __init__(self, series):
+        codes = series.cat.codes.to_numpy()
+        self.categories = series.cat.categories
+        self.codes = {value: code for code, value in enumerate(self.categories)}
+        order = np.argsort(codes, kind='stable')
+        order = order[codes[order] >= 0]
+        counts = np.bincount(codes[order], minlength=len(self.categories))
+        self.offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self.rows = order.astype(np.int32)
+
+    def rows_for(self, value):
+        """Posisi baris (terurut) untuk satu nilai; kosong jika tidak ada"""
+        code = self.codes.get(value)
+        if code is None:
+            return self.rows[:0]
+        return self.rows[self.offsets[code]:self.offsets[code + 1]]
+
+    def labels(self):
+        """Semua nilai yang punya minimal satu baris, terurut alfabetis"""
+        counts = np.diff(self.offsets)
+        return list(self.categories[counts > 0])
+
+    def state(self):
+        """Isi indeks untuk perbandingan"""
+        return {'categories': self.categories.to_numpy(dtype=object), 'offsets': self.offsets,
+                'rows': self.rows}
+
+    def patched(self, series, patch):
+        """Indeks baru untuk kolom categorical versi baru (kategori boleh bertambah)"""
+        codes = series.cat.codes.to_numpy()
+        new_rows = np.sort(patch.inserted[codes[patch.inserted] >= 0])
+        new_codes = codes[new_rows].astype(np.int64)
+        order = np.argsort(new_codes, kind='stable')
+        index = CategoryIndex.__new__(CategoryIndex)
+        index.categories = series.cat.categories
+        index.codes = {value: code for code, value in enumerate(index.categories)}
+        index.offsets, index.rows = patch_postings(self.offsets, self.rows, patch,
+                                                   index.categories.get_indexer(self.categories),
+                                                   new_codes[order], new_rows[order], len(index.categories))
+        return index
+
+class ClubHierarchy:
+    """Hierarki liga -> klub (terurut) -> baris, dibangun sekali"""
+
+    def __init__(self, leagues, clubs, indexes=None):
+        if indexes is None:
+            indexes = CategoryIndex(leagues), CategoryIndex(clubs)
+        self.leagues, self.clubs = indexes
+        league_codes = leagues.cat.codes.to_numpy().astype(np.int64)
+        club_codes = clubs.cat.codes.to_numpy().astype(np.int64)
+        valid = (league_codes >= 0) & (club_codes >= 0)
+        # Pasangan (liga, klub) unik; urutan kode = urutan alfabetis
+        pairs = np.unique(league_codes[valid] * len(self.clubs.categories) + club_codes[valid])
+        pair_leagues, pair_clubs = np.divmod(pairs, len(self.clubs.categories))
+        self._clubs_by_league = {}
+        for code, league in enumerate(self.leagues.categories):
+            start, end = np.searchsorted(pair_leagues, [code, code + 1])
+            self._clubs_by_league[league] = list(self.clubs.categories[pair_clubs[start:end]])
+
+    def patched(self, leagues, clubs, patch):
+        """Hierarki untuk kolom liga/klub versi baru; indeks baris diperbarui, bukan dibangun ulang"""
+        return ClubHierarchy(leagues, clubs, (self.leagues.patched(leagues, patch),
+                                              self.clubs.patched(clubs, patch)))
+
+    def state(self):
+        """Isi hierarki untuk perbandingan"""
+        state = {f'leagues.{key}': value for key, value in self.leagues.state().items()}
+        state.update({f'clubs.{key}': value for key, value in self.clubs.state().items()})
+        state['clubs_by_league'] = self._clubs_by_league
+        return state
+
+    def league_names(self):
+        """Daftar liga terurut"""
+        return self.leagues.labels()
+
+    def clubs_in(self, league):
+        """Daftar klub terurut pada satu liga"""
+        return self._clubs_by_league.get(league, [])
+
+    def club_rows(self, club):
+        """Posisi baris pemain pada satu klub"""
+        return self.clubs.rows_for(club)
+
+def top_k(values, k):
+    """Posisi k nilai terbesar dengan seleksi parsial O(n + k log k).
+
+    Urutan: nilai menurun, lalu posisi menaik untuk nilai yang sama, sehingga
+    hasil top(k) selalu merupakan awalan dari top(k + m) (aman untuk paging).
+    """
+    if k <= 0 or len(values) == 0:
+        return np.empty(0, dtype=np.int64)
+    # NaN dianggap paling kecil, sama seperti sort_values(na_position='last')
+    keys = np.nan_to_num(np.asarray(values, dtype=np.float64), nan=-np.inf)
+    if k < len(keys):
+        kth = -np.partition(-keys, k - 1)[k - 1]
+        above = np.flatnonzero(keys > kth)
+        ties = np.flatnonzero(keys == kth)[:k - len(above)]
+        candidates = np.concatenate((above, ties))
+    else:
+        candidates = np.arange(len(keys))
+    return candidates[np.lexsort((candidates, -keys[candidates]))]
+
+class RangeIndex:
+    """Permutasi baris terurut menaik untuk satu kolom numerik.
+
+    Query range diselesaikan dengan searchsorted (O(log n)) dan menghasilkan
+    potongan permutasi; nilai NaN tidak ikut diindeks.
+    """
+
+    def __init__(self, series):
+        values = series.to_numpy()
+        # Urut menaik; nilai sama diurutkan posisi menurun, sehingga pemindaian
+        # dari belakang memberi urutan (nilai menurun, posisi menaik) seperti top_k
+        order = len(values) - 1 - np.argsort(values[::-1], kind='stable')
+        if np.issubdtype(values.dtype, np.floating):
+            order = order[~np.isnan(values[order])]
+        self.values = values
+        self.order = order.astype(np.int32)
+        self.sorted_values = values[self.order]
+
+    def __len__(self):
+        return len(self.order)
+
+    def state(self):
+        """Isi indeks untuk perbandingan"""
+        return {'order': self.order, 'sorted_values': self.sorted_values}
+
+    def min(self):
+        return self.sorted_values[0] if len(self.order) else None
+
+    def max(self):
+        return self.sorted_values[-1] if len(self.order) else None
+
+    def bounds(self, low, high):
+        """Posisi awal/akhir pada permutasi untuk low <= nilai <= high"""
+        start = np.searchsorted(self.sorted_values, low, side='left')
+        end = np.searchsorted(self.sorted_values, high, side='right')
+        return start, max(start, end)
+
+    def count(self, low, high):
+        """Jumlah baris dalam range tanpa membuat array baris"""
+        start, end = self.bounds(low, high)
+        return end - start
+
+    def lookup(self, values):
+        """Posisi baris untuk setiap nilai (kolom bernilai unik, misal sofifa_id); -1 jika tidak ada"""
+        values = np.asarray(values)
+        if not len(self.order):
+            return np.full(len(values), -1, dtype=np.int64)
+        at = np.minimum(np.searchsorted(self.sorted_values, values), len(self.order) - 1)
+        return np.where(self.sorted_values[at] == values, self.order[at], -1).astype(np.int64)
+
+    def patched(self, series, patch):
+        """Permutasi baru: baris lama disaring dan digeser, baris baru disisipkan pada urutannya"""
+        values = series.to_numpy()
+        keep = ~patch.stale[self.order]
+        order = self.order[keep]
+        if patch.structural:
+            order = patch.remap[order]
+        sorted_values = self.sorted_values[keep].astype(values.dtype, copy=False)
+        new_rows = patch.inserted
+        new_values = values[new_rows]
+        if np.issubdtype(new_values.dtype, np.floating):
+            present = ~np.isnan(new_values)
+            new_rows, new_values = new_rows[present], new_values[present]
+        # Urutan menaik menurut nilai, lalu posisi menurun untuk nilai yang sama
+        sort = np.lexsort((-new_rows, new_values))
+        new_rows, new_values = new_rows[sort], new_values[sort]
+        at = block_positions(order, np.searchsorted(sorted_values, new_values, side='left'),
+                             np.searchsorted(sorted_values, new_values, side='right'), new_rows,
+                             descending=True)
+        index = RangeIndex.__new__(RangeIndex)
+        index.values = values
+        index.order = np.insert(order, at, new_rows).astype(np.int32, copy=False)
+        index.sorted_values = np.insert(sorted_values, at, new_values)
+        return index
+
+    def range_rows(self, low, high):
+        """Posisi baris dengan low <= nilai <= high, terurut menaik menurut nilai"""
+        start, end = self.bounds(low, high)
+        return self.order[start:end]
+
+    def top_rows(self, k, low=None, high=None, accept=None):
+        """k baris dengan nilai terbesar, opsional dibatasi range dan predikat.
+
+        `accept` menerima array posisi baris dan mengembalikan mask boolean.
+        Permutasi dipindai dari nilai terbesar per blok, sehingga biayanya
+        sebanding dengan k / selektivitas predikat, bukan dengan n.
+        """
+        start, end = self.bounds(-np.inf if low is None else low,
+                                 np.inf if high is None else high)
+        if accept is None:
+            return self.order[max(start, end - k):end][::-1]
+        found = []
+        total = 0
+        block = max(k * 4, 64)
+        while end > start and total < k:
+            chunk = self.order[max(start, end - block):end][::-1]
+            chunk = chunk[accept(chunk)]
+            found.append(chunk[:k - total])
+            total += len(found[-1])
+            end -= block
+            block *= 2
+        return np.concatenate(found) if found else self.order[:0]
+
+class LazyIndexMap(Mapping):
+    """Indeks per kolom (kolom -> indeks) yang dibangun saat pertama diakses"""
+
+    def __init__(self, keys, build, lock, built=None, rows=None):
+        self._keys = list(keys)
+        self._rows = rows
+        self._build = build
+        self._lock = lock
+        self.built = dict(built or {})
+
+    def __getitem__(self, key):
+        index = self.built.get(key)
+        if index is None:
+            if key not in self._keys:
+                raise KeyError(key)
+            with self._lock:
+                if key not in self.built:
+                    with profile.stage(f'index {key}', self._rows):
+                        self.built[key] = self._build(key)
+                index = self.built[key]
+        return index
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+class PlayerIndexes:
+    """Kumpulan indeks untuk satu DataFrame pemain.
+
+    Dengan lazy=True setiap indeks baru dibangun saat pertama dipakai (atau
+    lewat warm(), misal di thread latar), sehingga query sekali jalan tidak
+    menunggu indeks yang tidak disentuhnya, terutama indeks nama.
+    """
+
+    # Urutan warm(): indeks murah dulu, indeks nama (paling mahal) terakhir
+    PARTS = ('hierarchy', 'nations', 'ids', 'names')
+
+    def __init__(self, df, lazy=False, built=None, built_ranges=None):
+        self._df = df
+        self._lock = threading.RLock()
+        self._built = dict(built or {})
+        self.ranges = LazyIndexMap([col for col in RANGE_COLUMNS if col in df.columns],
+                                   lambda col: RangeIndex(df[col]), self._lock, built_ranges, len(df))
+        if not lazy:
+            self.warm()
+
+    def _part(self, name):
+        if name not in self._built:
+            with self._lock:
+                if name not in self._built:
+                    with profile.stage(f'index {name}', len(self._df)):
+                        self._built[name] = self._build(name)
+        return self._built[name]
+
+    def _build(self, name):
+        df = self._df
+        if name == 'names':
+            return NameIndex.from_frame(df)
+        if name == 'hierarchy':
+            return ClubHierarchy(df['league_name'], df['club_name'])
+        if name == 'nations':
+            return CategoryIndex(df['nationality_name'])
+        # Lookup sofifa_id -> posisi baris (pemain mirip, update delta)
+        return RangeIndex(df['sofifa_id']) if 'sofifa_id' in df.columns else None
+
+    names = property(lambda self: self._part('names'))
+    hierarchy = property(lambda self: self._part('hierarchy'))
+    nations = property(lambda self: self._part('nations'))
+    ids = property(lambda self: self._part('ids'))
+
+    def warm(self):
+        """Membangun semua indeks yang belum ada"""
+        for name in self.PARTS[:-1]:
+            self._part(name)
+        for col in self.ranges:
+            self.ranges[col]
+        self._part('names')
+
+    def patched(self, df, patch, columns):
+        """Indeks untuk DataFrame versi baru (lihat RowPatch).
+
+        `columns` adalah kolom yang nilainya berubah; indeks kolom lain
+        dipakai ulang apa adanya jika posisi baris tidak bergeser. Indeks
+        yang belum pernah dibangun tetap lazy untuk DataFrame baru.
+        """
+        def stale(*names):
+            return patch.structural or any(name in columns for name in names)
+
+        stale_columns = {'names': ('normalized_name', 'normalized_short_name'),
+                         'hierarchy': ('league_name', 'club_name'),
+                         'nations': ('nationality_name',), 'ids': ('sofifa_id',)}
+        built = {}
+        for name, index in self._built.items():
+            if index is None or not stale(*stale_columns[name]):
+                built[name] = index
+            elif name == 'names':
+                built[name] = index.patched(df, patch)
+            elif name == 'hierarchy':
+                built[name] = index.patched(df['league_name'], df['club_name'], patch)
+            elif name == 'nations':
+                built[name] = index.patched(df['nationality_name'], patch)
+            else:
+                built[name] = index.patched(df['sofifa_id'], patch)
+        ranges = {col: index.patched(df[col], patch) if stale(col) else index
+                  for col, index in self.ranges.built.items()}
+        return PlayerIndexes(df, lazy=True, built=built, built_ranges=ranges)
+
+    def differences(self, other):
+        """Nama indeks yang sudah dibangun di sini tetapi isinya berbeda dari `other`.
+
+        Dipakai untuk memeriksa indeks hasil patched() terhadap indeks yang
+        dibangun ulang dari DataFrame yang sama; `other` dibangun bila perlu.
+        """
+        found = [name for name in self.PARTS
+                 if name in self._built and not same_state(self._built[name], other._part(name))]
+        found += [f'ranges[{col}]' for col, index in self.ranges.built.items()
+                  if not same_state(index, other.ranges[col])]
+        return found
+
+def build_indexes(df, lazy=False):
+    """Membangun indeks pencarian untuk DataFrame hasil load_data (lazy: saat dipakai)"""
+    return PlayerIndexes(df, lazy=lazy)
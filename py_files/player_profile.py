@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""Instrumentasi waktu per tahap: load, normalisasi, filter, top-k, render.
+
+Nonaktif secara default. Saat nonaktif `stage()` dan `query()` hanya
+mengembalikan satu objek no-op yang sama, jadi instrumentasi tetap terpasang
+di kode tanpa biaya berarti. Saat aktif, setiap tahap mencatat waktu, jumlah
+baris masuk/keluar, dan memori yang dialokasikan (tracemalloc), lalu
+ringkasan per query dicetak.
+
+Cara mengaktifkan:
+    python search_players.py --profile [--profile-output trace.json]
+    FOOTBALL_PROFILE=1 python batch_search.py ...       (atau =hasil.prof)
+    player_profile.enable(hook=simpan_laporan)          (terprogram)
+
+Output `.json` ditulis sebagai trace event (buka di chrome://tracing atau
+Perfetto); output `.prof`/`.pstats` berisi dump cProfile untuk pstats.
+
+Tahap yang sedang berjalan dicatat per thread, jadi request yang diproses
+bersamaan (search_server.py --workers 0) menghasilkan laporan terpisah.
+Angka memori berasal dari tracemalloc yang berlaku untuk seluruh proses,
+sehingga pada thread yang berjalan bersamaan angkanya hanya perkiraan.
+"""
+import atexit
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+ENV_VAR = 'FOOTBALL_PROFILE'
+CPROFILE_EXTENSIONS = ('.prof', '.pstats')
+
+class NullStage:
+    """Tahap no-op saat profiling nonaktif (falsy, atribut diabaikan)"""
+
+    def __bool__(self):
+        return False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+NULL_STAGE = NullStage()
+
+class Stage:
+    """Satu tahap yang diukur; `rows_out` boleh diisi di dalam blok with"""
+
+    def __init__(self, profiler, name, rows_in=None):
+        self.profiler = profiler
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.path = (name,)
+        self.thread = 0
+        self.seconds = 0.0
+        self.allocated = None
+        self.peak = None
+        self._child_peak = 0
+
+    def __enter__(self):
+        self.profiler._enter(self)
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._exit(self)
+        return False
+
+    @property
+    def depth(self):
+        return len(self.path) - 1
+
+    def as_event(self, label):
+        """Event trace (format Chrome trace, waktu dalam mikrodetik)"""
+        return {
+            'name': self.name, 'cat': label, 'ph': 'X', 'pid': os.getpid(), 'tid': self.thread,
+            'ts': round((self.start - self.profiler.origin) * 1e6), 'dur': round(self.seconds * 1e6),
+            'args': {'rows_in': self.rows_in, 'rows_out': self.rows_out,
+                     'allocated': self.allocated, 'peak': self.peak},
+        }
+
+def add_optional(a, b):
+    return b if a is None else a if b is None else a + b
+
+def summarize_stages(stages):
+    """Menggabungkan tahap dengan jalur yang sama (misal filter per batch) menjadi satu baris"""
+    merged = {}
+    for stage in stages:
+        item = merged.get(stage.path)
+        if item is None:
+            merged[stage.path] = {
+                'stage': stage.name, 'depth': stage.depth, 'calls': 1,
+                'rows_in': stage.rows_in, 'rows_out': stage.rows_out,
+                'seconds': stage.seconds, 'allocated': stage.allocated, 'peak': stage.peak,
+            }
+            continue
+        item['calls'] += 1
+        item['seconds'] += stage.seconds
+        for key in ('rows_in', 'rows_out', 'allocated'):
+            item[key] = add_optional(item[key], getattr(stage, key))
+        if stage.peak is not None:
+            item['peak'] = max(item['peak'], stage.peak)
+    summary = []
+    for item in merged.values():
+        seconds, allocated, peak = item.pop('seconds'), item.pop('allocated'), item.pop('peak')
+        item['ms'] = round(seconds * 1000, 3)
+        item['allocated_kb'] = None if allocated is None else round(allocated / 1024, 1)
+        item['peak_kb'] = None if peak is None else round(peak / 1024, 1)
+        summary.append(item)
+    return summary
+
+class QueryScope:
+    """Mengelompokkan tahap-tahap satu query menjadi satu laporan"""
+
+    def __init__(self, profiler, label):
+        self.profiler = profiler
+        self.label = label
+
+    def __enter__(self):
+        self.profiler._state().queries.append(self.label)
+        return self
+
+    def __exit__(self, *exc):
+        state = self.profiler._state()
+        state.queries.pop()
+        if not state.queries:
+            self.profiler._flush(self.label)
+        return False
+
+class Profiler:
+    """Pencatat tahap aktif; dibuat lewat enable()"""
+
+    def __init__(self, memory=True, report=True, output=None, hooks=()):
+        self.memory = memory
+        self.report = report
+        self.output = output
+        self.hooks = list(hooks)
+        self.origin = time.perf_counter()
+        self.reports = []
+        # Stack tahap per thread; laporan dan event digabung di bawah lock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._events = []
+        self._cprofile = None
+        self._started_tracemalloc = False
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if output and output.lower().endswith(CPROFILE_EXTENSIONS):
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stage(self, name, rows_in=None):
+        return Stage(self, name, rows_in)
+
+    def query(self, label):
+        return QueryScope(self, label)
+
+    def _state(self):
+        """Stack tahap, tahap selesai, dan query aktif milik thread pemanggil"""
+        state = self._local
+        if not hasattr(state, 'stack'):
+            state.stack, state.stages, state.queries = [], [], []
+        return state
+
+    def _enter(self, stage):
+        state = self._state()
+        if state.stack:
+            stage.path = state.stack[-1].path + stage.path
+        stage.thread = threading.get_native_id()
+        state.stack.append(stage)
+        state.stages.append(stage)
+        if self.memory:
+            # Puncak direset per tahap; puncak anak diteruskan ke induknya
+            stage._memory_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        stage.start = time.perf_counter()
+
+    def _exit(self, stage):
+        stage.seconds = time.perf_counter() - stage.start
+        state = self._state()
+        state.stack.pop()
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            stage.allocated = current - stage._memory_start
+            stage.peak = max(peak, stage._child_peak) - stage._memory_start
+            if state.stack:
+                parent = state.stack[-1]
+                parent._child_peak = max(parent._child_peak, stage._memory_start + stage.peak)
+        if not state.stack and not state.queries:
+            self._flush(stage.name)
+
+    def _flush(self, label):
+        """Menyelesaikan satu laporan: cetak, panggil hook, simpan event trace"""
+        state = self._state()
+        if not state.stages:
+            return
+        raw, state.stages = state.stages, []
+        stages = summarize_stages(raw)
+        report = {'label': label, 'stages': stages,
+                  'ms': round(sum(s['ms'] for s in stages if s['depth'] == 0), 3)}
+        with self._lock:
+            self.reports.append(report)
+            if self.report:
+                print_report(report)
+            for hook in self.hooks:
+                hook(report)
+            if self.output and not self._cprofile:
+                self._events.extend(stage.as_event(label) for stage in raw)
+
+    def close(self):
+        """Menghentikan profiling dan menulis output (trace JSON atau dump cProfile)"""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.output)
+            print(f'[INFO] Dump cProfile disimpan ke {self.output} (buka dengan pstats)', file=sys.stderr)
+            self._cprofile = None
+        elif self.output:
+            with self._lock, open(self.output, 'w', encoding='utf-8') as f:
+                json.dump({'traceEvents': self._events, 'reports': self.reports}, f)
+            print(f'[INFO] Trace profiling disimpan ke {self.output}', file=sys.stderr)
+            self.output = None
+
+def format_number(value, digits=0):
+    return '-' if value is None else f'{value:,.{digits}f}'
+
+def print_report(report):
+    """Mencetak rincian tahap satu query"""
+    lines = [f'[PROFILE] {report["label"]}: {report["ms"]:.2f} ms',
+             f'    {"tahap":<28} {"panggil":>7} {"baris masuk":>12} {"baris keluar":>12} '
+             f'{"waktu ms":>10} {"alokasi KB":>11} {"puncak KB":>10}']
+    for s in report['stages']:
+        name = ('  ' * s['depth'] + s['stage'])[:28]
+        lines.append(f'    {name:<28} {s["calls"]:>7} {format_number(s["rows_in"]):>12} '
+                     f'{format_number(s["rows_out"]):>12} {s["ms"]:>10.2f} '
+                     f'{format_number(s["allocated_kb"], 1):>11} {format_number(s["peak_kb"], 1):>10}')
+    print('\n'.join(lines), file=sys.stderr)
+
+_PROFILER = None
+
+def enable(memory=True, report=True, output=None, hook=None):
+    """Mengaktifkan profiling (menggantikan profiler aktif); mengembalikan Profiler.
+
+    memory: catat alokasi dengan tracemalloc (lebih akurat, tetapi lebih lambat)
+    report: cetak rincian setiap query ke stderr
+    output: path .json (trace event) atau .prof/.pstats (cProfile), ditulis saat disable()
+    hook:   fungsi yang dipanggil dengan dict laporan setiap query selesai
+    """
+    global _PROFILER
+    disable()
+    _PROFILER = Profiler(memory=memory, report=report, output=output,
+                         hooks=[hook] if hook else [])
+    return _PROFILER
+
+def disable():
+    """Menonaktifkan profiling dan menulis output jika ada"""
+    global _PROFILER
+    if _PROFILER is not None:
+        profiler, _PROFILER = _PROFILER, None
+        profiler.close()
+
+def active():
+    """Profiler yang sedang aktif, atau None"""
+    return _PROFILER
+
+def add_hook(hook):
+    """Menambahkan hook laporan ke profiler aktif"""
+    if _PROFILER is None:
+        raise RuntimeError('Profiling belum aktif; panggil enable() dulu')
+    _PROFILER.hooks.append(hook)
+
+def stage(name, rows_in=None):
+    """Context manager untuk satu tahap (no-op jika profiling nonaktif)"""
+    if _PROFILER is None:
+        return NULL_STAGE
+    return _PROFILER.stage(name, rows_in)
+
+def query(label):
+    """Context manager yang mengelompokkan tahap satu query (no-op jika nonaktif)"""
+    if _PROFILER is None:
+        return NULL_STAGE
+    return _PROFILER.query(label)
+
+def enable_from_env():
+    """Aktif jika FOOTBALL_PROFILE diset: '1'/'true' atau path output"""
+    value = os.environ.get(ENV_VAR, '').strip()
+    if not value or value.lower() in ('0', 'false', 'no'):
+        return None
+    output = None if value.lower() in ('1', 'true', 'yes') else value
+    return enable(output=output)
+
+atexit.register(disable)
+enable_from_env()
@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+"""API query terprogram untuk data pemain.
+
+Contoh:
+    dataset = load_dataset()
+    top = (dataset.query().name('silva').league('Spain Primera Division')
+           .age(18, 21).positions_any('CB', 'LB').top(20, by='potential'))
+    df = top.results()
+
+Predikat hanya dikumpulkan; evaluasi baru dilakukan saat hasil diminta.
+Predikat dengan indeks paling selektif dipakai sebagai kandidat awal, lalu
+predikat lain dicek sekaligus pada array kandidat (tanpa DataFrame antara).
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+import player_profile as profile
+from player_cache import ResultCache
+from player_index import POSITION_MODES, build_indexes, position_filter, top_k
+from player_store import (DEFAULT_CSV_PATH, DISPLAY_COLUMNS, add_derived_columns, fold_text,
+                          read_players)
+
+class PlayerDataset:
+    """DataFrame pemain beserta indeksnya, dimuat sekali dan dipakai bersama"""
+
+    def __init__(self, df, indexes=None, from_snapshot=False):
+        self.df = df
+        self.indexes = indexes if indexes is not None else build_indexes(df)
+        self.from_snapshot = from_snapshot
+        self.cache = ResultCache()
+        self._arrays = {}
+
+    def __len__(self):
+        return len(self.df)
+
+    def query(self):
+        """Query baru tanpa predikat atas dataset ini"""
+        return PlayerQuery(self)
+
+    def column(self, name):
+        """Kolom sebagai array NumPy, di-cache agar query tidak melewati pandas"""
+        if name not in self._arrays:
+            self._arrays[name] = self.df[name].to_numpy()
+        return self._arrays[name]
+
+    def codes(self, name):
+        """Kode integer kolom categorical (di-cache)"""
+        key = ('codes', name)
+        if key not in self._arrays:
+            self._arrays[key] = self.df[name].cat.codes.to_numpy()
+        return self._arrays[key]
+
+    def cached(self, key, build):
+        """Struktur turunan (misal indeks kemiripan) yang dibangun sekali per dataset"""
+        key = ('cached', key)
+        if key not in self._arrays:
+            self._arrays[key] = build(self)
+        return self._arrays[key]
+
+    def labels(self, name):
+        """Peta nilai categorical -> bentuk tampilan ASCII untuk menu (di-cache)"""
+        key = ('labels', name)
+        if key not in self._arrays:
+            codes, first = np.unique(self.codes(name), return_index=True)
+            display = self.column(DISPLAY_COLUMNS[name])[first]
+            categories = self.df[name].cat.categories
+            self._arrays[key] = {categories[code]: label
+                                 for code, label in zip(codes, display) if code >= 0}
+        return self._arrays[key]
+
+def load_dataset(csv_path=DEFAULT_CSV_PATH, use_snapshot=True, lazy_indexes=False):
+    """Memuat data, membuat kolom turunan, dan membangun indeks.
+
+    Dengan lazy_indexes=True indeks baru dibangun saat pertama dipakai.
+    """
+    with profile.stage('load') as stage:
+        df, from_snapshot = read_players(csv_path, use_snapshot=use_snapshot)
+        add_derived_columns(df)
+        if lazy_indexes:
+            indexes = build_indexes(df, lazy=True)
+        else:
+            with profile.stage('build indexes', len(df)):
+                indexes = build_indexes(df)
+        stage.rows_out = len(df)
+    return PlayerDataset(df, indexes, from_snapshot=from_snapshot)
+
+# Setiap predikat punya: key (bentuk kanonik), rows() (baris dari indeks),
+# estimate() (perkiraan jumlah baris; persis jika exact), dan check() (mask
+# boolean untuk array kandidat).
+
+class NamePredicate:
+    """Nama (lengkap atau pendek) mengandung teks, lewat indeks trigram"""
+
+    exact = True
+
+    def __init__(self, text):
+        self.text = fold_text(text)
+        self.key = ('name', self.text)
+        self._rows = None
+
+    def rows(self, dataset):
+        if self._rows is None:
+            self._rows = dataset.indexes.names.search(self.text)
+        return self._rows
+
+    def estimate(self, dataset):
+        return len(self.rows(dataset))
+
+    def check(self, dataset, candidates):
+        return np.isin(candidates, self.rows(dataset), assume_unique=True)
+
+class CategoryPredicate:
+    """Kolom categorical sama persis dengan satu nilai (klub, liga, negara)"""
+
+    exact = True
+
+    def __init__(self, column, value):
+        self.column = column
+        self.value = value
+        self.key = (column, value)
+
+    def _index(self, dataset):
+        indexes = dataset.indexes
+        if self.column == 'club_name':
+            return indexes.hierarchy.clubs
+        if self.column == 'league_name':
+            return indexes.hierarchy.leagues
+        return indexes.nations
+
+    def rows(self, dataset):
+        return self._index(dataset).rows_for(self.value)
+
+    def estimate(self, dataset):
+        return len(self.rows(dataset))
+
+    def check(self, dataset, candidates):
+        code = self._index(dataset).codes.get(self.value, -2)
+        return dataset.codes(self.column)[candidates] == code
+
+class RangePredicate:
+    """low <= kolom <= high, lewat indeks range"""
+
+    exact = True
+
+    def __init__(self, column, low, high):
+        self.column = column
+        self.low = low
+        self.high = high
+        self.key = (column, low, high)
+
+    def rows(self, dataset):
+        # Indeks range terurut menurut nilai; kandidat harus terurut posisi
+        return np.sort(dataset.indexes.ranges[self.column].range_rows(self.low, self.high))
+
+    def estimate(self, dataset):
+        return dataset.indexes.ranges[self.column].count(self.low, self.high)
+
+    def check(self, dataset, candidates):
+        values = dataset.indexes.ranges[self.column].values[candidates]
+        return (values >= self.low) & (values <= self.high)
+
+class PositionPredicate:
+    """Query posisi dengan bitmask (mode any/all/primary); tanpa indeks"""
+
+    exact = False
+
+    def __init__(self, positions, mode):
+        self.positions = tuple(sorted(set(positions)))
+        self.mode = mode
+        self.key = ('positions', self.mode, self.positions)
+
+    def rows(self, dataset):
+        return np.flatnonzero(self.check(dataset, slice(None)))
+
+    def estimate(self, dataset):
+        # Tidak ada indeks: dianggap tidak selektif agar dievaluasi terakhir
+        return len(dataset)
+
+    def check(self, dataset, candidates):
+        return position_filter(dataset.column('position_mask')[candidates],
+                               dataset.column('primary_position_mask')[candidates],
+                               self.positions, self.mode)
+
+class RowsPredicate:
+    """Baris dibatasi pada sekumpulan posisi (misal hasil pencarian fuzzy)"""
+
+    exact = True
+
+    def __init__(self, row_ids):
+        self.row_ids = np.unique(np.asarray(row_ids, dtype=np.int64))
+        self.key = ('rows', len(self.row_ids), hashlib.sha1(self.row_ids.tobytes()).hexdigest())
+
+    def rows(self, dataset):
+        return self.row_ids
+
+    def estimate(self, dataset):
+        return len(self.row_ids)
+
+    def check(self, dataset, candidates):
+        return np.isin(candidates, self.row_ids, assume_unique=True)
+
+class PlayerQuery:
+    """Kumpulan predikat yang dievaluasi secara lazy.
+
+    Setiap method filter mengembalikan query yang sama sehingga bisa dirangkai.
+    Gunakan `refine()` untuk membuat cabang query tanpa mengubah yang lama.
+    """
+
+    def __init__(self, dataset, predicates=None, order=None):
+        self.dataset = dataset
+        self.predicates = list(predicates or [])
+        self.order = order
+        self._matches = None
+
+    def refine(self):
+        """Salinan query (hanya daftar predikat, bukan data)"""
+        return PlayerQuery(self.dataset, self.predicates, self.order)
+
+    def _add(self, predicate):
+        self.predicates.append(predicate)
+        self._matches = None
+        return self
+
+    def name(self, text):
+        return self._add(NamePredicate(text))
+
+    def club(self, club):
+        return self._add(CategoryPredicate('club_name', club))
+
+    def league(self, league):
+        return self._add(CategoryPredicate('league_name', league))
+
+    def country(self, country):
+        return self._add(CategoryPredicate('nationality_name', country))
+
+    def between(self, column, low, high):
+        return self._add(RangePredicate(column, low, high))
+
+    def age(self, low, high):
+        return self.between('age', low, high)
+
+    def potential(self, low, high):
+        return self.between('potential', low, high)
+
+    def overall(self, low, high):
+        return self.between('overall', low, high)
+
+    def positions_any(self, *positions):
+        return self._add(PositionPredicate(positions, 'any'))
+
+    def positions_all(self, *positions):
+        return self._add(PositionPredicate(positions, 'all'))
+
+    def primary_position(self, *positions):
+        return self._add(PositionPredicate(positions, 'primary'))
+
+    def positions(self, positions, mode='any'):
+        return self._add(PositionPredicate(positions, mode))
+
+    def within(self, row_ids):
+        return self._add(RowsPredicate(row_ids))
+
+    def top(self, k, by='overall'):
+        """Batasi hasil ke k pemain dengan nilai `by` terbesar"""
+        self.order = (k, by)
+        return self
+
+    def _plan(self):
+        """Urutkan predikat dari yang paling selektif (estimasi terkecil)"""
+        return sorted(self.predicates, key=lambda p: p.estimate(self.dataset))
+
+    def _cache_key(self):
+        """Bentuk kanonik kumpulan predikat (tidak bergantung urutan filter)"""
+        return frozenset(predicate.key for predicate in self.predicates)
+
+    def _matching_rows(self):
+        """Semua posisi baris yang cocok, terurut menaik.
+
+        Hasil disimpan di cache dataset; jika ada entri cache dengan
+        sebagian predikat yang sama, hanya predikat sisanya yang dicek atas
+        baris entri tersebut.
+        """
+        if self._matches is None:
+            if not self.predicates:
+                self._matches = np.arange(len(self.dataset))
+                return self._matches
+            cache = self.dataset.cache
+            key = self._cache_key()
+            rows = cache.get(key)
+            if rows is None:
+                base_key, base_rows = cache.subset(key)
+                if base_key is None:
+                    rows = self._evaluate(self._plan())
+                else:
+                    remaining = [p for p in self.predicates if p.key not in base_key]
+                    with profile.stage('cache subset', len(base_rows)) as stage:
+                        rows = base_rows[self._checker(remaining)(base_rows)]
+                        stage.rows_out = len(rows)
+                rows = cache.put(key, rows)
+            self._matches = rows
+        return self._matches
+
+    def _evaluate(self, plan):
+        """Evaluasi penuh: kandidat dari predikat paling selektif, lalu cek sisanya"""
+        with profile.stage('filter ' + plan[0].key[0], len(self.dataset)) as stage:
+            candidates = plan[0].rows(self.dataset)
+            stage.rows_out = len(candidates)
+        if len(plan) > 1 and len(candidates):
+            candidates = candidates[self._checker(plan[1:])(candidates)]
+        return candidates
+
+    def _top_by_scan(self, k, by):
+        """Top-k dengan memindai indeks range kolom `by` dari nilai terbesar"""
+        low = high = None
+        checks = []
+        for predicate in self.predicates:
+            if isinstance(predicate, RangePredicate) and predicate.column == by and low is None:
+                low, high = predicate.low, predicate.high
+            else:
+                checks.append(predicate)
+        accept = self._checker(checks) if checks else None
+        return self.dataset.indexes.ranges[by].top_rows(k, low, high, accept)
+
+    def _checker(self, predicates):
+        """Fungsi mask gabungan (AND) untuk array kandidat"""
+        def accept(rows):
+            keep = np.ones(len(rows), dtype=bool)
+            for predicate in predicates:
+                with profile.stage('filter ' + predicate.key[0], len(rows)) as stage:
+                    keep &= predicate.check(self.dataset, rows)
+                    if stage:
+                        stage.rows_out = int(np.count_nonzero(keep))
+            return keep
+        return accept
+
+    def row_ids(self):
+        """Posisi baris hasil: terurut menurut `top` jika diset, jika tidak menaik"""
+        if self.order is None:
+            return self._matching_rows()
+        k, by = self.order
+        ranges = self.dataset.indexes.ranges
+        if self._matches is None and self.predicates:
+            # Hasil lengkap dari cache dipakai jika lebih murah daripada scan
+            # (aturan biaya yang sama dengan di bawah, dengan jumlah persis)
+            cached = self.dataset.cache.get(self._cache_key())
+            if cached is not None and (by not in ranges or len(cached) ** 2 <= k * len(self.dataset)):
+                self._matches = cached
+        if self._matches is None and by in ranges:
+            smallest = min((p.estimate(self.dataset) for p in self.predicates),
+                           default=len(self.dataset))
+            # Memindai dari atas sebanding k*n/m, evaluasi penuh sebanding m
+            if smallest * smallest > k * len(self.dataset):
+                with profile.stage(f'top {k} {by} (scan)', smallest) as stage:
+                    rows = self._top_by_scan(k, by)
+                    stage.rows_out = len(rows)
+                # Baris NaN tidak ada di indeks range; jika kurang dari k,
+                # hitung ulang penuh agar NaN tetap muncul paling bawah
+                if len(rows) == k or len(ranges[by]) == len(self.dataset):
+                    return rows
+        rows = self._matching_rows()
+        with profile.stage(f'top {k} {by}', len(rows)) as stage:
+            rows = rows[top_k(self.dataset.column(by)[rows], k)]
+            stage.rows_out = len(rows)
+        return rows
+
+    def page(self, offset, size, by='overall'):
+        """Posisi baris untuk satu halaman hasil terurut `by` menurun.
+
+        Urutan top_k deterministik, jadi halaman berikutnya tidak pernah
+        mengulang atau melewatkan pemain.
+        """
+        rows = self.refine().top(offset + size, by=by).row_ids()
+        return rows[offset:]
+
+    def count(self):
+        """Jumlah seluruh pemain yang cocok (mengabaikan batas `top`)"""
+        if self._matches is None and len(self.predicates) == 1 and self.predicates[0].exact:
+            predicate = self.predicates[0]
+            with profile.stage('count ' + predicate.key[0], len(self.dataset)) as stage:
+                total = stage.rows_out = predicate.estimate(self.dataset)
+            return total
+        return len(self._matching_rows())
+
+    def results(self, columns=None):
+        """Materialisasi hasil sebagai DataFrame (satu kali gather).
+
+        Jika `columns` diisi, hanya kolom tersebut yang diambil.
+        """
+        rows = self.row_ids()
+        if columns is None:
+            return self.dataset.df.iloc[rows]
+        index = self.dataset.df.index[rows]
+        return pd.DataFrame({col: self.dataset.column(col)[rows] for col in columns}, index=index)
+
+    def records(self, columns, rows=None):
+        """Hasil sebagai list dict berisi tipe Python (tanpa DataFrame), untuk ekspor"""
+        if rows is None:
+            rows = self.row_ids()
+        values = [self.dataset.column(col)[rows].tolist() for col in columns]
+        return [dict(zip(columns, row)) for row in zip(*values)]
+
+# Kriteria yang dikenali build_query (sama dengan menu pencarian)
+SPEC_RANGES = ('potential', 'age', 'overall')
+
+def build_query(dataset, spec):
+    """Membuat PlayerQuery dari spesifikasi dict (misal satu baris JSONL).
+
+    Kunci yang dikenali: name, club, league, country, potential/age/overall
+    ([min, max]), positions (list atau 'CB|LB'), position_mode, top, by.
+    """
+    query = dataset.query()
+    for key in ('name', 'club', 'league', 'country'):
+        if spec.get(key):
+            if not isinstance(spec[key], str):
+                raise ValueError(f'{key} harus berupa teks')
+            getattr(query, key)(spec[key])
+    for key in SPEC_RANGES:
+        bounds = spec.get(key)
+        if bounds is None:
+            continue
+        try:
+            if isinstance(bounds, (str, bytes)) or len(bounds) != 2:
+                raise TypeError
+            low, high = float(bounds[0]), float(bounds[1])
+        except (TypeError, ValueError):
+            raise ValueError(f'{key} harus berupa [min, max]')
+        query.between(key, low, high)
+    positions = spec.get('positions')
+    if positions:
+        if isinstance(positions, str):
+            positions = [p.strip() for p in positions.split('|') if p.strip()]
+        if not isinstance(positions, (list, tuple)) or not all(isinstance(p, str) for p in positions):
+            raise ValueError('positions harus berupa daftar kode posisi')
+        mode = spec.get('position_mode') or 'any'
+        if mode not in POSITION_MODES:
+            raise ValueError(f'position_mode tidak dikenal: {mode}')
+        query.positions(positions, mode)
+    if spec.get('top'):
+        query.top(int(spec['top']), by=spec.get('by') or 'overall')
+    return query
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""Rendering hasil pencarian: format halaman, cursor halaman, dan ekspor.
+
+Satu halaman diformat sekaligus dari array kolom (tanpa iterrows) lalu
+dicetak dengan satu print. Cursor menyimpan posisi baris yang sudah
+diurutkan, jadi pindah halaman tidak mengurutkan ulang. Ekspor menulis
+seluruh hasil per blok langsung dari array kolom ke CSV, JSONL, atau Excel
+tanpa DataFrame perantara.
+"""
+import csv
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PAGE_SIZE = 20
+SEPARATOR = '-' * 60
+
+# Kolom tampilan tabel: (kolom, judul, lebar maksimum)
+TABLE_COLUMNS = [
+    ('display_name', 'Nama', 28),
+    ('age', 'Usia', 4),
+    ('player_positions', 'Posisi', 12),
+    ('overall', 'OVR', 3),
+    ('potential', 'POT', 3),
+    ('display_club', 'Klub', 24),
+    ('display_country', 'Negara', 18),
+]
+
+# Kolom yang diekspor (teks asli UTF-8, bukan bentuk tampilan)
+EXPORT_COLUMNS = [
+    'sofifa_id', 'long_name', 'short_name', 'age', 'player_positions',
+    'overall', 'potential', 'value_eur', 'wage_eur',
+    'club_name', 'league_name', 'nationality_name',
+]
+EXPORT_BLOCK_ROWS = 10000
+# Batas baris satu sheet Excel (termasuk header)
+EXCEL_MAX_ROWS = 1048576
+
+def format_blocks(dataset, rows, suffixes=None):
+    """Blok detail pemain (gaya menu) untuk satu halaman, sebagai satu string.
+
+    `suffixes` (opsional) ditambahkan di belakang nama, misal skor kemiripan.
+    """
+    columns = [dataset.column(col)[rows].tolist() for col in
+               ('display_name', 'age', 'player_positions', 'overall', 'potential',
+                'display_club', 'display_country')]
+    if suffixes is None:
+        suffixes = [''] * len(rows)
+    blocks = [
+        f'\nNama: {name}{suffix}\nUsia: {age} tahun\nPosisi: {positions}\n'
+        f'Overall: {overall} | Potential: {potential}\nKlub: {club}\nNegara: {country}\n{SEPARATOR}'
+        for name, age, positions, overall, potential, club, country, suffix
+        in zip(*columns, suffixes)
+    ]
+    return '\n' + SEPARATOR + '\n' + '\n'.join(blocks)
+
+def format_table(dataset, rows, start=1, columns=TABLE_COLUMNS):
+    """Tabel satu halaman (kolom rata kiri, teks panjang dipotong), sebagai satu string"""
+    cells = [[str(i) for i in range(start, start + len(rows))]]
+    headers = ['#']
+    for col, title, width in columns:
+        values = dataset.column(col)[rows]
+        missing = pd.isna(values)
+        text = ['-' if miss else str(value) for value, miss in zip(values.tolist(), missing)]
+        cells.append([t if len(t) <= width else t[:width - 1] + '~' for t in text])
+        headers.append(title)
+    widths = [max([len(header)] + [len(t) for t in column]) for header, column in zip(headers, cells)]
+    line = '  '.join('{:<%d}' % w for w in widths)
+    lines = [line.format(*headers), '  '.join('-' * w for w in widths)]
+    lines.extend(line.format(*row) for row in zip(*cells))
+    return '\n'.join(line.rstrip() for line in lines)
+
+class ResultCursor:
+    """Cursor maju/mundur atas hasil terurut yang diperingkat bertahap.
+
+    `fetch(k)` mengembalikan posisi baris k pemain teratas (urutan prefix
+    yang stabil, seperti PlayerQuery.page). Prefix yang sudah diperingkat
+    disimpan dan baru diperpanjang (minimal dua kali lipat) saat halaman
+    yang diminta melewatinya, sehingga halaman awal hasil yang besar
+    sebanding dengan k, bukan dengan mengurutkan seluruh hasil.
+    """
+
+    def __init__(self, fetch, total, page_size=DEFAULT_PAGE_SIZE):
+        self.fetch = fetch
+        self.total = total
+        self.page_size = page_size
+        self.page = 0
+        self._ranked = np.empty(0, dtype=np.intp)
+
+    def __len__(self):
+        return self.total
+
+    @property
+    def pages(self):
+        return max(1, -(-self.total // self.page_size))
+
+    @property
+    def start(self):
+        """Posisi (0-based) baris pertama halaman saat ini"""
+        return self.page * self.page_size
+
+    @property
+    def rows(self):
+        """Seluruh hasil terurut (misal untuk ekspor)"""
+        return self._prefix(self.total)
+
+    def _prefix(self, k):
+        k = min(k, self.total)
+        if len(self._ranked) < k:
+            self._ranked = self.fetch(min(self.total, max(k, 2 * len(self._ranked))))
+        return self._ranked[:k]
+
+    def current(self):
+        """Posisi baris pada halaman saat ini"""
+        return self._prefix(self.start + self.page_size)[self.start:]
+
+    def has_next(self):
+        return self.page + 1 < self.pages
+
+    def has_prev(self):
+        return self.page > 0
+
+    def next(self):
+        if self.has_next():
+            self.page += 1
+        return self.current()
+
+    def prev(self):
+        if self.has_prev():
+            self.page -= 1
+        return self.current()
+
+def export_values(values):
+    """Array kolom -> list Python untuk ekspor; NaN menjadi None, float bulat menjadi int"""
+    missing = pd.isna(values)
+    if values.dtype.kind == 'f' and (values[~missing] % 1 == 0).all():
+        values = np.where(missing, 0, values).astype(np.int64)
+    out = values.tolist()
+    for i in np.flatnonzero(missing):
+        out[i] = None
+    return out
+
+def iter_blocks(dataset, rows, columns):
+    """Baris hasil per blok sebagai list tuple, diambil langsung dari array kolom"""
+    for start in range(0, len(rows), EXPORT_BLOCK_ROWS):
+        block = rows[start:start + EXPORT_BLOCK_ROWS]
+        yield list(zip(*(export_values(dataset.column(col)[block]) for col in columns)))
+
+def write_csv(path, columns, blocks):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for block in blocks:
+            writer.writerows(block)
+
+def write_jsonl(path, columns, blocks):
+    with open(path, 'w', encoding='utf-8') as f:
+        for block in blocks:
+            f.writelines(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n'
+                         for row in block)
+
+def write_xlsx(path, columns, blocks):
+    # openpyxl hanya dimuat jika benar-benar mengekspor ke Excel
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Pemain')
+    sheet.append(columns)
+    for block in blocks:
+        for row in block:
+            sheet.append(row)
+    workbook.save(path)
+
+EXPORTERS = {'.csv': write_csv, '.jsonl': write_jsonl, '.xlsx': write_xlsx}
+
+def export_rows(dataset, rows, path, columns=None):
+    """Menulis seluruh hasil ke CSV/JSONL/XLSX (menurut ekstensi); mengembalikan jumlah baris"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORTERS:
+        raise ValueError(f'Format ekspor tidak dikenal: {extension or path} (gunakan .csv, .jsonl, atau .xlsx)')
+    if extension == '.xlsx' and len(rows) >= EXCEL_MAX_ROWS:
+        raise ValueError(f'Excel maksimal {EXCEL_MAX_ROWS - 1} baris; gunakan .csv atau .jsonl')
+    columns = [col for col in (columns or EXPORT_COLUMNS) if col in dataset.df.columns]
+    EXPORTERS[extension](path, columns, iter_blocks(dataset, rows, columns))
+    return len(rows)
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""Pencarian pemain mirip (k-NN) atas vektor atribut skill.
+
+Atribut skill (pace, shooting, passing, dribbling, defending, physic)
+distandarkan per kolom (z-score) menjadi matriks float32. Kiper tidak
+punya atribut ini, jadi kiper punya ruang atribut sendiri (atribut
+goalkeeping_*, atau overall/potential/umur jika kolom itu tidak ada) dan
+hanya dibandingkan dengan kiper lain. Nilai kosong tidak diisi: jarak
+dihitung atas atribut yang ada di kedua pemain lalu diskalakan ke jumlah
+atribut. Jarak Euclidean dihitung per blok kandidat dengan perkalian
+matriks, lalu k terdekat dipilih dengan seleksi parsial, jadi satu query
+maupun ratusan query sekaligus sepenuhnya ter-vektorisasi. Urutan hasil
+deterministik: jarak menaik, lalu posisi baris menaik untuk jarak yang sama.
+
+Contoh (CLI, banyak pemain acuan sekaligus):
+    python player_similar.py 158023 20801 --k 10 --filter '{"age": [16, 23]}'
+    python player_similar.py --ids-file daftar_id.txt --k 5 -o mirip.csv
+
+Contoh (API):
+    index = similarity_index(dataset)
+    rows, distances = index.nearest(row, k=10, candidates=dataset.query().age(16, 23).row_ids())
+    rows, distances = index.nearest_many(many_rows, k=10)     # matriks (m, k)
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+
+import numpy as np
+
+SIMILARITY_COLUMNS = ['pace', 'shooting', 'passing', 'dribbling', 'defending', 'physic']
+# Atribut pembanding kiper (atribut skill di atas kosong untuk kiper)
+KEEPER_COLUMNS = ['goalkeeping_diving', 'goalkeeping_handling', 'goalkeeping_kicking',
+                  'goalkeeping_positioning', 'goalkeeping_reflexes']
+# Dipakai untuk kiper jika data tidak punya atribut kiper
+KEEPER_FALLBACK_COLUMNS = ['overall', 'potential', 'age']
+# Batas sel matriks jarak (query x kandidat) per blok: 1<<22 float32 = 16 MB
+BLOCK_CELLS = 1 << 22
+
+def select_k(distances, k):
+    """Mask tepat k kolom terkecil per baris (seri -> kolom paling kiri).
+
+    Kolom harus terurut menurut posisi baris agar seri dipecah secara
+    deterministik; dihitung dengan partisi, tanpa sort penuh.
+    """
+    if distances.shape[1] <= k:
+        return np.ones(distances.shape, dtype=bool)
+    kth = np.partition(distances, k - 1, axis=1)[:, k - 1:k]
+    below = distances < kth
+    ties = distances == kth
+    needed = k - below.sum(axis=1, keepdims=True)
+    if (ties.sum(axis=1, keepdims=True) <= needed).all():
+        return below | ties
+    return below | (ties & (np.cumsum(ties, axis=1) <= needed))
+
+def take_k(distances, rows, k):
+    """k kolom terkecil per baris dari (distances, rows), urutan kolom dipertahankan"""
+    keep = select_k(distances, k)
+    width = min(k, distances.shape[1])
+    return distances[keep].reshape(-1, width), rows[keep].reshape(-1, width)
+
+class FeatureSpace:
+    """Matriks atribut ternormalisasi satu kelompok pemain (n x d, float32).
+
+    `rows` adalah posisi baris dataset (menaik) untuk setiap baris matriks.
+    Jika ada nilai kosong, jarak dihitung atas atribut yang ada di kedua
+    pemain (diskalakan ke d atribut); tanpa atribut bersama jaraknya inf.
+    """
+
+    def __init__(self, values, rows, columns):
+        present = ~np.isnan(values)
+        usable = present.any(axis=0)
+        values, present = values[:, usable], present[:, usable]
+        self.rows = rows
+        self.columns = [col for col, keep in zip(columns, usable) if keep]
+        self.complete = bool(self.columns) and bool(present.all())
+        mean = np.nanmean(values, axis=0) if self.columns else np.zeros(0)
+        scale = np.nanstd(values, axis=0) if self.columns else np.ones(0)
+        scale = np.where(scale > 0, scale, 1.0)
+        self.matrix = np.where(present, (values - mean) / scale, 0).astype(np.float32)
+        self.norms = np.einsum('ij,ij->i', self.matrix, self.matrix)
+        if not self.complete:
+            self.mask = present.astype(np.float32)
+            self.squares = self.matrix * self.matrix
+
+    def __len__(self):
+        return len(self.rows)
+
+    def distances(self, queries, part):
+        """Jarak kuadrat antara baris `queries` dan blok kandidat `part` (posisi matriks)"""
+        cross = self.matrix[queries] @ self.matrix[part].T
+        if self.complete:
+            # |q - x|^2 = |q|^2 + |x|^2 - 2 q.x, dihitung untuk satu blok sekaligus
+            return self.norms[queries][:, None] + self.norms[part][None, :] - 2 * cross
+        # Nilai kosong bernilai 0 di matriks, jadi hanya atribut bersama yang terhitung
+        query_mask, part_mask = self.mask[queries], self.mask[part]
+        total = self.squares[queries] @ part_mask.T + query_mask @ self.squares[part].T - 2 * cross
+        common = query_mask @ part_mask.T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(common > 0, total * (len(self.columns) / common), np.inf).astype(np.float32)
+
+    def nearest_many(self, queries, k, candidates=None, exclude_self=True):
+        """k terdekat per baris query (semua dalam posisi matriks), tanpa padding"""
+        everyone = candidates is None
+        candidates = np.arange(len(self.matrix)) if everyone else candidates
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_dist = np.empty((len(queries), 0), dtype=np.float32)
+        block = max(k, BLOCK_CELLS // max(len(queries), 1))
+        for start in range(0, len(candidates), block):
+            chunk = candidates[start:start + block]
+            # Tanpa filter, blok cukup berupa slice (tanpa menyalin matriks)
+            dist = self.distances(queries, slice(start, start + block) if everyone else chunk)
+            if exclude_self:
+                at = np.minimum(np.searchsorted(chunk, queries), len(chunk) - 1)
+                hit = np.flatnonzero(chunk[at] == queries)
+                dist[hit, at[hit]] = np.inf
+            dist, chunk_rows = take_k(dist, np.broadcast_to(chunk, dist.shape), k)
+            # Hasil terbaik sebelumnya berasal dari blok dengan posisi lebih kecil,
+            # jadi kolom gabungan tetap terurut menurut posisi baris
+            best_dist, best_rows = take_k(np.concatenate((best_dist, dist), axis=1),
+                                          np.concatenate((best_rows, chunk_rows), axis=1), k)
+        return best_rows, best_dist
+
+class SimilarityIndex:
+    """Ruang atribut pemain lapangan dan kiper; pemain hanya dibandingkan dalam kelompoknya"""
+
+    def __init__(self, dataset, columns=SIMILARITY_COLUMNS, keeper_columns=KEEPER_COLUMNS):
+        available = dataset.df.columns
+        self.columns = [col for col in columns if col in available]
+        if not self.columns:
+            raise ValueError('Tidak ada kolom atribut untuk pencarian pemain mirip')
+        self.keeper_columns = ([col for col in keeper_columns if col in available]
+                               or [col for col in KEEPER_FALLBACK_COLUMNS if col in available])
+
+        def stack(cols, rows):
+            return np.column_stack([dataset.column(col)[rows].astype(np.float64) for col in cols])
+
+        skills = stack(self.columns, slice(None))
+        # Kiper: semua atribut skill lapangan kosong
+        keeper = np.isnan(skills).all(axis=1)
+        self.group = keeper.astype(np.int8)
+        outfield_rows, keeper_rows = np.flatnonzero(~keeper), np.flatnonzero(keeper)
+        self.spaces = [FeatureSpace(skills[outfield_rows], outfield_rows, self.columns),
+                       FeatureSpace(stack(self.keeper_columns, keeper_rows), keeper_rows,
+                                    self.keeper_columns)]
+
+    def __len__(self):
+        return len(self.group)
+
+    def nearest_many(self, rows, k=10, candidates=None, exclude_self=True):
+        """k pemain terdekat untuk setiap baris query.
+
+        candidates: posisi baris yang boleh muncul (misal hasil
+        PlayerQuery.row_ids(), urutan bebas); None = semua pemain. Kandidat
+        dari kelompok lain (kiper vs pemain lapangan) tidak pernah muncul.
+        Mengembalikan (rows, distances) berbentuk (m, k); jika kandidat
+        kurang dari k, sisa kolom berisi -1 dan inf.
+        """
+        if k < 1:
+            raise ValueError('k minimal 1')
+        rows = np.asarray(rows, dtype=np.int64)
+        if candidates is not None:
+            # Query dengan top() memberi baris urut nilai; exclude_self dan urutan
+            # seri butuh posisi menaik tanpa duplikat
+            candidates = np.unique(np.asarray(candidates, dtype=np.int64))
+        result_rows = np.full((len(rows), k), -1, dtype=np.int64)
+        result_dist = np.full((len(rows), k), np.inf, dtype=np.float32)
+        groups = self.group[rows]
+        for group, space in enumerate(self.spaces):
+            queries = np.flatnonzero(groups == group)
+            if not len(queries) or not len(space):
+                continue
+            # Posisi baris -> posisi di matriks kelompok (urutan tetap menaik)
+            local = np.searchsorted(space.rows, rows[queries])
+            pool = None
+            if candidates is not None:
+                pool = np.searchsorted(space.rows, candidates[self.group[candidates] == group])
+            best_rows, best_dist = space.nearest_many(local, k, pool, exclude_self)
+            order = np.lexsort((best_rows, best_dist), axis=1)
+            best_rows = np.take_along_axis(best_rows, order, axis=1)
+            best_dist = np.sqrt(np.maximum(np.take_along_axis(best_dist, order, axis=1), 0))
+            found = np.isfinite(best_dist)
+            width = best_rows.shape[1]
+            result_rows[queries, :width] = np.where(found, space.rows[best_rows], -1)
+            result_dist[queries, :width] = best_dist
+        return result_rows, result_dist
+
+    def nearest(self, row, k=10, candidates=None, exclude_self=True):
+        """k pemain terdekat untuk satu baris; mengembalikan (rows, distances)"""
+        rows, distances = self.nearest_many([row], k, candidates, exclude_self)
+        found = rows[0] >= 0
+        return rows[0][found], distances[0][found]
+
+def similarity_index(dataset):
+    """SimilarityIndex dataset (dibangun sekali, di-cache di dataset)"""
+    return dataset.cached('similarity', SimilarityIndex)
+
+def rows_for_ids(dataset, ids):
+    """Posisi baris untuk daftar sofifa_id (-1 jika tidak ditemukan)"""
+    return dataset.indexes.ids.lookup(np.asarray(ids, dtype=np.int64))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Mencari pemain mirip untuk banyak pemain acuan')
+    parser.add_argument('ids', nargs='*', type=int, help='sofifa_id pemain acuan')
+    parser.add_argument('--ids-file', help='File berisi satu sofifa_id per baris')
+    parser.add_argument('--csv', default=None, help='Lokasi dataset pemain')
+    parser.add_argument('--k', type=int, default=10, help='Jumlah pemain mirip per acuan')
+    parser.add_argument('--filter', help='Spesifikasi filter kandidat (JSON, format mode batch)')
+    parser.add_argument('--output', '-o', help='File CSV hasil (default: cetak ke layar)')
+    args = parser.parse_args(argv)
+    if args.k < 1:
+        parser.error('--k minimal 1')
+
+    # Diimpor di sini agar modul ini ringan saat hanya indeksnya yang dipakai
+    from player_query import build_query, load_dataset
+    from player_store import DEFAULT_CSV_PATH
+
+    ids = list(args.ids)
+    try:
+        if args.ids_file:
+            with open(args.ids_file, encoding='utf-8') as f:
+                ids += [int(line) for line in f if line.strip()]
+        spec = json.loads(args.filter) if args.filter else None
+    except (OSError, ValueError) as e:
+        print('[ERROR] Input tidak valid:', e)
+        return 1
+    if not ids:
+        print('[X] Masukkan minimal satu sofifa_id')
+        return 1
+    try:
+        dataset = load_dataset(args.csv or DEFAULT_CSV_PATH)
+    except FileNotFoundError:
+        print('[ERROR] File tidak ditemukan di', args.csv or DEFAULT_CSV_PATH)
+        return 1
+
+    rows = rows_for_ids(dataset, ids)
+    for player_id in np.asarray(ids)[rows < 0]:
+        print('[X] sofifa_id tidak ditemukan:', player_id)
+    ids = np.asarray(ids)[rows >= 0]
+    rows = rows[rows >= 0]
+    candidates = build_query(dataset, spec).row_ids() if spec else None
+
+    start = time.perf_counter()
+    found, distances = similarity_index(dataset).nearest_many(rows, args.k, candidates)
+    elapsed = time.perf_counter() - start
+
+    player_ids = dataset.column('sofifa_id')
+    names = dataset.column('short_name')
+    out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    try:
+        writer = csv.writer(out)
+        writer.writerow(['reference_id', 'reference_name', 'rank', 'sofifa_id', 'short_name', 'distance'])
+        for player_id, row, similar, dist in zip(ids.tolist(), rows, found, distances):
+            for rank, (other, d) in enumerate(zip(similar, dist), 1):
+                if other >= 0:
+                    writer.writerow([player_id, names[row], rank, int(player_ids[other]),
+                                     names[other], round(float(d), 4)])
+    finally:
+        if args.output:
+            out.close()
+    print(f'[OK] {len(rows)} pemain acuan, {args.k} pemain mirip masing-masing, '
+          f'{elapsed * 1000:.1f} ms', file=sys.stderr if not args.output else sys.stdout)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
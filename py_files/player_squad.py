@@ -0,0 +1,549 @@
+# -*- coding: utf-8 -*-
+"""Penyusun skuad terbaik untuk satu formasi dengan batasan budget dan komposisi.
+
+Setiap slot formasi menerima beberapa posisi (dicocokkan dengan bitmask
+player_positions). Pencarian dua tahap:
+
+1. Kandidat per slot dipangkas secara vektor (skor tertinggi, pemain
+   termurah per level skor, tanpa pemain yang didominasi) lalu dicari
+   dengan branch and bound untuk mendapat skuad awal.
+2. Untuk setiap pemain dihitung (vektor) batas atas relaksasi LP skuad
+   terbaik yang memuatnya, atas budget, gaji, dan gabungan keduanya.
+   Pemain yang batasnya tidak melebihi skuad awal dibuang; sisanya dicari
+   ulang dengan batas yang sama, sehingga hasilnya terbukti optimal.
+
+Jika batas waktu habis (atau sisa kandidat terlalu banyak), skuad terbaik
+yang sudah ditemukan dikembalikan dengan optimal=False.
+
+Contoh:
+    python player_squad.py 4-3-3 --budget 300000000 --wage-cap 1500000 --max-age 25
+    python player_squad.py 4-4-2 --by potential --max-per-club 2 --filter '{"league": "English Premier League"}'
+    python player_squad.py GK,CB,CB,CB,LWB,CM,CM,RWB,CAM,ST,ST --max-per-nation 3
+
+Contoh (API):
+    squad = build_squad(dataset, '4-3-3', budget=300e6, max_per_nation=3)
+    squad['rows'], squad['slots'], squad['score'], squad['optimal']
+"""
+import argparse
+import bisect
+import json
+import math
+import sys
+import time
+
+import numpy as np
+
+from player_index import POSITION_BITS, top_k
+
+# Posisi pemain yang boleh mengisi setiap slot formasi
+SLOT_POSITIONS = {
+    'GK': ['GK'],
+    'LB': ['LB', 'LWB'],
+    'RB': ['RB', 'RWB'],
+    'CB': ['CB'],
+    'LWB': ['LWB', 'LB', 'LM'],
+    'RWB': ['RWB', 'RB', 'RM'],
+    'CDM': ['CDM', 'CM'],
+    'CM': ['CM', 'CDM', 'CAM'],
+    'CAM': ['CAM', 'CM', 'CF'],
+    'LM': ['LM', 'LW', 'LWB'],
+    'RM': ['RM', 'RW', 'RWB'],
+    'LW': ['LW', 'LM', 'LF'],
+    'RW': ['RW', 'RM', 'RF'],
+    'ST': ['ST', 'CF', 'LF', 'RF'],
+}
+FORMATIONS = {
+    '4-3-3': ['GK', 'LB', 'CB', 'CB', 'RB', 'CDM', 'CM', 'CM', 'LW', 'ST', 'RW'],
+    '4-4-2': ['GK', 'LB', 'CB', 'CB', 'RB', 'LM', 'CM', 'CM', 'RM', 'ST', 'ST'],
+    '4-2-3-1': ['GK', 'LB', 'CB', 'CB', 'RB', 'CDM', 'CDM', 'LM', 'CAM', 'RM', 'ST'],
+    '3-5-2': ['GK', 'CB', 'CB', 'CB', 'LWB', 'CDM', 'CM', 'CM', 'RWB', 'ST', 'ST'],
+    '3-4-3': ['GK', 'CB', 'CB', 'CB', 'LM', 'CM', 'CM', 'RM', 'LW', 'ST', 'RW'],
+    '5-3-2': ['GK', 'LWB', 'CB', 'CB', 'CB', 'RWB', 'CDM', 'CM', 'CM', 'ST', 'ST'],
+}
+DEFAULT_FORMATION = '4-3-3'
+OBJECTIVES = ('overall', 'potential')
+# Kandidat maksimal per slot setelah pemangkasan
+DEFAULT_CANDIDATES = 40
+# Batas waktu pencarian (detik); setelah itu hasil terbaik sejauh ini dipakai
+DEFAULT_TIME_LIMIT = 0.8
+# Bagian batas waktu untuk mencari skuad awal dari kandidat heuristik
+FIRST_PASS = 0.3
+# Kandidat eksak maksimal per slot (kelipatan --candidates) setelah pemangkasan batas atas
+EXACT_FACTOR = 4
+# Faktor bobot nilai:gaji (relatif terhadap rasio batas gaji/budget) yang dicoba untuk relaksasi gabungan
+SURROGATE_FACTORS = (0.125, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0)
+# Cadangan kandidat ekstra jika batas per negara/klub membuat pemain terbaik bentrok
+LIMIT_SLACK = 10
+
+def parse_formation(formation):
+    """Daftar slot dari nama formasi ('4-3-3') atau daftar slot ('GK,CB,CB,...')"""
+    if formation in FORMATIONS:
+        return list(FORMATIONS[formation])
+    slots = [slot.strip().upper() for slot in formation.split(',') if slot.strip()]
+    unknown = [slot for slot in slots if slot not in SLOT_POSITIONS]
+    if len(slots) < 2 or unknown:
+        raise ValueError(f'Formasi tidak dikenal: {formation} (pilihan: {", ".join(FORMATIONS)} '
+                         f'atau daftar slot {",".join(SLOT_POSITIONS)})')
+    return slots
+
+def slot_bits(slot):
+    """Bitmask posisi yang boleh mengisi satu slot"""
+    bits = 0
+    for position in SLOT_POSITIONS[slot]:
+        bits |= POSITION_BITS[position]
+    return bits
+
+def cheapest_sum(costs, count):
+    """Jumlah `count` biaya termurah (inf jika kandidat kurang)"""
+    if len(costs) < count:
+        return np.inf
+    return float(np.partition(costs, count - 1)[:count].sum()) if count else 0.0
+
+def score_levels(score):
+    """Level skor unik (naik) dan kode level setiap pemain, tanpa sort untuk skor bulat"""
+    low = score.min() if len(score) else 0.0
+    if np.all(score == np.floor(score)) and score.max() - low < 1 << 16:
+        code = (score - low).astype(np.int64)
+        present = np.bincount(code) > 0
+        return low + np.flatnonzero(present), (np.cumsum(present) - 1)[code]
+    return np.unique(score, return_inverse=True)
+
+def prune_candidates(score, costs, depth, limit, per_level, levels=None):
+    """Indeks kandidat yang dipertahankan untuk satu kelompok slot.
+
+    Vektor: `depth` skor tertinggi, lalu `per_level` pemain termurah per level
+    skor untuk setiap jenis biaya. Dari himpunan kecil ini, pemain yang
+    didominasi oleh >= depth pemain lain dibuang; sisanya diurutkan per
+    lapisan dominasi lalu skor, maksimal `limit`.
+    """
+    _, code = levels or score_levels(score)
+    chosen = [top_k(score, depth)]
+    for cost in costs:
+        # Satu argsort untuk urutan (level, biaya): kunci level * skala + biaya
+        order = np.argsort(code * (cost.max() - cost.min() + 1.0) + (cost - cost.min()))
+        sorted_code = code[order]
+        level_start = np.concatenate(([0], np.cumsum(np.bincount(sorted_code))[:-1]))[sorted_code]
+        chosen.append(order[np.arange(len(order)) - level_start < per_level])
+    chosen = np.unique(np.concatenate(chosen))
+    # Dominasi berpasangan: j mendominasi i jika tidak lebih buruk di semua kriteria;
+    # untuk nilai yang persis sama, pemain dengan indeks lebih kecil dianggap mendominasi
+    s = score[chosen]
+    dominates = s[:, None] >= s[None, :]
+    better = s[:, None] > s[None, :]
+    for cost in costs:
+        c = cost[chosen]
+        dominates &= c[:, None] <= c[None, :]
+        better |= c[:, None] < c[None, :]
+    earlier = np.arange(len(chosen))[:, None] < np.arange(len(chosen))[None, :]
+    dominated = (dominates & (better | earlier)).sum(axis=0)
+    keep = dominated < depth
+    chosen, dominated = chosen[keep], dominated[keep]
+    order = np.lexsort((-score[chosen], dominated))[:limit]
+    return chosen[order], len(order) < int(keep.sum())
+
+def hull_steps(cost, score, levels=None):
+    """Titik termurah dan langkah hull cekung atas (biaya, skor) dengan efisiensi menurun.
+
+    Relaksasi LP satu slot: memilih campuran kandidat di sepanjang hull ini.
+    Mengembalikan (biaya dasar, skor dasar, [(efisiensi, tambahan biaya, tambahan skor)]).
+    """
+    values, code = levels or score_levels(score)
+    cheapest = np.full(len(values), np.inf)
+    np.minimum.at(cheapest, code, cost)
+    # Front Pareto: level yang lebih murah dari semua level di atasnya
+    above = np.append(np.minimum.accumulate(cheapest[::-1])[::-1][1:], np.inf)
+    front = cheapest < above
+    hull = []
+    for point in zip(cheapest[front].tolist(), values[front].tolist()):
+        while len(hull) >= 2 and ((hull[-1][1] - hull[-2][1]) * (point[0] - hull[-1][0]) <=
+                                  (point[1] - hull[-1][1]) * (hull[-1][0] - hull[-2][0])):
+            hull.pop()
+        hull.append(point)
+    steps = [((s2 - s1) / (c2 - c1), c2 - c1, s2 - s1) for (c1, s1), (c2, s2) in zip(hull, hull[1:])]
+    return hull[0][0], hull[0][1], steps
+
+def combined(weights, value, wage):
+    """Biaya gabungan a*nilai + b*gaji (sumber daya relaksasi); bobot 0 mengabaikan batas tak hingga"""
+    a, b = weights
+    return (a * value if a else 0.0) + (b * wage if b else 0.0)
+
+def surrogate_weights(pools, counts, score, value, wage, budget, wage_cap):
+    """Bobot nilai:gaji yang memberi batas atas LP terkecil untuk batasan gabungan.
+
+    Skuad yang memenuhi budget dan batas gaji juga memenuhi kombinasi positif
+    keduanya, jadi batas atas dari bobot mana pun tetap sah.
+    """
+    best = None
+    for factor in SURROGATE_FACTORS:
+        weights = (factor * wage_cap / max(budget, 1.0), 1.0)
+        bound = LinearBound([(count, hull_steps(combined(weights, value[m], wage[m]), score[m]))
+                             for count, m in zip(counts, pools)])(combined(weights, budget, wage_cap))
+        if bound is None:
+            return weights
+        if best is None or bound < best[0]:
+            best = (bound, weights)
+    return best[1]
+
+class LinearBound:
+    """Batas atas LP (knapsack pilihan ganda) untuk sekumpulan slot dengan satu jenis biaya"""
+
+    def __init__(self, parts):
+        # parts: [(jumlah slot, (biaya dasar, skor dasar, langkah))]
+        self.base_cost = sum(count * base_cost for count, (base_cost, _, _) in parts)
+        self.base_score = sum(count * base_score for count, (_, base_score, _) in parts)
+        steps = sorted(((eff, count * cost, count * score) for count, (_, _, group_steps) in parts
+                        if count for eff, cost, score in group_steps), reverse=True)
+        self.efficiency = [eff for eff, _, _ in steps]
+        self.cum_cost = [0.0]
+        self.cum_score = [0.0]
+        for _, cost, score in steps:
+            self.cum_cost.append(self.cum_cost[-1] + cost)
+            self.cum_score.append(self.cum_score[-1] + score)
+
+    def __call__(self, budget):
+        """Skor maksimal relaksasi dengan sisa `budget`, None jika biaya termurah pun tidak muat"""
+        room = budget - self.base_cost
+        if room < 0:
+            return None
+        k = bisect.bisect_right(self.cum_cost, room) - 1
+        total = self.base_score + self.cum_score[k]
+        if k < len(self.efficiency):
+            total += (room - self.cum_cost[k]) * self.efficiency[k]
+        return total
+
+    def many(self, budgets):
+        """Versi vektor __call__ untuk banyak sisa budget sekaligus (-inf jika tidak muat)"""
+        room = budgets - self.base_cost
+        k = np.maximum(np.searchsorted(self.cum_cost, room, side='right') - 1, 0)
+        efficiency = np.append(self.efficiency, 0.0)
+        with np.errstate(invalid='ignore'):
+            partial = np.where(k < len(self.efficiency),
+                               (room - np.array(self.cum_cost)[k]) * efficiency[k], 0.0)
+        return np.where(room >= 0, self.base_score + np.array(self.cum_score)[k] + partial, -np.inf)
+
+class SlotGroup:
+    """Slot-slot formasi dengan posisi yang sama beserta kandidatnya (terurut skor menurun)"""
+
+    def __init__(self, slot, count, rows, score, value, wage, ids, clubs, nations, weights):
+        order = np.lexsort((value, -score))
+        self.slot = slot
+        self.count = count
+        self.rows = rows[order]
+        self.score = score[order].tolist()
+        self.value = value[order].tolist()
+        self.wage = wage[order].tolist()
+        self.ids = ids[order].tolist()
+        self.clubs = clubs[order].tolist()
+        self.nations = nations[order].tolist()
+        self.steps = [hull_steps(combined(w, value, wage), score) for w in weights]
+
+class SquadSearch:
+    """Branch and bound atas kandidat per kelompok slot.
+
+    Slot dalam satu kelompok dapat ditukar, jadi kandidatnya dipilih dengan
+    indeks menaik (tanpa permutasi). Satu pemain (sofifa_id) hanya sekali.
+    """
+
+    def __init__(self, groups, weights, budget, wage_cap, max_per_nation, max_per_club, deadline,
+                 integral=False, best_score=-np.inf, best=None):
+        self.groups = groups
+        self.weights = weights
+        self.budget = np.inf if budget is None else float(budget)
+        self.wage_cap = np.inf if wage_cap is None else float(wage_cap)
+        self.max_per_nation = max_per_nation
+        self.max_per_club = max_per_club
+        self.deadline = deadline
+        # Skor bulat (overall/potential): batas relaksasi boleh dibulatkan ke bawah
+        self.integral = integral
+        self.nodes = 0
+        self.timed_out = False
+        # best: [(slot, baris, skor)] skuad terbaik sejauh ini (boleh diisi skuad awal)
+        self.best_score = best_score
+        self.best = best
+        self._picked = []
+        self._used = set()
+        self._clubs = {}
+        self._nations = {}
+        # bounds[g][s]: batas atas kelompok g (sisa s slot) dan semua kelompok sesudahnya
+        self.bounds = []
+        for g, group in enumerate(groups):
+            later = [(other.count, other) for other in groups[g + 1:]]
+            self.bounds.append([None] + [
+                [LinearBound([(slots, group.steps[r])] + [(c, o.steps[r]) for c, o in later])
+                 for r in range(len(weights))]
+                for slots in range(1, group.count + 1)])
+
+    def run(self):
+        if self.groups:
+            self._search(0, 0, self.groups[0].count, 0.0, self.budget, self.wage_cap)
+        return self.best
+
+    def _rest_bound(self, g, slots, budget, wage):
+        """Batas atas kelompok g (sisa `slots`) dan semua kelompok sesudahnya, None jika mustahil"""
+        bound = np.inf
+        for weights, relaxed in zip(self.weights, self.bounds[g][slots]):
+            part = relaxed(combined(weights, budget, wage))
+            if part is None:
+                return None
+            bound = min(bound, part)
+        return math.floor(bound + 1e-6) if self.integral else bound
+
+    def _search(self, g, start, slots, score, budget, wage):
+        self.nodes += 1
+        if self.nodes % 512 == 0 and time.perf_counter() > self.deadline:
+            self.timed_out = True
+        if self.timed_out:
+            return
+        if slots == 0:
+            g += 1
+            if g == len(self.groups):
+                if score > self.best_score:
+                    self.best_score = score
+                    self.best = [(self.groups[h].slot, int(self.groups[h].rows[i]), self.groups[h].score[i])
+                                 for h, i in self._picked]
+                return
+            start, slots = 0, self.groups[g].count
+        bound = self._rest_bound(g, slots, budget, wage)
+        if bound is None or score + bound <= self.best_score:
+            return
+        group = self.groups[g]
+        later = (self._rest_bound(g + 1, self.groups[g + 1].count, budget, wage)
+                 if g + 1 < len(self.groups) else 0.0)
+        for i in range(start, len(group.score)):
+            # Kandidat terurut skor menurun: sisa kandidat tidak mungkin lebih baik
+            if later is None or score + group.score[i] * slots + later <= self.best_score:
+                break
+            value, pay = group.value[i], group.wage[i]
+            if value > budget or pay > wage or group.ids[i] in self._used:
+                continue
+            club, nation = group.clubs[i], group.nations[i]
+            if (self.max_per_club is not None and club >= 0 and
+                    self._clubs.get(club, 0) >= self.max_per_club):
+                continue
+            if (self.max_per_nation is not None and nation >= 0 and
+                    self._nations.get(nation, 0) >= self.max_per_nation):
+                continue
+            self._picked.append((g, i))
+            self._used.add(group.ids[i])
+            self._clubs[club] = self._clubs.get(club, 0) + 1
+            self._nations[nation] = self._nations.get(nation, 0) + 1
+            self._search(g, i + 1, slots - 1, score + group.score[i], budget - value, wage - pay)
+            self._nations[nation] -= 1
+            self._clubs[club] -= 1
+            self._used.discard(group.ids[i])
+            self._picked.pop()
+            if self.timed_out:
+                return
+
+def build_squad(dataset, formation=DEFAULT_FORMATION, by='overall', budget=None, wage_cap=None,
+                min_age=None, max_age=None, max_per_nation=None, max_per_club=None,
+                candidates=None, per_slot=DEFAULT_CANDIDATES, time_limit=DEFAULT_TIME_LIMIT):
+    """Skuad dengan total `by` tertinggi yang memenuhi semua batasan.
+
+    `candidates` membatasi pemain yang boleh dipilih (posisi baris, misal
+    hasil query). Mengembalikan dict (slots, rows, score, value_eur,
+    wage_eur, optimal, candidates, nodes, ms) atau None jika tidak ada
+    skuad yang memenuhi. optimal=True berarti terbukti tidak ada skuad
+    yang lebih baik (tidak terpotong batas waktu atau batas kandidat).
+    """
+    start = time.perf_counter()
+    if by not in OBJECTIVES:
+        raise ValueError(f'Kriteria tidak dikenal: {by} (pilihan: {", ".join(OBJECTIVES)})')
+    slots = parse_formation(formation)
+    rows = np.arange(len(dataset)) if candidates is None else np.asarray(candidates, dtype=np.int64)
+    score = dataset.column(by)[rows].astype(np.float64)
+    value = dataset.column('value_eur')[rows].astype(np.float64)
+    wage = dataset.column('wage_eur')[rows].astype(np.float64)
+    age = dataset.column('age')[rows].astype(np.float64)
+    keep = ~np.isnan(score)
+    # Nilai/gaji kosong tidak bisa dicek terhadap batas, jadi hanya dipakai jika tanpa batas
+    keep &= ~np.isnan(value) if budget is not None else True
+    keep &= ~np.isnan(wage) if wage_cap is not None else True
+    if min_age is not None:
+        keep &= age >= min_age
+    if max_age is not None:
+        keep &= age <= max_age
+    rows, score = rows[keep], score[keep]
+    value, wage = np.nan_to_num(value[keep]), np.nan_to_num(wage[keep])
+    masks = dataset.column('position_mask')[rows]
+    ids = dataset.column('sofifa_id')[rows].astype(np.int64)
+    clubs = dataset.codes('club_name')[rows].astype(np.int64)
+    nations = dataset.codes('nationality_name')[rows].astype(np.int64)
+    integral = bool(np.all(score == np.floor(score)))
+
+    labels = list(dict.fromkeys(slots))
+    counts = [slots.count(slot) for slot in labels]
+    pools = [np.flatnonzero(masks & slot_bits(slot)) for slot in labels]
+    # Biaya minimal untuk mengisi semua slot: pemain yang harganya melebihi
+    # budget dikurangi biaya termurah slot lain tidak mungkin terpilih
+    costs = [(cost, limit) for cost, limit in ((value, budget), (wage, wage_cap)) if limit is not None]
+    floors = [sum(cheapest_sum(cost[p], c) for p, c in zip(pools, counts)) for cost, _ in costs]
+    if not all(np.isfinite(floor) and floor <= limit for floor, (_, limit) in zip(floors, costs)):
+        return None
+    for g, (count, members) in enumerate(zip(counts, pools)):
+        for (cost, limit), floor in zip(costs, floors):
+            ceiling = limit - floor + np.partition(cost[members], count - 1)[count - 1]
+            members = members[cost[members] <= ceiling]
+        if len(members) < count:
+            return None
+        pools[g] = members
+
+    def make_groups(members_per_group):
+        groups = [SlotGroup(slot, count, rows[m], score[m], value[m], wage[m], ids[m], clubs[m],
+                            nations[m], weights) for slot, count, m in zip(labels, counts, members_per_group)]
+        # Kelompok dengan kandidat paling sedikit dicari lebih dulu
+        return sorted(groups, key=lambda group: len(group.score) / group.count)
+
+    def run_search(groups, deadline, best_score=-np.inf, best=None):
+        search = SquadSearch(groups, weights, budget, wage_cap, max_per_nation, max_per_club, deadline,
+                             integral, best_score, best)
+        search.run()
+        return search
+
+    # Tahap 1: kandidat hasil pemangkasan heuristik (top-k dan dominasi) -> skuad awal
+    depth = len(slots) + (LIMIT_SLACK if max_per_nation is not None or max_per_club is not None else 0)
+    levels = [score_levels(score[m]) for m in pools]
+    shortlist = [m[prune_candidates(score[m], [cost[m] for cost, _ in costs], max(depth, count),
+                                    max(per_slot // 2, count), count + 2, lv)[0]]
+                 for count, m, lv in zip(counts, pools, levels)]
+    # Sumber daya relaksasi LP: setiap batas biaya, plus gabungan keduanya jika dua-duanya aktif
+    weights = [w for w, limit in (((1.0, 0.0), budget), ((0.0, 1.0), wage_cap)) if limit is not None]
+    if len(weights) == 2:
+        weights.append(surrogate_weights(shortlist, counts, score, value, wage, budget, wage_cap))
+    weights = weights or [(0.0, 0.0)]
+    groups = make_groups(shortlist)
+    first = run_search(groups, start + time_limit * FIRST_PASS)
+
+    # Tahap 2: batas atas LP (vektor) skuad terbaik yang memuat setiap pemain;
+    # pemain yang batasnya tidak melebihi skuad terbaik sejauh ini dibuang dan
+    # sisanya dicari ulang secara eksak (diulang selama skuad terbaik membaik)
+    steps = [[hull_steps(combined(w, value[m], wage[m]), score[m], lv) for m, lv in zip(pools, levels)]
+             for w in weights]
+    uppers = []
+    for g, (count, members) in enumerate(zip(counts, pools)):
+        upper = np.full(len(members), np.inf)
+        for w, group_steps in zip(weights, steps):
+            rest = LinearBound([(c - (h == g), part) for h, (c, part) in enumerate(zip(counts, group_steps))])
+            room = combined(w, budget, wage_cap) - combined(w, value[members], wage[members])
+            upper = np.minimum(upper, score[members] + rest.many(room))
+        uppers.append(np.floor(upper + 1e-6) if integral else upper)
+
+    search, nodes = first, first.nodes
+    while True:
+        survivors, trimmed = [], False
+        for members, upper in zip(pools, uppers):
+            alive = np.flatnonzero(upper > search.best_score)
+            if len(alive) > per_slot * EXACT_FACTOR:
+                alive, trimmed = alive[top_k(upper[alive], per_slot * EXACT_FACTOR)], True
+            survivors.append(members[alive])
+        if any(len(m) < count for count, m in zip(counts, survivors)):
+            # Tidak ada skuad yang bisa melampaui skuad terbaik sejauh ini
+            optimal = True
+            break
+        previous = search.best_score
+        groups = make_groups(survivors)
+        search = run_search(groups, start + time_limit, search.best_score, search.best)
+        nodes += search.nodes
+        optimal = not search.timed_out and not trimmed
+        if optimal or search.timed_out or search.best_score == previous:
+            break
+    if search.best is None:
+        return None
+    chosen = {}
+    for slot, row, _ in sorted(search.best, key=lambda item: -item[2]):
+        chosen.setdefault(slot, []).append(row)
+    squad_rows = np.array([chosen[slot].pop(0) for slot in slots], dtype=np.int64)
+    return {
+        'slots': slots,
+        'rows': squad_rows,
+        'score': float(dataset.column(by)[squad_rows].astype(np.float64).sum()),
+        'value_eur': float(np.nansum(dataset.column('value_eur')[squad_rows].astype(np.float64))),
+        'wage_eur': float(np.nansum(dataset.column('wage_eur')[squad_rows].astype(np.float64))),
+        'optimal': optimal,
+        'candidates': sum(len(group.score) for group in groups),
+        'nodes': nodes,
+        'ms': round((time.perf_counter() - start) * 1000, 3),
+    }
+
+def squad_frame(dataset, squad):
+    """Tabel skuad (satu baris per slot) untuk ditampilkan atau disimpan"""
+    import pandas as pd
+
+    rows = squad['rows']
+    df = dataset.df
+    return pd.DataFrame({
+        'slot': squad['slots'],
+        'sofifa_id': df['sofifa_id'].to_numpy()[rows],
+        'short_name': dataset.column('display_short_name')[rows],
+        'player_positions': df['player_positions'].to_numpy()[rows],
+        'club': dataset.column('display_club')[rows],
+        'nationality': dataset.column('display_country')[rows],
+        'age': dataset.column('age')[rows],
+        'overall': dataset.column('overall')[rows],
+        'potential': dataset.column('potential')[rows],
+        'value_eur': dataset.column('value_eur')[rows],
+        'wage_eur': dataset.column('wage_eur')[rows],
+    })
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Menyusun skuad terbaik untuk satu formasi')
+    parser.add_argument('formation', nargs='?', default=DEFAULT_FORMATION,
+                        help=f'Formasi ({", ".join(FORMATIONS)}) atau daftar slot, misal GK,CB,CB,...')
+    parser.add_argument('--csv', default=None, help='Lokasi dataset pemain')
+    parser.add_argument('--by', default='overall', choices=OBJECTIVES, help='Skor yang dimaksimalkan')
+    parser.add_argument('--budget', type=float, help='Total nilai pasar maksimal (EUR)')
+    parser.add_argument('--wage-cap', type=float, help='Total gaji maksimal (EUR per minggu)')
+    parser.add_argument('--min-age', type=int)
+    parser.add_argument('--max-age', type=int)
+    parser.add_argument('--max-per-nation', type=int, help='Pemain maksimal dari satu negara')
+    parser.add_argument('--max-per-club', type=int, help='Pemain maksimal dari satu klub')
+    parser.add_argument('--filter', help='Batasi kandidat dengan spesifikasi filter (JSON, format mode batch)')
+    parser.add_argument('--candidates', type=int, default=DEFAULT_CANDIDATES,
+                        help='Kandidat maksimal per slot setelah pemangkasan')
+    parser.add_argument('--time-limit', type=float, default=DEFAULT_TIME_LIMIT,
+                        help='Batas waktu pencarian (detik)')
+    parser.add_argument('--output', '-o', help='Simpan skuad ke file CSV')
+    args = parser.parse_args(argv)
+
+    # Diimpor di sini agar modul ini ringan saat hanya build_squad yang dipakai
+    from player_query import build_query, load_dataset
+    from player_store import DEFAULT_CSV_PATH
+
+    try:
+        spec = json.loads(args.filter) if args.filter else None
+    except ValueError as e:
+        print('[ERROR] Filter tidak valid:', e)
+        return 1
+    try:
+        dataset = load_dataset(args.csv or DEFAULT_CSV_PATH)
+    except FileNotFoundError:
+        print('[ERROR] File tidak ditemukan di', args.csv or DEFAULT_CSV_PATH)
+        return 1
+    try:
+        candidates = build_query(dataset, spec).row_ids() if spec else None
+        squad = build_squad(dataset, args.formation, by=args.by, budget=args.budget,
+                            wage_cap=args.wage_cap, min_age=args.min_age, max_age=args.max_age,
+                            max_per_nation=args.max_per_nation, max_per_club=args.max_per_club,
+                            candidates=candidates, per_slot=args.candidates, time_limit=args.time_limit)
+    except ValueError as e:
+        print('[ERROR]', e)
+        return 1
+    if squad is None:
+        print('[X] Tidak ada skuad yang memenuhi semua batasan')
+        return 1
+
+    frame = squad_frame(dataset, squad)
+    if args.output:
+        frame.to_csv(args.output, index=False)
+        print('[OK] Skuad disimpan ke', args.output)
+    else:
+        print(frame.to_string(index=False, na_rep='-'))
+    print(f'\n[OK] Total {args.by} {squad["score"]:.0f}, nilai pasar EUR {squad["value_eur"]:,.0f}, '
+          f'gaji EUR {squad["wage_eur"]:,.0f} ({squad["candidates"]} kandidat, {squad["nodes"]} node, '
+          f'{squad["ms"]:.1f} ms)')
+    if not squad['optimal']:
+        print('[INFO] Pencarian dipotong (batas waktu/kandidat): skuad mendekati optimal')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,633 @@
+# -*- coding: utf-8 -*-
+"""Pemuatan data pemain: snapshot kolumnar dan kolom turunan.
+
+Setelah CSV diparse sekali, kolom yang dipakai program disimpan sebagai
+file NumPy (.npy) di folder `<nama_csv>.snapshot/` di samping CSV.
+Start berikutnya cukup memetakan file tersebut ke memori (memory-map).
+Snapshot dibangun ulang otomatis jika ukuran, mtime, atau hash CSV berubah.
+
+CSV dibaca per chunk (ingest_csv): setiap chunk langsung di-downcast,
+di-dictionary-encode, dan ditambahkan ke file per kolom, sehingga memori
+puncak dibatasi oleh ukuran chunk, bukan ukuran file. Snapshot bisa juga
+dibangun manual:
+    python player_store.py data.csv --memory-mb 128
+
+Delta yang diterapkan lewat player_delta.py dicatat di folder
+`<nama_csv>.deltas/` dan diterapkan ulang setiap kali snapshot dibangun
+ulang dari CSV, sehingga tidak hilang saat CSV atau format snapshot berubah.
+
+Setelah dimuat, kolom turunan (teks ternormalisasi, bitmask posisi) dibuat
+sekali lewat add_derived_columns.
+"""
+import argparse
+import codecs
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import player_profile as profile
+from player_index import parse_positions
+
+# Lokasi default dataset utama
+DEFAULT_CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'csv_files', 'fifa_players.csv')
+
+# Kolom yang benar-benar dipakai program; kolom lain tidak dimuat
+USED_COLUMNS = [
+    'sofifa_id', 'short_name', 'long_name', 'player_positions',
+    'overall', 'potential', 'value_eur', 'wage_eur', 'age',
+    'club_name', 'league_name', 'nationality_name',
+    'pace', 'shooting', 'passing', 'dribbling', 'defending', 'physic',
+    # Atribut kiper (pencarian pemain mirip untuk kiper); boleh tidak ada di CSV
+    'goalkeeping_diving', 'goalkeeping_handling', 'goalkeeping_kicking',
+    'goalkeeping_positioning', 'goalkeeping_reflexes',
+]
+
+# Kolom teks dengan banyak pengulangan, disimpan sebagai categorical
+# (kategori terurut alfabetis, nilai berupa kode integer)
+CATEGORICAL_COLUMNS = ['league_name', 'club_name', 'nationality_name']
+
+# Kolom teks yang dinormalisasi sekali saat load_data (kolom asal -> kolom hasil)
+NORMALIZED_COLUMNS = {
+    'long_name': 'normalized_name',
+    'short_name': 'normalized_short_name',
+    'club_name': 'normalized_club',
+    'nationality_name': 'normalized_country',
+}
+
+# Kolom teks yang punya bentuk tampilan ASCII (kolom asal -> kolom tampilan),
+# disimpan di snapshot agar menu cukup membaca kolom
+DISPLAY_COLUMNS = {
+    'long_name': 'display_name',
+    'short_name': 'display_short_name',
+    'club_name': 'display_club',
+    'league_name': 'display_league',
+    'nationality_name': 'display_country',
+}
+
+# Huruf tanpa dekomposisi Unicode yang dipetakan manual ke ASCII
+ASCII_REPLACEMENTS = str.maketrans({
+    'ø': 'o', 'Ø': 'O', 'æ': 'ae', 'Æ': 'AE', 'œ': 'oe', 'Œ': 'OE',
+    'ß': 'ss', 'đ': 'd', 'Đ': 'D', 'ð': 'd', 'Ð': 'D', 'ł': 'l', 'Ł': 'L',
+    'ı': 'i', 'þ': 'th', 'Þ': 'Th',
+})
+
+# Karakter penanda accent (combining marks) setelah dekomposisi NFD
+COMBINING_MARKS = '[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]'
+
+# Naikkan jika format snapshot berubah agar snapshot lama dibangun ulang
+SNAPSHOT_VERSION = 4
+MANIFEST_NAME = 'manifest.json'
+# Daftar delta yang sudah diterapkan, di folder log delta (lihat player_delta.py)
+DELTA_LOG_NAME = 'log.json'
+HASH_BLOCK_SIZE = 1 << 20
+
+# Tipe penyimpanan kolom numerik saat ingest; kolom yang berisi nilai kosong
+# (misal atribut pace kiper) disimpan sebagai float32 dengan NaN
+INGEST_DTYPES = {
+    'sofifa_id': np.uint32,
+    'overall': np.uint8, 'potential': np.uint8, 'age': np.uint8,
+    'pace': np.uint8, 'shooting': np.uint8, 'passing': np.uint8,
+    'dribbling': np.uint8, 'defending': np.uint8, 'physic': np.uint8,
+    'goalkeeping_diving': np.uint8, 'goalkeeping_handling': np.uint8,
+    'goalkeeping_kicking': np.uint8, 'goalkeeping_positioning': np.uint8,
+    'goalkeeping_reflexes': np.uint8,
+    'value_eur': np.int32, 'wage_eur': np.int32,
+}
+# Batas memori default untuk satu chunk ingest (byte)
+DEFAULT_MEMORY_LIMIT = 256 << 20
+# Chunk pertama (untuk mengukur memori per baris) dan ukuran chunk minimum
+MIN_CHUNK_ROWS = 5000
+# Memori puncak per chunk relatif terhadap ukuran DataFrame chunk
+# (buffer parser, array float64 sementara, kode hasil encode)
+CHUNK_OVERHEAD = 4
+# Jumlah baris per blok saat menyalin file sementara ke .npy akhir
+COPY_BLOCK_ROWS = 1 << 20
+
+def snapshot_dir(csv_path):
+    """Lokasi folder snapshot untuk sebuah file CSV"""
+    return os.path.splitext(csv_path)[0] + '.snapshot'
+
+def delta_log_dir(csv_path):
+    """Lokasi folder log delta (salinan file delta yang sudah diterapkan) untuk sebuah CSV"""
+    return os.path.splitext(csv_path)[0] + '.deltas'
+
+def read_delta_log(csv_path):
+    """Entri log delta sesuai urutan penerapan, atau [] jika belum ada"""
+    try:
+        with open(os.path.join(delta_log_dir(csv_path), DELTA_LOG_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+def file_hash(path):
+    """Hash SHA-1 isi file, dibaca per blok"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def file_signature(path, with_hash=True):
+    """Ukuran, mtime, dan (opsional) hash file untuk validasi snapshot"""
+    stat = os.stat(path)
+    signature = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if with_hash:
+        signature['sha1'] = file_hash(path)
+    return signature
+
+def downcast_column(series):
+    """Memperkecil tipe kolom numerik (int terkecil, atau float32 jika ada NaN)"""
+    if pd.api.types.is_float_dtype(series):
+        if series.isna().any() or not (series % 1 == 0).all():
+            return series.astype(np.float32)
+    downcast = 'unsigned' if series.min() >= 0 else 'integer'
+    return pd.to_numeric(series, downcast=downcast)
+
+def read_csv_columns(csv_path):
+    """Parse CSV hanya untuk kolom yang dipakai (tanpa snapshot), lalu downcast kolom numerik"""
+    df = pd.read_csv(csv_path, usecols=lambda c: c in USED_COLUMNS,
+                     low_memory=False, encoding=detect_encoding(csv_path))
+    for col in df.columns:
+        if col in CATEGORICAL_COLUMNS:
+            df[col] = pd.Categorical(map_unique(df[col], repair_values))
+        elif pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = downcast_column(df[col])
+        else:
+            df[col] = map_unique(df[col], repair_values)
+    return df
+
+class NumericSpool:
+    """Kolom numerik yang ditulis per chunk ke file sementara dengan tipe target.
+
+    Nilai kosong dicatat di file mask terpisah; jika ada, kolom akhirnya
+    disimpan sebagai float32 berisi NaN.
+    """
+
+    def __init__(self, folder, name, dtype):
+        self.name = name
+        self.dtype = np.dtype(dtype)
+        self.path = os.path.join(folder, name + '.raw')
+        self.mask_path = os.path.join(folder, name + '.na')
+        self.file = open(self.path, 'wb')
+        self.mask_file = open(self.mask_path, 'wb')
+        self.rows = 0
+        self.has_missing = False
+
+    def append(self, series):
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        missing = np.isnan(values)
+        present = values[~missing]
+        if self.dtype.kind in 'iu' and len(present):
+            info = np.iinfo(self.dtype)
+            if present.min() < info.min or present.max() > info.max or (present % 1 != 0).any():
+                raise ValueError(f'Nilai kolom {self.name} tidak muat di tipe {self.dtype}')
+        self.has_missing |= bool(missing.any())
+        np.where(missing, 0, values).astype(self.dtype).tofile(self.file)
+        missing.tofile(self.mask_file)
+        self.rows += len(values)
+
+    def finish(self, folder):
+        """Menulis file .npy akhir per blok; mengembalikan entri manifest"""
+        self.file.close()
+        self.mask_file.close()
+        dtype = np.float32 if self.has_missing else self.dtype
+        out = np.lib.format.open_memmap(os.path.join(folder, self.name + '.npy'),
+                                        mode='w+', dtype=dtype, shape=(self.rows,))
+        if self.rows:
+            raw = np.memmap(self.path, dtype=self.dtype, mode='r', shape=(self.rows,))
+            mask = np.memmap(self.mask_path, dtype=bool, mode='r', shape=(self.rows,))
+            for start in range(0, self.rows, COPY_BLOCK_ROWS):
+                block = slice(start, start + COPY_BLOCK_ROWS)
+                out[block] = raw[block]
+                if self.has_missing:
+                    out[block][mask[block]] = np.nan
+            del raw, mask
+        out.flush()
+        del out
+        os.remove(self.path)
+        os.remove(self.mask_path)
+        return {'name': self.name, 'kind': 'numeric'}
+
+class StringSpool:
+    """Kolom teks yang di-dictionary-encode per chunk (kamus nilai + kode int32).
+
+    Saat selesai, encoding setiap nilai unik diperbaiki sekali, bentuk
+    tampilan ASCII dibuat, dan kamus kolom categorical diurutkan alfabetis.
+    """
+
+    def __init__(self, folder, name, categorical):
+        self.name = name
+        self.categorical = categorical
+        self.path = os.path.join(folder, name + '.raw')
+        self.file = open(self.path, 'wb')
+        self.lookup = {}
+        self.rows = 0
+
+    def append(self, series):
+        local, uniques = pd.factorize(series)
+        lookup = self.lookup
+        mapping = np.array([lookup.setdefault(value, len(lookup)) for value in uniques.tolist()],
+                           dtype=np.int32)
+        # Kode lokal -1 (NaN) mengambil elemen -1 terakhir
+        np.append(mapping, np.int32(-1))[local].tofile(self.file)
+        self.rows += len(local)
+
+    def finish(self, folder):
+        """Menulis kamus dan kode akhir per blok; mengembalikan entri manifest"""
+        self.file.close()
+        # Nilai yang sama setelah diperbaiki digabung menjadi satu kode
+        repaired = repair_values(self.lookup)
+        if self.categorical:
+            values, remap = np.unique(repaired.astype(str), return_inverse=True)
+            code_dtype = np.min_scalar_type(-max(len(values), 1))
+        else:
+            remap, values = pd.factorize(repaired)
+            values = np.asarray(values, dtype=object).astype(str)
+            code_dtype = np.int32
+        remap = np.append(remap.astype(np.int32), np.int32(-1))
+        out = np.lib.format.open_memmap(os.path.join(folder, self.name + '.codes.npy'),
+                                        mode='w+', dtype=code_dtype, shape=(self.rows,))
+        if self.rows:
+            raw = np.memmap(self.path, dtype=np.int32, mode='r', shape=(self.rows,))
+            for start in range(0, self.rows, COPY_BLOCK_ROWS):
+                block = slice(start, start + COPY_BLOCK_ROWS)
+                out[block] = remap[raw[block]]
+            del raw
+        out.flush()
+        del out
+        os.remove(self.path)
+        np.save(os.path.join(folder, self.name + '.values.npy'), values)
+        entry = {'name': self.name, 'kind': 'category' if self.categorical else 'string'}
+        if self.name in DISPLAY_COLUMNS:
+            np.save(os.path.join(folder, self.name + '.display.npy'),
+                    display_values(values).astype(str))
+            entry['display'] = DISPLAY_COLUMNS[self.name]
+        return entry
+
+def make_spool(folder, name):
+    """Spool sesuai jenis kolom: categorical, numerik, atau teks"""
+    if name in CATEGORICAL_COLUMNS:
+        return StringSpool(folder, name, categorical=True)
+    if name in INGEST_DTYPES:
+        return NumericSpool(folder, name, INGEST_DTYPES[name])
+    return StringSpool(folder, name, categorical=False)
+
+def next_chunk_rows(chunk, memory_limit):
+    """Jumlah baris chunk berikutnya agar memori puncak tetap di bawah batas"""
+    per_row = chunk.memory_usage(deep=True, index=False).sum() / max(len(chunk), 1)
+    return max(MIN_CHUNK_ROWS, int(memory_limit / (per_row * CHUNK_OVERHEAD)))
+
+def ingest_csv(csv_path, signature, memory_limit=DEFAULT_MEMORY_LIMIT):
+    """Membaca CSV per chunk langsung ke snapshot kolumnar; mengembalikan jumlah baris.
+
+    Encoding file dideteksi sekali di awal. Hanya kolom USED_COLUMNS yang
+    dibaca. Kolom numerik langsung di-downcast ke INGEST_DTYPES, kolom teks
+    di-dictionary-encode (plus bentuk tampilan ASCII), dan setiap chunk
+    ditambahkan ke file per kolom, sehingga memori puncak sebanding dengan
+    satu chunk (diatur lewat memory_limit, dalam byte), bukan ukuran file.
+    """
+    target = snapshot_dir(csv_path)
+    tmp = target + '.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    encoding = detect_encoding(csv_path)
+    spools = None
+    rows = 0
+    chunk_rows = MIN_CHUNK_ROWS
+    with pd.read_csv(csv_path, usecols=lambda c: c in USED_COLUMNS,
+                     encoding=encoding, iterator=True) as reader:
+        while True:
+            try:
+                chunk = reader.get_chunk(chunk_rows)
+            except StopIteration:
+                break
+            if spools is None:
+                spools = [make_spool(tmp, col) for col in chunk.columns]
+            for spool in spools:
+                spool.append(chunk[spool.name])
+            if rows == 0:
+                # Chunk pertama dipakai untuk mengukur memori per baris
+                chunk_rows = next_chunk_rows(chunk, memory_limit)
+            rows += len(chunk)
+            del chunk
+    if spools is None:
+        raise ValueError(f'CSV kosong: {csv_path}')
+    manifest = {
+        'version': SNAPSHOT_VERSION,
+        'source': signature,
+        'encoding': encoding,
+        'rows': rows,
+        'columns': [spool.finish(tmp) for spool in spools],
+    }
+    with open(os.path.join(tmp, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+    return rows
+
+def snapshot_labels(df, col, codes, values):
+    """Bentuk tampilan per nilai kamus: diambil dari kolom tampilan yang sudah ada, sisanya dihitung"""
+    labels = np.full(len(values), None, dtype=object)
+    display = DISPLAY_COLUMNS[col]
+    if display in df.columns:
+        present = codes >= 0
+        labels[codes[present]] = df[display].to_numpy(dtype=object)[present]
+    missing = np.flatnonzero(pd.isna(labels))
+    if len(missing):
+        labels[missing] = display_values(values[missing])
+    return labels.astype(str)
+
+def write_snapshot(csv_path, df, manifest):
+    """Menulis kolom USED_COLUMNS dari DataFrame yang sudah dimuat sebagai snapshot baru.
+
+    Dipakai setelah update delta: format sama dengan hasil ingest_csv,
+    `manifest` (source, encoding, dan info tambahan) dilengkapi daftar kolom
+    dan jumlah baris. Snapshot ditulis ke folder sementara lalu menggantikan
+    snapshot lama; proses yang sudah memetakan file lama tetap membaca versi lama.
+    """
+    target = snapshot_dir(csv_path)
+    tmp = target + '.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    columns = []
+    for col in [c for c in df.columns if c in USED_COLUMNS]:
+        series = df[col]
+        entry = {'name': col}
+        if col in CATEGORICAL_COLUMNS:
+            values = np.asarray(series.cat.categories, dtype=object).astype(str)
+            codes = series.cat.codes.to_numpy().astype(np.min_scalar_type(-max(len(values), 1)))
+            entry['kind'] = 'category'
+        elif col in INGEST_DTYPES or pd.api.types.is_numeric_dtype(series):
+            np.save(os.path.join(tmp, col + '.npy'), series.to_numpy())
+            columns.append(dict(entry, kind='numeric'))
+            continue
+        else:
+            codes, values = pd.factorize(series)
+            values = np.asarray(values, dtype=object).astype(str)
+            codes = codes.astype(np.int32)
+            entry['kind'] = 'string'
+        np.save(os.path.join(tmp, col + '.codes.npy'), codes)
+        np.save(os.path.join(tmp, col + '.values.npy'), values)
+        if col in DISPLAY_COLUMNS:
+            np.save(os.path.join(tmp, col + '.display.npy'), snapshot_labels(df, col, codes, values))
+            entry['display'] = DISPLAY_COLUMNS[col]
+        columns.append(entry)
+    manifest = dict(manifest, version=SNAPSHOT_VERSION, rows=len(df), columns=columns)
+    with open(os.path.join(tmp, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+
+def read_manifest(csv_path):
+    """Membaca manifest snapshot, atau None jika tidak ada/rusak"""
+    path = os.path.join(snapshot_dir(csv_path), MANIFEST_NAME)
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != SNAPSHOT_VERSION:
+        return None
+    return manifest
+
+def snapshot_is_fresh(csv_path, manifest):
+    """Cek apakah snapshot masih sesuai dengan CSV sumber"""
+    source = manifest['source']
+    current = file_signature(csv_path, with_hash=False)
+    if current['size'] != source['size']:
+        return False
+    if current['mtime_ns'] == source['mtime_ns']:
+        return True
+    # mtime berubah (misal file disalin ulang): bandingkan isi lewat hash
+    if file_hash(csv_path) != source['sha1']:
+        return False
+    source['mtime_ns'] = current['mtime_ns']
+    path = os.path.join(snapshot_dir(csv_path), MANIFEST_NAME)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return True
+
+def combined_signature(source_hash, delta_hashes):
+    """Hash CSV sumber digabung hash delta di atasnya (tanpa delta: hash CSV itu sendiri)"""
+    if not delta_hashes:
+        return source_hash
+    return hashlib.sha1('\n'.join([source_hash] + list(delta_hashes)).encode('ascii')).hexdigest()
+
+def data_signature(csv_path):
+    """Sidik data efektif: isi CSV sumber beserta delta yang diterapkan.
+
+    Diambil dari manifest jika snapshot masih valid; jika tidak, snapshot
+    akan dibangun ulang dari CSV lalu log delta diterapkan ulang, jadi
+    sidiknya dihitung dari CSV dan log tersebut.
+    """
+    manifest = read_manifest(csv_path)
+    if manifest is not None and snapshot_is_fresh(csv_path, manifest):
+        source, deltas = manifest['source']['sha1'], manifest.get('deltas', [])
+    else:
+        source, deltas = file_hash(csv_path), read_delta_log(csv_path)
+    return combined_signature(source, [entry['sha1'] for entry in deltas])
+
+def load_snapshot(csv_path, manifest, mmap=True, columns=None):
+    """Memuat snapshot; kolom numerik di-memory-map tanpa disalin.
+
+    Jika `columns` diisi, hanya kolom tersebut yang dibuka.
+    """
+    folder = snapshot_dir(csv_path)
+    mmap_mode = 'r' if mmap else None
+    data = {}
+    for column in manifest['columns']:
+        col = column['name']
+        display = column.get('display')
+        if columns is not None and col not in columns and display not in columns:
+            continue
+        if column['kind'] == 'numeric':
+            data[col] = np.load(os.path.join(folder, col + '.npy'), mmap_mode=mmap_mode)
+        elif column['kind'] == 'category':
+            codes = np.load(os.path.join(folder, col + '.codes.npy'))
+            values = np.load(os.path.join(folder, col + '.values.npy')).astype(object)
+            data[col] = pd.Categorical.from_codes(codes, categories=values)
+        else:
+            codes = np.load(os.path.join(folder, col + '.codes.npy'), mmap_mode=mmap_mode)
+            values = np.load(os.path.join(folder, col + '.values.npy')).astype(object)
+            # Kode -1 (NaN) mengambil elemen NaN terakhir
+            data[col] = np.append(values, np.nan)[codes]
+        if display and (columns is None or display in columns):
+            # Bentuk tampilan memakai kode yang sama dengan kolom asal
+            labels = np.load(os.path.join(folder, col + '.display.npy')).astype(object)
+            data[display] = np.append(labels, np.nan)[codes]
+    if columns is not None:
+        data = {col: data[col] for col in columns if col in data}
+    return pd.DataFrame(data, copy=False)
+
+def build_snapshot(csv_path, memory_limit=DEFAULT_MEMORY_LIMIT):
+    """Membangun snapshot dari CSV lalu menerapkan ulang log delta; mengembalikan jumlah baris"""
+    with profile.stage('ingest csv') as stage:
+        rows = stage.rows_out = ingest_csv(csv_path, file_signature(csv_path), memory_limit)
+    if read_delta_log(csv_path):
+        # Diimpor di sini karena player_delta sendiri memakai modul ini
+        from player_delta import replay_delta_log
+        with profile.stage('replay deltas', rows) as stage:
+            rows = stage.rows_out = replay_delta_log(csv_path)
+    return rows
+
+def read_players(csv_path, use_snapshot=True, memory_limit=DEFAULT_MEMORY_LIMIT):
+    """Memuat data pemain dari snapshot jika masih valid, jika tidak dari CSV.
+
+    CSV baru di-ingest per chunk ke snapshot lalu dimuat lewat memory-map.
+    Mengembalikan (df, from_snapshot).
+    """
+    if use_snapshot:
+        manifest = read_manifest(csv_path)
+        if manifest is not None and snapshot_is_fresh(csv_path, manifest):
+            with profile.stage('load snapshot') as stage:
+                df = load_snapshot(csv_path, manifest)
+                stage.rows_out = len(df)
+            return df, True
+        try:
+            build_snapshot(csv_path, memory_limit)
+            with profile.stage('load snapshot') as stage:
+                df = load_snapshot(csv_path, read_manifest(csv_path))
+                stage.rows_out = len(df)
+            return df, False
+        except OSError as e:
+            if not os.path.exists(csv_path):
+                raise
+            print('[INFO] Snapshot tidak dapat disimpan:', e)
+    if use_snapshot and read_delta_log(csv_path):
+        print('[INFO] Tanpa snapshot, delta di', delta_log_dir(csv_path), 'tidak ikut dimuat')
+    with profile.stage('read csv') as stage:
+        df = read_csv_columns(csv_path)
+        stage.rows_out = len(df)
+    return df, False
+
+def read_columns(csv_path, columns):
+    """Memuat sebagian kolom saja (tanpa kolom turunan), lewat snapshot jika ada"""
+    manifest = read_manifest(csv_path)
+    if manifest is not None and snapshot_is_fresh(csv_path, manifest):
+        return load_snapshot(csv_path, manifest, columns=columns)
+    df, _ = read_players(csv_path)
+    return df[[col for col in columns if col in df.columns]]
+
+def detect_encoding(csv_path):
+    """Encoding file CSV: 'utf-8' jika seluruh isi valid UTF-8, jika tidak 'latin-1'"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with open(csv_path, 'rb') as f:
+        first = f.read(HASH_BLOCK_SIZE)
+        encoding = 'utf-8-sig' if first.startswith(codecs.BOM_UTF8) else 'utf-8'
+        try:
+            decoder.decode(first)
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                decoder.decode(block)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            return 'latin-1'
+    return encoding
+
+def repair_encoding(s):
+    """Memperbaiki teks UTF-8 yang terbaca sebagai latin-1"""
+    try:
+        return s.encode('latin-1').decode('utf-8')
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return s
+
+def repair_values(values):
+    """Perbaikan mojibake sekali per nilai unik; teks ASCII dilewati"""
+    return np.array([v if v.isascii() else repair_encoding(v) for v in values], dtype=object)
+
+def display_values(values):
+    """Bentuk tampilan ASCII untuk nilai unik (accent dihapus, kapitalisasi tetap)"""
+    return (pd.Series(list(values), dtype=object)
+            .str.normalize('NFKD')
+            .str.replace(COMBINING_MARKS, '', regex=True)
+            .str.translate(ASCII_REPLACEMENTS)
+            .str.encode('ascii', 'replace')
+            .str.decode('ascii')
+            .to_numpy(dtype=object))
+
+def fold_values(values):
+    """Normalisasi sekumpulan nilai unik: hapus accent, huruf kecil"""
+    return (pd.Series([str(v) for v in values], dtype=object)
+            .str.normalize('NFD')
+            .str.replace(COMBINING_MARKS, '', regex=True)
+            .str.translate(ASCII_REPLACEMENTS)
+            .str.lower()
+            .to_numpy(dtype=object))
+
+def fold_text(s):
+    """Normalisasi satu teks input dengan aturan yang sama seperti kolom"""
+    return fold_values([s])[0]
+
+def map_unique(series, func):
+    """Menerapkan func pada nilai unik kolom saja, lalu memetakan balik ke setiap baris"""
+    codes, uniques = pd.factorize(series)
+    mapped = np.append(func(list(uniques)), np.nan)
+    # Kode -1 (NaN) mengambil elemen NaN terakhir
+    return pd.Series(mapped[codes], index=series.index, dtype=object)
+
+def fold_column(series):
+    """Normalisasi satu kolom; setiap nilai unik hanya diproses sekali"""
+    return map_unique(series, fold_values)
+
+def add_normalized_columns(df):
+    """Membuat kolom teks ternormalisasi sekali untuk dipakai ulang oleh semua pencarian"""
+    for source, target in NORMALIZED_COLUMNS.items():
+        if source in df.columns:
+            df[target] = fold_column(df[source])
+    return df
+
+def add_display_columns(df):
+    """Membuat kolom tampilan ASCII yang belum ada (snapshot sudah menyimpannya)"""
+    for source, target in DISPLAY_COLUMNS.items():
+        if source in df.columns and target not in df.columns:
+            df[target] = map_unique(df[source], display_values)
+    return df
+
+def add_position_columns(df):
+    """Mem-parse player_positions sekali menjadi kolom bitmask posisi"""
+    df['position_mask'], df['primary_position_mask'] = parse_positions(df['player_positions'])
+    return df
+
+def derived_values(column, series):
+    """Kolom turunan dari satu kolom asal ({nama kolom turunan: nilai}), aturan sama dengan add_derived_columns"""
+    result = {}
+    if column in NORMALIZED_COLUMNS:
+        result[NORMALIZED_COLUMNS[column]] = fold_column(series).to_numpy()
+    if column in DISPLAY_COLUMNS:
+        result[DISPLAY_COLUMNS[column]] = map_unique(series, display_values).to_numpy()
+    if column == 'player_positions':
+        result['position_mask'], result['primary_position_mask'] = parse_positions(series)
+    return result
+
+def add_derived_columns(df):
+    """Membuat semua kolom turunan yang dipakai pencarian"""
+    with profile.stage('normalize', len(df)):
+        add_normalized_columns(df)
+        add_display_columns(df)
+    with profile.stage('position masks', len(df)):
+        add_position_columns(df)
+    return df
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Membangun snapshot kolumnar dari CSV pemain')
+    parser.add_argument('csv', nargs='?', default=DEFAULT_CSV_PATH, help='Lokasi file CSV')
+    parser.add_argument('--memory-mb', type=int, default=DEFAULT_MEMORY_LIMIT >> 20,
+                        help='Batas memori per chunk saat ingest (MB)')
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    try:
+        rows = build_snapshot(args.csv, args.memory_mb << 20)
+    except FileNotFoundError:
+        print('[ERROR] File tidak ditemukan di', args.csv)
+        return 1
+    elapsed = time.perf_counter() - start
+    print(f'[OK] {rows} baris disimpan ke {snapshot_dir(args.csv)} dalam {elapsed:.2f} detik')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,54 +1,134 @@
 # -*- coding: utf-8 -*-
-import pandas as pd
-import os
-import unicodedata
-
-def normalize_string(s):
-    """Menghapus accent dari string untuk mempermudah pencarian"""
-    if pd.isna(s):
-        return s
-    try:
-        # Coba normalisasi dengan UTF-8
-        s = str(s).encode('latin-1').decode('utf-8')
-        s = unicodedata.normalize('NFD', s)
-        return ''.join(c for c in s if unicodedata.category(c) != 'Mn')
-    except:
-        # Fallback: hapus karakter khusus secara manual
-        s = str(s)
-        replacements = {
-            'é': 'e', 'è': 'e', 'ê': 'e', 'ë': 'e',
-            'á': 'a', 'à': 'a', 'â': 'a', 'ã': 'a', 'ä': 'a',
-            'í': 'i', 'ì': 'i', 'î': 'i', 'ï': 'i',
-            'ó': 'o', 'ò': 'o', 'ô': 'o', 'õ': 'o', 'ö': 'o',
-            'ú': 'u', 'ù': 'u', 'û': 'u', 'ü': 'u',
-            'ç': 'c', 'ñ': 'n', 'ß': 's'
-        }
-        for old, new in replacements.items():
-            s = s.replace(old, new).replace(old.upper(), new.upper())
-        return s
-
-def display_safe(s):
-    """Menampilkan string yang sudah dinormalisasi (tanpa accent) untuk Windows console"""
-    if pd.isna(s):
-        return str(s)
-    # Tampilkan versi yang sudah dinormalisasi untuk konsistensi
-    return normalize_string(s)
-
-def load_data():
-    """Memuat data pemain dari file CSV"""
-    csv_path = os.path.join(os.path.dirname(__file__), '..', 'csv_files', 'fifa_players.csv')
+"""Pencarian interaktif data pemain FIFA.
+
+Menu langsung tampil sementara dataset dimuat di thread latar. Argumen
+query (--name, --club, --top, ...) menjalankan satu pencarian lalu
+selesai tanpa menu.
+
+Contoh:
+    python search_players.py
+    python search_players.py --name silva --top 10
+    python search_players.py --league "English Premier League" --age 16 21 --by potential --table
+"""
+import argparse
+import sys
+import threading
+
+# Hanya modul ringan di level atas: pandas, indeks, dan render diimpor di
+# dalam fungsi yang memakainya agar menu pertama tidak menunggu pandas
+import player_profile as profile
+
+# Argumen command line yang menjadi kunci spesifikasi query (format mode batch)
+QUERY_ARGS = ('name', 'club', 'league', 'country', 'positions', 'potential', 'age', 'overall')
+ONE_SHOT_TOP = 10
+
+def choose_positions(dataset, row_ids):
+    """Menampilkan daftar posisi dan meminta pilihan posisi serta mode.
+
+    Mengembalikan (daftar posisi, mode) atau None jika input tidak valid.
+    """
+    from player_index import positions_in
+
+    positions_list = sorted(positions_in(dataset.column('position_mask')[row_ids]))
+    
+    print('\nDaftar Posisi:')
+    for i, pos in enumerate(positions_list, 1):
+        print(f'{i}. {pos}')
+    
     try:
-        df = pd.read_csv(csv_path, low_memory=False, encoding='latin-1')
-        print('[OK] Data berhasil dimuat:', len(df), 'pemain ditemukan')
-        return df
-    except FileNotFoundError:
-        print('[ERROR] File tidak ditemukan di', csv_path)
+        choices = input('\nPilih nomor posisi (pisahkan dengan koma untuk beberapa posisi): ').strip()
+        numbers = [int(c) for c in choices.split(',') if c.strip()]
+    except ValueError:
+        print('[X] Masukkan angka!')
         return None
-    except Exception as e:
-        print('[ERROR] Error saat memuat data:', e)
+    if not numbers or not all(1 <= n <= len(positions_list) for n in numbers):
+        print('[X] Pilihan tidak valid!')
         return None
+    positions = [positions_list[n - 1] for n in dict.fromkeys(numbers)]
+    
+    print('\nMode pencocokan posisi:')
+    print('1. Bermain di salah satu posisi (default)')
+    print('2. Bermain di semua posisi yang dipilih')
+    print('3. Hanya posisi utama')
+    mode_choice = input('Pilih mode (1-3, Enter = 1): ').strip() or '1'
+    modes = {'1': 'any', '2': 'all', '3': 'primary'}
+    if mode_choice not in modes:
+        print('[X] Pilihan tidak valid!')
+        return None
+    return positions, modes[mode_choice]
+
+class DataLoader:
+    """Memuat data pemain (beserta indeks pencarian), opsional di thread latar.
+
+    Di thread latar data ditandai siap segera setelah dibaca; indeks lalu
+    dibangun di thread yang sama sementara menu sudah bisa dipakai. Status
+    dicetak sekali oleh wait() di thread utama, sehingga tidak menyela menu
+    atau input yang sedang ditampilkan.
+    """
 
-def search_by_name(df):
+    def __init__(self, csv_path=None, background=True, lazy_indexes=False):
+        self.csv_path = csv_path
+        self.dataset = None
+        self.error = None
+        self._reported = False
+        self._ready = threading.Event()
+        if background:
+            thread = threading.Thread(target=self._load, args=(True, True), name='load-data', daemon=True)
+            thread.start()
+        else:
+            self._load(lazy_indexes, False)
+
+    def _load(self, lazy_indexes, warm):
+        try:
+            from player_query import load_dataset
+            from player_store import DEFAULT_CSV_PATH
+
+            self.csv_path = self.csv_path or DEFAULT_CSV_PATH
+            self.dataset = load_dataset(self.csv_path, lazy_indexes=lazy_indexes)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._ready.set()
+        if warm and self.dataset is not None:
+            try:
+                self.dataset.indexes.warm()
+            except Exception:
+                # Indeks yang gagal dibangun di sini dicoba lagi (dan errornya
+                # terlihat) saat pertama dipakai oleh query
+                pass
+
+    def wait(self):
+        """Dataset setelah selesai dimuat, atau None jika gagal"""
+        if not self._ready.is_set():
+            print('\n[INFO] Data masih dimuat, mohon tunggu...')
+            self._ready.wait()
+        if not self._reported:
+            self._reported = True
+            if self.dataset is not None:
+                source = 'snapshot' if self.dataset.from_snapshot else 'CSV'
+                print('[OK] Data berhasil dimuat dari', source + ':', len(self.dataset), 'pemain ditemukan')
+            elif isinstance(self.error, FileNotFoundError):
+                print('[ERROR] File tidak ditemukan di', self.csv_path)
+            else:
+                print('[ERROR] Error saat memuat data:', self.error)
+        return self.dataset
+
+def load_data(csv_path=None, lazy_indexes=False):
+    """Memuat data pemain (beserta indeks pencarian) dari file CSV"""
+    return DataLoader(csv_path, background=False, lazy_indexes=lazy_indexes).wait()
+
+def offer_filter(dataset, query, disabled_options):
+    """Menawarkan filter lanjutan lalu menampilkan hasil akhir"""
+    filter_choice = input('\nApakah Anda ingin menambahkan filter? (y/n): ').strip().lower()
+    
+    if filter_choice == 'y':
+        final_query = apply_filter(dataset, query, disabled_options=disabled_options)
+        print('\n' + '='*60)
+        print('HASIL AKHIR')
+        print('='*60)
+        display_results(final_query, limit=20)
+
+def search_by_name(dataset):
     """Mencari pemain berdasarkan nama"""
     print('\n' + '='*60)
     print('PENCARIAN PEMAIN BERDASARKAN NAMA')
@@ -58,45 +138,130 @@ def search_by_name(df):
         print('[X] Nama tidak boleh kosong!')
         return
     
-    # Normalize input dan nama pemain
-    normalized_name = normalize_string(name.lower())
-    df['normalized_name'] = df['long_name'].apply(normalize_string)
-    results = df[df['normalized_name'].str.contains(normalized_name, case=False, na=False)]
+    # Nama dinormalisasi lalu dicari lewat indeks trigram (nama lengkap & pendek)
+    query = dataset.query().name(name)
+    total = query.count()
     
-    if len(results) == 0:
+    if total == 0:
         print('\n[X] Tidak ada pemain dengan nama', name, 'ditemukan')
         return
     
-    print('\n[OK] Ditemukan', len(results), 'pemain')
+    print('\n[OK] Ditemukan', total, 'pemain')
     
     # Tampilkan hasil awal dan tanya apakah ingin filter lanjutan
-    display_results(results, limit=10)
+    display_results(query, limit=10)
     
-    if len(results) > 10:
+    if total > 10:
         print('\n[TIP] Gunakan filter untuk memperkecil hasil pencarian')
     
-    filter_choice = input('\nApakah Anda ingin menambahkan filter? (y/n): ').strip().lower()
+    offer_filter(dataset, query, {'name'})
+
+def search_by_name_fuzzy(dataset):
+    """Mencari pemain berdasarkan nama dengan toleransi salah ketik"""
+    print('\n' + '='*60)
+    print('PENCARIAN NAMA (TOLERAN SALAH KETIK)')
+    print('='*60)
+    name = input('\nMasukkan nama pemain yang dicari: ').strip()
+    if not name:
+        print('[X] Nama tidak boleh kosong!')
+        return
+    
+    try:
+        threshold = input('Minimal kemiripan 0-1 (Enter = 0.5): ').strip()
+        threshold = float(threshold) if threshold else 0.5
+        max_edits = input('Maksimal salah ketik (Enter = tanpa batas): ').strip()
+        max_edits = int(max_edits) if max_edits else None
+    except ValueError:
+        print('[X] Input tidak valid! Masukkan angka saja.')
+        return
+    
+    from player_render import format_blocks
+    from player_store import fold_text
+
+    with profile.stage('fuzzy', len(dataset)) as stage:
+        row_ids, scores = dataset.indexes.names.fuzzy(fold_text(name), threshold=threshold,
+                                                      limit=20, max_edits=max_edits)
+        stage.rows_out = len(row_ids)
+    if len(row_ids) == 0:
+        print('\n[X] Tidak ada pemain yang mirip dengan', name)
+        return
+    
+    print('\n[OK] Ditemukan', len(row_ids), 'pemain yang mirip (urut berdasarkan kemiripan)')
+    with profile.stage('render', len(row_ids)):
+        print(format_blocks(dataset, row_ids, [f' (kemiripan {score:.2f})' for score in scores]))
+    
+    offer_filter(dataset, dataset.query().within(row_ids), {'name'})
+
+def search_similar(dataset):
+    """Mencari pemain yang atribut skill-nya mirip dengan satu pemain"""
+    print('\n' + '='*60)
+    print('PENCARIAN PEMAIN MIRIP')
+    print('='*60)
+    name = input('\nMasukkan nama pemain acuan: ').strip()
+    if not name:
+        print('[X] Nama tidak boleh kosong!')
+        return
+    
+    from player_render import format_blocks, format_table
+    from player_similar import similarity_index
+
+    matches = dataset.query().name(name).top(10).row_ids()
+    if len(matches) == 0:
+        print('\n[X] Tidak ada pemain dengan nama', name, 'ditemukan')
+        return
+    print('\nPilih pemain acuan:')
+    print(format_table(dataset, matches))
+    
+    try:
+        choice = int(input('\nPilih nomor pemain: ').strip())
+        if not 1 <= choice <= len(matches):
+            print('[X] Pilihan tidak valid!')
+            return
+        k = input('Jumlah pemain mirip (Enter = 10): ').strip()
+        k = int(k) if k else 10
+    except ValueError:
+        print('[X] Masukkan angka!')
+        return
+    if k <= 0:
+        print('[X] Jumlah harus lebih dari 0!')
+        return
+    row = matches[choice - 1]
     
+    # Filter opsional (misal lebih muda atau dari negara tertentu)
+    candidates = None
+    filter_choice = input('\nApakah Anda ingin membatasi kandidat dengan filter? (y/n): ').strip().lower()
     if filter_choice == 'y':
-        final_results = apply_filter(df, results, disabled_options={'name'})
-        print('\n' + '='*60)
-        print('HASIL AKHIR')
-        print('='*60)
-        display_results(final_results, limit=20)
+        query = apply_filter(dataset, dataset.query())
+        if query.predicates:
+            candidates = query.row_ids()
+    
+    with profile.stage('similar', len(dataset) if candidates is None else len(candidates)) as stage:
+        rows, distances = similarity_index(dataset).nearest(row, k, candidates)
+        stage.rows_out = len(rows)
+    if len(rows) == 0:
+        print('\n[X] Tidak ada kandidat yang cocok dengan filter')
+        return
+    
+    print('\n[OK]', len(rows), 'pemain paling mirip dengan', dataset.column('display_name')[row],
+          '(urut dari jarak atribut terkecil)')
+    with profile.stage('render', len(rows)):
+        print(format_blocks(dataset, rows, [f' (jarak {d:.2f})' for d in distances]))
 
-def search_by_club(df):
+def search_by_club(dataset):
     """Mencari pemain berdasarkan klub"""
     print('\n' + '='*60)
     print('PENCARIAN PEMAIN BERDASARKAN KLUB')
     print('='*60)
     
-    # Tampilkan daftar liga
-    leagues = df['league_name'].dropna().unique()
-    leagues = sorted(leagues)
+    # Tampilkan daftar liga (sudah terurut di indeks hierarki)
+    hierarchy = dataset.indexes.hierarchy
+    leagues = hierarchy.league_names()
+    league_labels = dataset.labels('league_name')
+    club_labels = dataset.labels('club_name')
     
     print('\nDaftar Liga:')
     for i, league in enumerate(leagues, 1):
-        print(f'{i}. {display_safe(league)}')
+        print(f'{i}. {league_labels[league]}')
     
     try:
         league_choice = int(input('\nPilih nomor liga (atau 0 untuk skip): ').strip())
@@ -109,12 +274,11 @@ def search_by_club(df):
             league = leagues[league_choice - 1]
             
             # Tampilkan klub dari liga tersebut
-            clubs_in_league = df[df['league_name'] == league]['club_name'].dropna().unique()
-            clubs_in_league = sorted(clubs_in_league)
+            clubs_in_league = hierarchy.clubs_in(league)
             
-            print(f'\nDaftar Klub di {display_safe(league)}:')
+            print(f'\nDaftar Klub di {league_labels[league]}:')
             for i, club_name in enumerate(clubs_in_league, 1):
-                print(f'{i}. {display_safe(club_name)}')
+                print(f'{i}. {club_labels[club_name]}')
             
             club_choice = int(input('\nPilih nomor klub: ').strip())
             if 1 <= club_choice <= len(clubs_in_league):
@@ -129,37 +293,31 @@ def search_by_club(df):
         print('[X] Masukkan angka!')
         return
     
-    # Cari langsung dengan nama klub yang dipilih (exact match)
-    results = df[df['club_name'] == club]
+    # Baris klub diambil langsung dari indeks (exact match)
+    query = dataset.query().club(club)
+    total = query.count()
     
-    if len(results) == 0:
-        print('\n[X] Tidak ada pemain dari klub', display_safe(club), 'ditemukan')
+    if total == 0:
+        print('\n[X] Tidak ada pemain dari klub', club_labels.get(club, club), 'ditemukan')
         return
     
-    print('\n[OK] Ditemukan', len(results), 'pemain dari klub', display_safe(club))
-    display_results(results, limit=10)
+    print('\n[OK] Ditemukan', total, 'pemain dari klub', club_labels.get(club, club))
+    display_results(query, limit=10)
     
-    filter_choice = input('\nApakah Anda ingin menambahkan filter? (y/n): ').strip().lower()
-    
-    if filter_choice == 'y':
-        final_results = apply_filter(df, results, disabled_options={'club'})
-        print('\n' + '='*60)
-        print('HASIL AKHIR')
-        print('='*60)
-        display_results(final_results, limit=20)
+    offer_filter(dataset, query, {'club'})
 
-def search_by_country(df):
+def search_by_country(dataset):
     """Mencari pemain berdasarkan negara"""
     print('\n' + '='*60)
     print('PENCARIAN PEMAIN BERDASARKAN NEGARA')
     print('='*60)
-    # Tampilkan daftar negara
-    countries = df['nationality_name'].dropna().unique()
-    countries = sorted(countries)
+    # Tampilkan daftar negara (sudah terurut di indeks)
+    countries = dataset.indexes.nations.labels()
+    country_labels = dataset.labels('nationality_name')
     
     print('\nDaftar Negara:')
     for i, country_name in enumerate(countries, 1):
-        print(f'{i}. {display_safe(country_name)}')
+        print(f'{i}. {country_labels[country_name]}')
     
     try:
         country_choice = int(input('\nPilih nomor negara: ').strip())
@@ -172,36 +330,29 @@ def search_by_country(df):
         print('[X] Masukkan angka!')
         return
     
-    # Normalize input dan nama negara
-    normalized_country = normalize_string(country.lower())
-    df['normalized_country'] = df['nationality_name'].apply(normalize_string)
-    results = df[df['normalized_country'].str.contains(normalized_country, case=False, na=False)]
+    # Baris negara diambil langsung dari indeks (exact match)
+    query = dataset.query().country(country)
+    total = query.count()
     
-    if len(results) == 0:
+    if total == 0:
         print('\n[X] Tidak ada pemain dari negara', country, 'ditemukan')
         return
     
-    print('\n[OK] Ditemukan', len(results), 'pemain dari negara', display_safe(country))
-    display_results(results, limit=10)
+    print('\n[OK] Ditemukan', total, 'pemain dari negara', country_labels[country])
+    display_results(query, limit=10)
     
-    filter_choice = input('\nApakah Anda ingin menambahkan filter? (y/n): ').strip().lower()
-    
-    if filter_choice == 'y':
-        final_results = apply_filter(df, results, disabled_options={'country'})
-        print('\n' + '='*60)
-        print('HASIL AKHIR')
-        print('='*60)
-        display_results(final_results, limit=20)
+    offer_filter(dataset, query, {'country'})
 
-def search_by_potential(df):
+def search_by_potential(dataset):
     """Mencari pemain berdasarkan range potensi"""
     print('\n' + '='*60)
     print('PENCARIAN PEMAIN BERDASARKAN POTENSI')
     print('='*60)
     
-    # Tampilkan range terendah dan tertinggi
-    min_pot_data = int(df['potential'].min())
-    max_pot_data = int(df['potential'].max())
+    # Tampilkan range terendah dan tertinggi (ujung indeks range)
+    potential_index = dataset.indexes.ranges['potential']
+    min_pot_data = int(potential_index.min())
+    max_pot_data = int(potential_index.max())
     
     print(f'\nPotensi:')
     print(f'[Paling rendah: {min_pot_data}]')
@@ -218,40 +369,31 @@ def search_by_potential(df):
             print('[X] Range tidak valid! Pastikan 0 <= minimum <= maksimum <= 100')
             return
         
-        results = df[(df['potential'] >= min_pot) & (df['potential'] <= max_pot)]
-        results_sorted = results.sort_values('potential', ascending=False).head(20)
+        # Jumlah dari searchsorted; hasil diurutkan sekali untuk semua halaman
+        query = dataset.query().potential(min_pot, max_pot)
+        total = query.count()
         
-        if len(results) == 0:
+        if total == 0:
             print('\n[X] Tidak ada pemain dengan potensi', min_pot, '-', max_pot)
         else:
-            print('\n[OK] Ditemukan', len(results), 'pemain dengan potensi', min_pot, '-', max_pot, ':')
-            print('\n' + '-'*60)
-            for idx, row in results_sorted.iterrows():
-                print('\nNama:', display_safe(row['long_name']))
-                print('Usia:', row['age'], 'tahun')
-                print('Posisi:', display_safe(row['player_positions']))
-                print('Overall:', row['overall'], '| Potential:', row['potential'])
-                print('Klub:', display_safe(row['club_name']))
-                print('Negara:', display_safe(row['nationality_name']))
-                print('-'*60)
-            
-            if len(results) > 20:
-                print('\n... dan', len(results) - 20, 'pemain lainnya (menampilkan 20 teratas)')
+            print('\n[OK] Ditemukan', total, 'pemain dengan potensi', min_pot, '-', max_pot, ':')
+            display_results(query, by='potential')
                 
     except ValueError:
         print('[X] Input tidak valid! Masukkan angka saja.')
     except Exception as e:
         print('[ERROR] Error:', str(e))
 
-def search_by_age(df):
+def search_by_age(dataset):
     """Mencari pemain berdasarkan range umur"""
     print('\n' + '='*60)
     print('PENCARIAN PEMAIN BERDASARKAN UMUR')
     print('='*60)
     
-    # Tampilkan range terendah dan tertinggi
-    min_age_data = int(df['age'].min())
-    max_age_data = int(df['age'].max())
+    # Tampilkan range terendah dan tertinggi (ujung indeks range)
+    age_index = dataset.indexes.ranges['age']
+    min_age_data = int(age_index.min())
+    max_age_data = int(age_index.max())
     
     print(f'\nUmur:')
     print(f'[Paling rendah: {min_age_data}]')
@@ -268,84 +410,42 @@ def search_by_age(df):
             print('[X] Range tidak valid! Pastikan 15 <= minimum <= maksimum <= 60')
             return
         
-        results = df[(df['age'] >= min_a) & (df['age'] <= max_a)]
-        results_sorted = results.sort_values('overall', ascending=False).head(20)
+        # Jumlah dari indeks umur; hasil diurutkan sekali menurut overall
+        query = dataset.query().age(min_a, max_a)
+        total = query.count()
         
-        if len(results) == 0:
+        if total == 0:
             print('\n[X] Tidak ada pemain berumur', min_a, '-', max_a, 'tahun')
         else:
-            print('\n[OK] Ditemukan', len(results), 'pemain berumur', min_a, '-', max_a, 'tahun:')
-            print('\n' + '-'*60)
-            for idx, row in results_sorted.iterrows():
-                print('\nNama:', display_safe(row['long_name']))
-                print('Usia:', row['age'], 'tahun')
-                print('Posisi:', display_safe(row['player_positions']))
-                print('Overall:', row['overall'], '| Potential:', row['potential'])
-                print('Klub:', display_safe(row['club_name']))
-                print('Negara:', display_safe(row['nationality_name']))
-                print('-'*60)
-            
-            if len(results) > 20:
-                print('\n... dan', len(results) - 20, 'pemain lainnya (menampilkan 20 teratas)')
+            print('\n[OK] Ditemukan', total, 'pemain berumur', min_a, '-', max_a, 'tahun:')
+            display_results(query)
                 
     except ValueError:
         print('[X] Input tidak valid! Masukkan angka saja.')
     except Exception as e:
         print('[ERROR] Error:', str(e))
 
-def search_by_position(df):
+def search_by_position(dataset):
     """Mencari pemain berdasarkan posisi"""
     print('\n' + '='*60)
     print('PENCARIAN PEMAIN BERDASARKAN POSISI')
     print('='*60)
     
-    # Tampilkan daftar posisi
-    # Ambil semua posisi dari data dan unikkan
-    all_positions = set()
-    for pos in df['player_positions'].dropna():
-        # Pisahkan jika ada multiple posisi (dipisahkan koma)
-        for p in str(pos).split(','):
-            all_positions.add(p.strip())
-    
-    positions_list = sorted(list(all_positions))
-    
-    print('\nDaftar Posisi:')
-    for i, pos in enumerate(positions_list, 1):
-        print(f'{i}. {display_safe(pos)}')
-    
-    try:
-        pos_choice = int(input('\nPilih nomor posisi: ').strip())
-        if 1 <= pos_choice <= len(positions_list):
-            position = positions_list[pos_choice - 1]
-        else:
-            print('[X] Pilihan tidak valid!')
-            return
-    except ValueError:
-        print('[X] Masukkan angka!')
+    choice = choose_positions(dataset, slice(None))
+    if choice is None:
         return
+    positions, mode = choice
+    label = ' / '.join(positions)
     
-    # Normalize input
-    normalized_position = normalize_string(position.lower())
-    df['normalized_positions'] = df['player_positions'].apply(normalize_string)
-    results = df[df['normalized_positions'].str.contains(normalized_position, case=False, na=False)]
-    results_sorted = results.sort_values('overall', ascending=False).head(20)
+    # Satu operasi AND pada kolom bitmask, tanpa scan string
+    query = dataset.query().positions(positions, mode)
+    total = query.count()
     
-    if len(results) == 0:
-        print('\n[X] Tidak ada pemain dengan posisi', position)
+    if total == 0:
+        print('\n[X] Tidak ada pemain dengan posisi', label)
     else:
-        print('\n[OK] Ditemukan', len(results), 'pemain dengan posisi', display_safe(position), ':')
-        print('\n' + '-'*60)
-        for idx, row in results_sorted.iterrows():
-            print('\nNama:', display_safe(row['long_name']))
-            print('Usia:', row['age'], 'tahun')
-            print('Posisi:', display_safe(row['player_positions']))
-            print('Overall:', row['overall'], '| Potential:', row['potential'])
-            print('Klub:', display_safe(row['club_name']))
-            print('Negara:', display_safe(row['nationality_name']))
-            print('-'*60)
-        
-        if len(results) > 20:
-            print('\n... dan', len(results) - 20, 'pemain lainnya (menampilkan 20 teratas)')
+        print('\n[OK] Ditemukan', total, 'pemain dengan posisi', label, ':')
+        display_results(query)
 
 def show_filter_menu(disabled_options=None):
     if disabled_options is None:
@@ -368,23 +468,32 @@ def show_filter_menu(disabled_options=None):
     print('0. Kembali ke menu utama')
     print('='*60)
 
-def apply_filter(df, current_results, disabled_options=None):
+def apply_filter(dataset, current_query, disabled_options=None):
+    """Menambahkan filter ke query secara interaktif; mengembalikan query akhir.
+
+    Setiap filter hanya menambah predikat; data baru dievaluasi saat daftar
+    pilihan atau hasil perlu ditampilkan.
+    """
+    from player_index import present_categories
+
     if disabled_options is None:
         disabled_options = set()
-    results = current_results.copy()
+    query = current_query
+    league_labels = dataset.labels('league_name')
+    club_labels = dataset.labels('club_name')
+    country_labels = dataset.labels('nationality_name')
     while True:
         show_filter_menu(disabled_options)
         choice = input('\nPilih filter (1-6, atau 0 untuk kembali): ').strip()
         if choice == '0':
-            return results
+            return query
         elif choice == '1' and 'club' not in disabled_options:
             # Tampilkan daftar liga dari hasil saat ini
-            leagues = results['league_name'].dropna().unique()
-            leagues = sorted(leagues)
+            leagues = present_categories(dataset.df['league_name'].iloc[query.row_ids()])
             
             print('\nDaftar Liga:')
             for i, league in enumerate(leagues, 1):
-                print(f'{i}. {display_safe(league)}')
+                print(f'{i}. {league_labels[league]}')
             
             try:
                 league_choice = int(input('\nPilih nomor liga: ').strip())
@@ -392,19 +501,18 @@ def apply_filter(df, current_results, disabled_options=None):
                     league = leagues[league_choice - 1]
                     
                     # Tampilkan klub dari liga tersebut
-                    clubs_in_league = results[results['league_name'] == league]['club_name'].dropna().unique()
-                    clubs_in_league = sorted(clubs_in_league)
+                    league_rows = query.refine().league(league).row_ids()
+                    clubs_in_league = present_categories(dataset.df['club_name'].iloc[league_rows])
                     
-                    print(f'\nDaftar Klub di {display_safe(league)}:')
+                    print(f'\nDaftar Klub di {league_labels[league]}:')
                     for i, club_name in enumerate(clubs_in_league, 1):
-                        print(f'{i}. {display_safe(club_name)}')
+                        print(f'{i}. {club_labels[club_name]}')
                     
                     club_choice = int(input('\nPilih nomor klub: ').strip())
                     if 1 <= club_choice <= len(clubs_in_league):
                         club = clubs_in_league[club_choice - 1]
-                        # Gunakan exact match untuk menghindari masalah encoding
-                        results = results[results['club_name'] == club]
-                        print('[OK] Filter klub diterapkan. Sisa:', len(results), 'pemain')
+                        query = query.refine().club(club)
+                        print('[OK] Filter klub diterapkan. Sisa:', query.count(), 'pemain')
                         disabled_options.add('club')
                     else:
                         print('[X] Pilihan tidak valid!')
@@ -413,19 +521,16 @@ def apply_filter(df, current_results, disabled_options=None):
             except ValueError:
                 print('[X] Masukkan angka!')
         elif choice == '2' and 'country' not in disabled_options:
-            countries = results['nationality_name'].dropna().unique()
-            countries = sorted(countries)
+            countries = present_categories(dataset.df['nationality_name'].iloc[query.row_ids()])
             print('\nDaftar Negara:')
             for i, country_name in enumerate(countries, 1):
-                print(f'{i}. {display_safe(country_name)}')
+                print(f'{i}. {country_labels[country_name]}')
             try:
                 country_choice = int(input('\nPilih nomor negara: ').strip())
                 if 1 <= country_choice <= len(countries):
                     country = countries[country_choice - 1]
-                    normalized_country = normalize_string(country.lower())
-                    results['normalized_country'] = results['nationality_name'].apply(normalize_string)
-                    results = results[results['normalized_country'].str.contains(normalized_country, case=False, na=False)]
-                    print('[OK] Filter negara diterapkan. Sisa:', len(results), 'pemain')
+                    query = query.refine().country(country)
+                    print('[OK] Filter negara diterapkan. Sisa:', query.count(), 'pemain')
                     disabled_options.add('country')
                 else:
                     print('[X] Pilihan tidak valid!')
@@ -433,8 +538,9 @@ def apply_filter(df, current_results, disabled_options=None):
                 print('[X] Masukkan angka!')
         elif choice == '3' and 'potential' not in disabled_options:
             # Tampilkan range dari hasil saat ini
-            min_pot_data = int(results['potential'].min())
-            max_pot_data = int(results['potential'].max())
+            potentials = dataset.column('potential')[query.row_ids()]
+            min_pot_data = int(potentials.min())
+            max_pot_data = int(potentials.max())
             print(f'\nPotensi pada hasil saat ini:')
             print(f'[Paling rendah: {min_pot_data}]')
             print(f'[Paling tinggi: {max_pot_data}]')
@@ -443,8 +549,8 @@ def apply_filter(df, current_results, disabled_options=None):
                 min_pot = int(input('\nPotensi minimum: ').strip())
                 max_pot = int(input('Potensi maksimum: ').strip())
                 if 0 <= min_pot <= max_pot <= 100:
-                    results = results[(results['potential'] >= min_pot) & (results['potential'] <= max_pot)]
-                    print('[OK] Filter potensi diterapkan. Sisa:', len(results), 'pemain')
+                    query = query.refine().potential(min_pot, max_pot)
+                    print('[OK] Filter potensi diterapkan. Sisa:', query.count(), 'pemain')
                     disabled_options.add('potential')
                 else:
                     print('[X] Range tidak valid!')
@@ -452,8 +558,9 @@ def apply_filter(df, current_results, disabled_options=None):
                 print('[X] Input tidak valid!')
         elif choice == '4' and 'age' not in disabled_options:
             # Tampilkan range dari hasil saat ini
-            min_age_data = int(results['age'].min())
-            max_age_data = int(results['age'].max())
+            ages = dataset.column('age')[query.row_ids()]
+            min_age_data = int(ages.min())
+            max_age_data = int(ages.max())
             print(f'\nUmur pada hasil saat ini:')
             print(f'[Paling rendah: {min_age_data}]')
             print(f'[Paling tinggi: {max_age_data}]')
@@ -462,64 +569,272 @@ def apply_filter(df, current_results, disabled_options=None):
                 min_a = int(input('\nUmur minimum: ').strip())
                 max_a = int(input('Umur maksimum: ').strip())
                 if 15 <= min_a <= max_a <= 60:
-                    results = results[(results['age'] >= min_a) & (results['age'] <= max_a)]
-                    print('[OK] Filter umur diterapkan. Sisa:', len(results), 'pemain')
+                    query = query.refine().age(min_a, max_a)
+                    print('[OK] Filter umur diterapkan. Sisa:', query.count(), 'pemain')
                     disabled_options.add('age')
                 else:
                     print('[X] Range tidak valid!')
             except ValueError:
                 print('[X] Input tidak valid!')
         elif choice == '5' and 'position' not in disabled_options:
-            all_positions = set()
-            for pos in results['player_positions'].dropna():
-                for p in str(pos).split(','):
-                    all_positions.add(p.strip())
-            positions_list = sorted(list(all_positions))
-            print('\nDaftar Posisi:')
-            for i, pos in enumerate(positions_list, 1):
-                print(f'{i}. {display_safe(pos)}')
-            try:
-                pos_choice = int(input('\nPilih nomor posisi: ').strip())
-                if 1 <= pos_choice <= len(positions_list):
-                    position = positions_list[pos_choice - 1]
-                    normalized_position = normalize_string(position.lower())
-                    results['normalized_positions'] = results['player_positions'].apply(normalize_string)
-                    results = results[results['normalized_positions'].str.contains(normalized_position, case=False, na=False)]
-                    print('[OK] Filter posisi diterapkan. Sisa:', len(results), 'pemain')
-                    disabled_options.add('position')
-                else:
-                    print('[X] Pilihan tidak valid!')
-            except ValueError:
-                print('[X] Masukkan angka!')
+            position_choice = choose_positions(dataset, query.row_ids())
+            if position_choice is not None:
+                positions, mode = position_choice
+                query = query.refine().positions(positions, mode)
+                print('[OK] Filter posisi diterapkan. Sisa:', query.count(), 'pemain')
+                disabled_options.add('position')
         elif choice == '6':
-            display_results(results, limit=20)
-            input('\nTekan Enter untuk kembali ke menu filter...')
+            # display_results sudah diakhiri prompt "Enter = lanjut"
+            display_results(query, limit=20)
             continue
         else:
             print('[X] Pilihan tidak valid atau opsi sudah digunakan!')
-        print('\n[INFO] Hasil saat ini:', len(results), 'pemain')
-        if len(results) == 0:
+        print('\n[INFO] Hasil saat ini:', query.count(), 'pemain')
+        if query.count() == 0:
             print('[X] Tidak ada hasil setelah filter. Mengembalikan hasil sebelumnya.')
-            return current_results
+            return current_query
+
+def export_results(dataset, rows):
+    """Meminta nama file lalu mengekspor seluruh hasil (CSV/JSONL/Excel)"""
+    from player_render import export_rows
+
+    path = input('\nNama file ekspor (.csv, .jsonl, atau .xlsx): ').strip()
+    if not path:
+        print('[X] Nama file tidak boleh kosong!')
+        return
+    try:
+        count = export_rows(dataset, rows, path)
+        print('[OK]', count, 'pemain diekspor ke', path)
+    except ImportError:
+        print('[ERROR] Ekspor Excel membutuhkan openpyxl (pip install openpyxl)')
+    except (ValueError, OSError) as e:
+        print('[ERROR] Gagal mengekspor:', e)
+
+def display_results(query, limit=None, by='overall'):
+    """Menampilkan hasil query per halaman (urut `by` tertinggi).
 
-def display_results(results, limit=20):
-    """Menampilkan hasil pencarian"""
-    if len(results) == 0:
+    Hanya pemain sampai halaman yang dibuka yang diperingkat (top-k);
+    prefix terurut disimpan oleh ResultCursor dan diperpanjang saat pindah
+    ke halaman berikutnya.
+    """
+    from player_render import DEFAULT_PAGE_SIZE, ResultCursor, format_blocks, format_table
+
+    total = query.count()
+    if total == 0:
         print('[X] Tidak ada pemain ditemukan')
-    else:
-        results_sorted = results.sort_values('overall', ascending=False).head(limit)
-        print('\n' + '-'*60)
-        for idx, row in results_sorted.iterrows():
-            print('\nNama:', display_safe(row['long_name']))
-            print('Usia:', row['age'], 'tahun')
-            print('Posisi:', display_safe(row['player_positions']))
-            print('Overall:', row['overall'], '| Potential:', row['potential'])
-            print('Klub:', display_safe(row['club_name']))
-            print('Negara:', display_safe(row['nationality_name']))
-            print('-'*60)
-        
-        if len(results) > limit:
-            print('\n... dan', len(results) - limit, 'pemain lainnya (menampilkan', limit, 'teratas)')
+        return
+    dataset = query.dataset
+    cursor = ResultCursor(lambda k: query.refine().top(k, by=by).row_ids(), total,
+                          page_size=limit or DEFAULT_PAGE_SIZE)
+    as_table = False
+    show_page = True
+    while True:
+        if show_page:
+            rows = cursor.current()
+            with profile.stage('render', len(rows)):
+                if as_table:
+                    print('\n' + format_table(dataset, rows, start=cursor.start + 1))
+                else:
+                    print(format_blocks(dataset, rows))
+            print(f'\nHalaman {cursor.page + 1} dari {cursor.pages} ({total} pemain)')
+        options = []
+        if cursor.has_next():
+            options.append('n = berikutnya')
+        if cursor.has_prev():
+            options.append('p = sebelumnya')
+        options += ['t = tabel/blok', 'e = ekspor', 'Enter = lanjut']
+        choice = input('\n' + ' | '.join(options) + ': ').strip().lower()
+        show_page = True
+        if choice == '':
+            return
+        elif choice == 'n' and cursor.has_next():
+            cursor.next()
+        elif choice == 'p' and cursor.has_prev():
+            cursor.prev()
+        elif choice == 't':
+            as_table = not as_table
+        elif choice == 'e':
+            export_results(dataset, cursor.rows)
+            show_page = False
+        else:
+            print('[X] Pilihan tidak valid!')
+            show_page = False
+
+def choose_league(dataset):
+    """Menampilkan daftar liga dan meminta pilihan; mengembalikan nama liga atau None"""
+    leagues = dataset.indexes.hierarchy.league_names()
+    league_labels = dataset.labels('league_name')
+    print('\nDaftar Liga:')
+    for i, league in enumerate(leagues, 1):
+        print(f'{i}. {league_labels[league]}')
+    try:
+        league_choice = int(input('\nPilih nomor liga: ').strip())
+    except ValueError:
+        print('[X] Masukkan angka!')
+        return None
+    if not 1 <= league_choice <= len(leagues):
+        print('[X] Pilihan tidak valid!')
+        return None
+    return leagues[league_choice - 1]
+
+def format_number(value, digits=1):
+    return '-' if value is None or value != value else f'{value:,.{digits}f}'
+
+def print_summary(summary):
+    """Mencetak ringkasan satu kelompok pemain (hasil cube.summary)"""
+    print(f'\nJumlah pemain : {summary["players"]}')
+    for measure, title in (('overall', 'Overall'), ('potential', 'Potensi'), ('age', 'Umur')):
+        print(f'{title:<14}: rata-rata {format_number(summary[f"avg_{measure}"])} '
+              f'(min {format_number(summary[f"min_{measure}"], 0)}, '
+              f'maks {format_number(summary[f"max_{measure}"], 0)})')
+    print(f'Nilai pasar   : total EUR {format_number(summary["sum_value_eur"], 0)}, '
+          f'rata-rata EUR {format_number(summary["avg_value_eur"], 0)}')
+    print(f'Gaji          : total EUR {format_number(summary["sum_wage_eur"], 0)}, '
+          f'rata-rata EUR {format_number(summary["avg_wage_eur"], 0)}')
+
+def print_breakdown(frame, title, dim, sort=None, limit=None):
+    """Mencetak tabel agregat per kelompok (hasil cube.query)"""
+    import pandas as pd
+
+    if sort:
+        frame = frame.sort_values(sort, ascending=False, kind='stable')
+    if limit:
+        frame = frame.head(limit)
+    table = pd.DataFrame({
+        title: frame[dim],
+        'Pemain': frame['players'],
+        'OVR rata2': frame['avg_overall'].round(1),
+        'OVR maks': frame['max_overall'].astype('Int64'),
+        'POT rata2': frame['avg_potential'].round(1),
+        'Umur rata2': frame['avg_age'].round(1),
+    })
+    print('\n' + table.to_string(index=False, na_rep='-'))
+
+def print_histogram(histogram, title):
+    """Mencetak histogram rating sebagai batang teks"""
+    if histogram.empty:
+        return
+    print(f'\nSebaran {title}:')
+    scale = 40 / histogram.max()
+    for label, count in histogram.items():
+        print(f'{label:>7} | {"#" * max(1, round(count * scale)) if count else "":<40} {count}')
+
+def show_club_summary(dataset):
+    """Ringkasan satu klub dari cube agregat"""
+    print('\n' + '='*60)
+    print('RINGKASAN KLUB')
+    print('='*60)
+    league = choose_league(dataset)
+    if league is None:
+        return
+    clubs = dataset.indexes.hierarchy.clubs_in(league)
+    club_labels = dataset.labels('club_name')
+    print(f'\nDaftar Klub di {dataset.labels("league_name")[league]}:')
+    for i, club_name in enumerate(clubs, 1):
+        print(f'{i}. {club_labels[club_name]}')
+    try:
+        club_choice = int(input('\nPilih nomor klub: ').strip())
+    except ValueError:
+        print('[X] Masukkan angka!')
+        return
+    if not 1 <= club_choice <= len(clubs):
+        print('[X] Pilihan tidak valid!')
+        return
+    club = clubs[club_choice - 1]
+    
+    from player_analytics import analytics_cube
+
+    cube = analytics_cube(dataset)
+    print('\n' + '='*60)
+    print('RINGKASAN', club_labels[club])
+    print('='*60)
+    print_summary(cube.summary(club=club))
+    print_breakdown(cube.query(['position'], club=club), 'Posisi', 'position')
+    print_breakdown(cube.query(['age_band'], club=club), 'Umur', 'age_band')
+    print_breakdown(cube.query(['nationality'], club=club), 'Negara', 'nationality',
+                    sort='players', limit=10)
+    print_histogram(cube.histogram('overall', club=club), 'overall')
+
+def show_league_summary(dataset):
+    """Ringkasan satu liga (per klub, posisi, dan umur) dari cube agregat"""
+    print('\n' + '='*60)
+    print('RINGKASAN LIGA')
+    print('='*60)
+    league = choose_league(dataset)
+    if league is None:
+        return
+    
+    from player_analytics import analytics_cube
+
+    cube = analytics_cube(dataset)
+    print('\n' + '='*60)
+    print('RINGKASAN', dataset.labels('league_name')[league])
+    print('='*60)
+    print_summary(cube.summary(league=league))
+    print_breakdown(cube.query(['club'], league=league), 'Klub', 'club', sort='avg_overall')
+    print_breakdown(cube.query(['position'], league=league), 'Posisi', 'position')
+    print_breakdown(cube.query(['age_band'], league=league), 'Umur', 'age_band')
+    print_histogram(cube.histogram('potential', league=league), 'potensi')
+
+def read_optional_number(prompt):
+    """Angka opsional dari input (Enter = tanpa batas); ValueError jika bukan angka"""
+    text = input(prompt).strip().replace(',', '').replace('.', '')
+    return int(text) if text else None
+
+def build_best_squad(dataset):
+    """Menyusun skuad terbaik untuk satu formasi dengan batasan budget dan komposisi"""
+    from player_squad import DEFAULT_FORMATION, FORMATIONS, build_squad, parse_formation, squad_frame
+
+    print('\n' + '='*60)
+    print('SUSUN SKUAD TERBAIK')
+    print('='*60)
+    print('\nFormasi:', ', '.join(FORMATIONS), '(atau daftar slot, misal GK,CB,CB,CB,...)')
+    formation = input(f'Pilih formasi (Enter = {DEFAULT_FORMATION}): ').strip() or DEFAULT_FORMATION
+    try:
+        parse_formation(formation)
+    except ValueError as e:
+        print('[X]', e)
+        return
+    by = 'potential' if input('Maksimalkan (1) overall atau (2) potensi? (Enter = 1): ').strip() == '2' else 'overall'
+    
+    try:
+        budget = read_optional_number('\nBudget nilai pasar total (EUR, Enter = tanpa batas): ')
+        wage_cap = read_optional_number('Batas gaji total (EUR/minggu, Enter = tanpa batas): ')
+        min_age = read_optional_number('Umur minimum (Enter = tanpa batas): ')
+        max_age = read_optional_number('Umur maksimum (Enter = tanpa batas): ')
+        max_per_club = read_optional_number('Pemain maksimal per klub (Enter = tanpa batas): ')
+        max_per_nation = read_optional_number('Pemain maksimal per negara (Enter = tanpa batas): ')
+    except ValueError:
+        print('[X] Masukkan angka!')
+        return
+    
+    # Filter opsional (misal hanya liga tertentu); posisi ditentukan oleh formasi
+    candidates = None
+    filter_choice = input('\nApakah Anda ingin membatasi kandidat dengan filter? (y/n): ').strip().lower()
+    if filter_choice == 'y':
+        query = apply_filter(dataset, dataset.query(), {'position'})
+        if query.predicates:
+            candidates = query.row_ids()
+    
+    try:
+        with profile.stage('squad', len(dataset) if candidates is None else len(candidates)) as stage:
+            squad = build_squad(dataset, formation, by=by, budget=budget, wage_cap=wage_cap,
+                                min_age=min_age, max_age=max_age, max_per_nation=max_per_nation,
+                                max_per_club=max_per_club, candidates=candidates)
+            stage.rows_out = 0 if squad is None else len(squad['rows'])
+    except ValueError as e:
+        print('[X]', e)
+        return
+    if squad is None:
+        print('\n[X] Tidak ada skuad yang memenuhi semua batasan')
+        return
+    
+    print(f'\n[OK] Skuad terbaik {formation} (total {by} {squad["score"]:.0f}):\n')
+    print(squad_frame(dataset, squad).to_string(index=False, na_rep='-'))
+    print(f'\nTotal nilai pasar: EUR {squad["value_eur"]:,.0f}')
+    print(f'Total gaji       : EUR {squad["wage_eur"]:,.0f}')
+    if not squad['optimal']:
+        print('[INFO] Pencarian dipotong batas waktu: skuad mendekati optimal')
 
 def show_menu():
     """Menampilkan menu utama"""
@@ -533,42 +848,126 @@ def show_menu():
     print('4. Cari berdasarkan potensi (range)')
     print('5. Cari berdasarkan umur (range)')
     print('6. Cari berdasarkan posisi')
+    print('7. Cari nama (toleran salah ketik)')
+    print('8. Cari pemain mirip (atribut skill)')
+    print('9. Ringkasan klub')
+    print('10. Ringkasan liga')
+    print('11. Susun skuad terbaik')
     print('0. Keluar')
     print('='*60)
 
-def main():
+# Pilihan menu utama -> fungsi pencarian (urutan sama dengan show_menu)
+MENU_ACTIONS = {
+    '1': search_by_name,
+    '2': search_by_club,
+    '3': search_by_country,
+    '4': search_by_potential,
+    '5': search_by_age,
+    '6': search_by_position,
+    '7': search_by_name_fuzzy,
+    '8': search_similar,
+    '9': show_club_summary,
+    '10': show_league_summary,
+    '11': build_best_squad,
+}
+
+def positive_int(text):
+    """Tipe argparse: bilangan bulat minimal 1"""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'bukan bilangan bulat: {text}')
+    if value < 1:
+        raise argparse.ArgumentTypeError(f'minimal 1, bukan {value}')
+    return value
+
+def run_once(args):
+    """Satu pencarian dari argumen command line, tanpa menu interaktif"""
+    # Satu query hanya menyentuh sebagian indeks; sisanya tidak perlu dibangun
+    dataset = load_data(args.csv, lazy_indexes=True)
+    if dataset is None:
+        return 1
+    
+    from player_query import build_query
+    from player_render import format_blocks, format_table
+
+    spec = {key: getattr(args, key) for key in QUERY_ARGS if getattr(args, key) is not None}
+    spec['position_mode'] = args.position_mode
+    try:
+        with profile.query('Argumen'):
+            query = build_query(dataset, spec)
+            total = query.count()
+            top = ONE_SHOT_TOP if args.top is None else args.top
+            rows = query.refine().top(top, by=args.by).row_ids()
+            with profile.stage('render', len(rows)):
+                text = format_table(dataset, rows) if args.table else format_blocks(dataset, rows)
+    except ValueError as e:
+        print('[ERROR]', e)
+        return 1
+    if total == 0:
+        print('[X] Tidak ada pemain ditemukan')
+        return 1
+    print(f'[OK] Ditemukan {total} pemain, {len(rows)} teratas menurut {args.by}:')
+    print(('\n' if args.table else '') + text)
+    return 0
+
+def main(argv=None):
     """Fungsi utama program"""
+    parser = argparse.ArgumentParser(description='Pencarian interaktif data pemain FIFA')
+    parser.add_argument('--csv', help='Lokasi dataset pemain (default csv_files/fifa_players.csv)')
+    parser.add_argument('--profile', action='store_true',
+                        help=f'Cetak rincian waktu per tahap setiap pencarian (juga lewat {profile.ENV_VAR}=1)')
+    parser.add_argument('--profile-output',
+                        help='Simpan trace profiling ke .json atau dump cProfile ke .prof')
+    parser.add_argument('--profile-no-memory', action='store_true',
+                        help='Jangan ukur alokasi memori (overhead profiling lebih kecil)')
+    once = parser.add_argument_group('pencarian sekali jalan (tanpa menu)')
+    once.add_argument('--name', help='Nama pemain (boleh sebagian, tanpa aksen)')
+    once.add_argument('--club', help='Nama klub (persis)')
+    once.add_argument('--league', help='Nama liga (persis)')
+    once.add_argument('--country', help='Negara (persis)')
+    once.add_argument('--positions', help='Posisi, misal CB atau "CB|LB"')
+    once.add_argument('--position-mode', default='any', choices=('any', 'all', 'primary'))
+    for key in ('potential', 'age', 'overall'):
+        once.add_argument(f'--{key}', type=int, nargs=2, metavar=('MIN', 'MAX'))
+    once.add_argument('--top', type=positive_int,
+                      help=f'Jumlah pemain yang ditampilkan (default {ONE_SHOT_TOP})')
+    once.add_argument('--by', default='overall', choices=('overall', 'potential'), help='Urutan hasil')
+    once.add_argument('--table', action='store_true', help='Tampilkan sebagai tabel')
+    args = parser.parse_args(argv)
+    if args.profile or args.profile_output:
+        profile.enable(memory=not args.profile_no_memory, output=args.profile_output)
+    
+    if args.top is not None or any(getattr(args, key) is not None for key in QUERY_ARGS):
+        return run_once(args)
+    
+    # Data dimuat sambil menu ditampilkan; saat profiling dimuat di depan agar ikut terukur
     print('\nMemuat data pemain...')
-    df = load_data()
-    
-    if df is None:
-        print('\nProgram tidak dapat berjalan tanpa data.')
-        return
+    loader = DataLoader(args.csv, background=not profile.active())
     
     while True:
         show_menu()
-        choice = input('\nMasukkan pilihan (1-6, atau 0 untuk keluar): ').strip()
+        choice = input('\nMasukkan pilihan (1-11, atau 0 untuk keluar): ').strip()
         
         if choice == '0':
             print('\nTerima kasih telah menggunakan program ini!')
             break
-        elif choice == '1':
-            search_by_name(df)
-        elif choice == '2':
-            search_by_club(df)
-        elif choice == '3':
-            search_by_country(df)
-        elif choice == '4':
-            search_by_potential(df)
-        elif choice == '5':
-            search_by_age(df)
-        elif choice == '6':
-            search_by_position(df)
+        action = MENU_ACTIONS.get(choice)
+        if action is None:
+            print('\n[X] Pilihan tidak valid! Masukkan angka 1-11, atau 0.')
         else:
-            print('\n[X] Pilihan tidak valid! Masukkan angka 1-6, atau 0.')
+            dataset = loader.wait()
+            if dataset is None:
+                print('\nProgram tidak dapat berjalan tanpa data.')
+                return 1
+            # Tahap-tahap satu pencarian dilaporkan bersama saat pencarian selesai
+            with profile.query(f'Menu {choice}'):
+                action(dataset)
+            if profile.active():
+                print('[PROFILE] cache hasil:', dataset.cache.stats(), file=sys.stderr)
         
         input('\nTekan Enter untuk melanjutkan...')
+    return 0
 
 if __name__ == '__main__':
-    main()
-
+    sys.exit(main())
@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""Server HTTP lokal (asyncio) untuk pencarian pemain.
+
+Dataset dan indeks dimuat sekali lalu dipakai bersama oleh semua analis.
+Query dijalankan di worker pool sehingga query lambat tidak menahan query
+cepat; daftar liga/klub/negara dijawab langsung dari indeks.
+
+Contoh:
+    python search_server.py --port 8765 --workers 4
+    curl "http://127.0.0.1:8765/search?country=Spain&age=18-21&positions=CB,LB&page_size=20"
+
+Endpoint (semua mengembalikan JSON):
+    GET  /health
+    GET  /leagues, /clubs?league=..., /countries, /positions
+    GET  /search?name=&club=&league=&country=&potential=80-99&age=18-21
+                 &positions=CB,LB&position_mode=any&by=overall&page_size=20
+    GET  /search?page_token=...          (halaman berikutnya)
+    POST /search                          (body: spesifikasi JSON seperti mode batch)
+    GET  /fuzzy?name=haland&threshold=0.5&max_edits=1&limit=20
+"""
+import argparse
+import asyncio
+import base64
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import sys
+from urllib.parse import parse_qs, urlsplit
+
+from batch_search import OUTPUT_COLUMNS, plain_value
+from player_index import POSITION_CODES, positions_in
+from player_query import SPEC_RANGES, build_query, load_dataset
+from player_store import DEFAULT_CSV_PATH, fold_text
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 500
+# Batas ukuran header/body request agar klien nakal tidak menghabiskan memori
+MAX_BODY_BYTES = 1 << 20
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+                405: 'Method Not Allowed', 413: 'Payload Too Large',
+                500: 'Internal Server Error'}
+
+# Dataset milik proses worker (diwarisi lewat fork atau dimuat initializer)
+_DATASET = None
+
+class RequestError(Exception):
+    """Kesalahan input dari klien (dikembalikan sebagai HTTP 4xx)"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def parse_range(text):
+    """'80-99', '80-' atau '-21' menjadi [min, max]"""
+    low, sep, high = text.partition('-')
+    if not sep:
+        low = high = text
+    try:
+        return [float(low) if low else float('-inf'), float(high) if high else float('inf')]
+    except ValueError:
+        raise RequestError(f'Range tidak valid: {text}')
+
+def spec_from_params(params):
+    """Spesifikasi query (format batch) dari parameter URL"""
+    spec = {}
+    for key in ('name', 'club', 'league', 'country', 'position_mode', 'by'):
+        if params.get(key):
+            spec[key] = params[key]
+    for key in SPEC_RANGES:
+        if params.get(key):
+            spec[key] = parse_range(params[key])
+    if params.get('positions'):
+        spec['positions'] = [p.strip() for p in params['positions'].replace('|', ',').split(',') if p.strip()]
+    return spec
+
+def encode_token(spec, offset, size):
+    """Token halaman berikutnya: spesifikasi + offset, tanpa state di server"""
+    payload = json.dumps({'spec': spec, 'offset': offset, 'size': size}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+def decode_token(token):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+        spec, offset, size = payload['spec'], int(payload['offset']), int(payload['size'])
+    except (ValueError, KeyError, TypeError):
+        raise RequestError('page_token tidak valid')
+    # Offset negatif memberi halaman kosong dengan token yang sama (paging tidak pernah selesai)
+    if not isinstance(spec, dict) or offset < 0:
+        raise RequestError('page_token tidak valid')
+    return spec, offset, size
+
+def run_search(spec, offset, size):
+    """Menjalankan satu halaman query di worker; mengembalikan dict hasil"""
+    query = build_query(_DATASET, {k: v for k, v in spec.items() if k != 'top'})
+    rows = query.page(offset, size, by=spec.get('by') or 'overall')
+    columns = [c for c in OUTPUT_COLUMNS if c in _DATASET.df.columns]
+    players = [{col: plain_value(value) for col, value in record.items()}
+               for record in query.records(columns, rows)]
+    return {'total': int(query.count()), 'offset': offset, 'players': players}
+
+def run_fuzzy(name, threshold, max_edits, limit):
+    """Pencarian nama toleran salah ketik di worker"""
+    rows, scores = _DATASET.indexes.names.fuzzy(fold_text(name), threshold=threshold,
+                                                limit=limit, max_edits=max_edits)
+    columns = [c for c in OUTPUT_COLUMNS if c in _DATASET.df.columns]
+    players = [{col: plain_value(value) for col, value in record.items()}
+               for record in _DATASET.query().records(columns, rows)]
+    for player, score in zip(players, scores.tolist()):
+        player['similarity'] = round(score, 4)
+    return {'total': len(players), 'players': players}
+
+def _init_worker(csv_path):
+    """Initializer worker spawn: memuat snapshot lewat memory-map"""
+    global _DATASET
+    if _DATASET is None:
+        _DATASET = load_dataset(csv_path)
+
+def make_executor(workers, csv_path):
+    """Worker pool untuk query; 0 = thread pool di proses yang sama"""
+    if workers == 0:
+        return concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+    if 'fork' in multiprocessing.get_all_start_methods():
+        # Worker hasil fork mewarisi dataset yang sudah dimuat (copy-on-write)
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context('fork'))
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker, initargs=(csv_path,))
+
+class SearchServer:
+    """Server HTTP/1.1 minimal (keep-alive) di atas asyncio streams"""
+
+    def __init__(self, dataset, executor):
+        self.dataset = dataset
+        self.executor = executor
+
+    async def run_in_pool(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def route(self, method, path, params, body):
+        """Menentukan handler; mengembalikan payload JSON (dict)"""
+        indexes = self.dataset.indexes
+        if path == '/health':
+            return {'status': 'ok', 'players': len(self.dataset)}
+        if path == '/leagues':
+            return {'leagues': indexes.hierarchy.league_names()}
+        if path == '/clubs':
+            if params.get('league'):
+                return {'clubs': indexes.hierarchy.clubs_in(params['league'])}
+            return {'clubs': indexes.hierarchy.clubs.labels()}
+        if path == '/countries':
+            return {'countries': indexes.nations.labels()}
+        if path == '/positions':
+            present = positions_in(self.dataset.column('position_mask'))
+            return {'positions': [p for p in POSITION_CODES if p in present]}
+        if path == '/search':
+            return await self.search(method, params, body)
+        if path == '/fuzzy':
+            if not params.get('name'):
+                raise RequestError('Parameter name wajib diisi')
+            try:
+                threshold = float(params.get('threshold') or 0.5)
+                max_edits = int(params['max_edits']) if params.get('max_edits') else None
+                limit = min(int(params.get('limit') or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+            except ValueError:
+                raise RequestError('threshold/max_edits/limit harus angka')
+            if limit < 1:
+                raise RequestError('limit minimal 1')
+            return await self.run_in_pool(run_fuzzy, params['name'], threshold, max_edits, limit)
+        raise RequestError('Endpoint tidak ditemukan', status=404)
+
+    async def search(self, method, params, body):
+        if params.get('page_token'):
+            spec, offset, size = decode_token(params['page_token'])
+        else:
+            if method == 'POST':
+                try:
+                    spec = json.loads(body or b'{}')
+                except ValueError:
+                    raise RequestError('Body harus JSON')
+                if not isinstance(spec, dict):
+                    raise RequestError('Body harus objek JSON')
+            else:
+                spec = spec_from_params(params)
+            offset = 0
+            try:
+                size = int(params.get('page_size') or spec.pop('page_size', None) or DEFAULT_PAGE_SIZE)
+            except (ValueError, TypeError):
+                raise RequestError('page_size harus angka')
+        size = max(1, min(size, MAX_PAGE_SIZE))
+        try:
+            result = await self.run_in_pool(run_search, spec, offset, size)
+        except (ValueError, KeyError) as e:
+            raise RequestError(str(e))
+        next_offset = offset + len(result['players'])
+        if next_offset < result['total']:
+            result['next_page_token'] = encode_token(spec, next_offset, size)
+        return result
+
+    async def handle(self, reader, writer):
+        """Melayani satu koneksi; beberapa request per koneksi (keep-alive)"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                # Hanya digit: int() juga menerima tanda, spasi, dan '_'
+                length = headers.get('content-length') or '0'
+                if not length.isdecimal():
+                    await self.respond(writer, 400, {'error': 'Content-Length tidak valid'}, keep_alive=False)
+                    break
+                length = int(length)
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, 413, {'error': 'Body terlalu besar'}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                status, payload = await self.dispatch(method, target, body)
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1')
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, target, body):
+        if method not in ('GET', 'POST'):
+            return 405, {'error': 'Hanya GET dan POST yang didukung'}
+        url = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            return 200, await self.route(method, url.path, params, body)
+        except RequestError as e:
+            return e.status, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': str(e)}
+
+    async def respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (f'HTTP/1.1 {status} {HTTP_REASONS.get(status, "")}\r\n'
+                'Content-Type: application/json; charset=utf-8\r\n'
+                f'Content-Length: {len(body)}\r\n'
+                f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n')
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+async def serve(dataset, executor, host, port):
+    server = SearchServer(dataset, executor)
+    tcp_server = await asyncio.start_server(server.handle, host, port)
+    print(f'[OK] Server berjalan di http://{host}:{port} (Ctrl+C untuk berhenti)')
+    async with tcp_server:
+        await tcp_server.serve_forever()
+
+def main(argv=None):
+    global _DATASET
+    parser = argparse.ArgumentParser(description='Server HTTP lokal untuk pencarian pemain')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--data', default=DEFAULT_CSV_PATH, help='Lokasi fifa_players.csv')
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count() or 1,
+                        help='Jumlah proses worker (0 = thread di proses server)')
+    args = parser.parse_args(argv)
+
+    print('\nMemuat data pemain...')
+    try:
+        _DATASET = load_dataset(args.data)
+    except FileNotFoundError:
+        print('[ERROR] File tidak ditemukan di', args.data)
+        return 1
+    print('[OK] Data berhasil dimuat:', len(_DATASET), 'pemain ditemukan')
+
+    executor = make_executor(args.workers, args.data)
+    try:
+        asyncio.run(serve(_DATASET, executor, args.host, args.port))
+    except KeyboardInterrupt:
+        print('\nServer dihentikan.')
+    finally:
+        executor.shutdown(cancel_futures=True)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
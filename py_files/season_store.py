@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""Data multi-musim: satu partisi kolumnar per musim (edisi FIFA).
+
+Setiap file `players_<musim>.csv` di folder musim punya snapshot sendiri,
+sehingga menambah musim baru tidak memproses ulang musim lain. Query hanya
+membuka musim yang diminta, dan join antar musim memakai sofifa_id
+(integer), bukan nama.
+
+Contoh:
+    store = SeasonStore()
+    store.trajectory(158023, 'potential')            # potensi per musim
+    store.risers('overall', min_delta=5, max_age=19)  # U20 yang naik 5+ poin
+"""
+import os
+import re
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from player_query import load_dataset
+from player_store import read_columns
+
+# Folder berisi satu CSV per musim, misal players_21.csv, players_22.csv
+SEASONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'csv_files', 'seasons')
+SEASON_FILE_PATTERN = re.compile(r'^(?:fifa_)?players_(\d+)\.csv$', re.IGNORECASE)
+
+# Kunci pemain yang stabil antar musim
+PLAYER_ID_COLUMN = 'sofifa_id'
+
+# Jumlah musim yang dimuat lengkap (dengan indeks) sekaligus di memori
+MAX_LOADED_SEASONS = 2
+
+def season_files(folder=SEASONS_DIR):
+    """Daftar file musim {musim: path}, terurut menurut musim"""
+    if not os.path.isdir(folder):
+        return {}
+    found = {}
+    for filename in os.listdir(folder):
+        match = SEASON_FILE_PATTERN.match(filename)
+        if match:
+            found[int(match.group(1))] = os.path.join(folder, filename)
+    return dict(sorted(found.items()))
+
+class SeasonStore:
+    """Kumpulan partisi per musim yang dibuka sesuai kebutuhan"""
+
+    def __init__(self, folder=SEASONS_DIR, max_loaded=MAX_LOADED_SEASONS):
+        self.folder = folder
+        self.max_loaded = max_loaded
+        self.paths = season_files(folder)
+        self._datasets = OrderedDict()
+
+    def seasons(self):
+        """Daftar musim yang tersedia"""
+        return list(self.paths)
+
+    def refresh(self):
+        """Membaca ulang folder musim (misal setelah file musim baru ditambahkan)"""
+        self.paths = season_files(self.folder)
+        for season in list(self._datasets):
+            if season not in self.paths:
+                del self._datasets[season]
+
+    def path(self, season):
+        if season not in self.paths:
+            raise ValueError(f'Musim tidak ditemukan: {season}')
+        return self.paths[season]
+
+    def select(self, seasons=None):
+        """Musim yang dipakai sebuah query (semua jika None), terurut"""
+        if seasons is None:
+            return self.seasons()
+        chosen = sorted({int(season) for season in seasons})
+        for season in chosen:
+            self.path(season)
+        return chosen
+
+    def dataset(self, season):
+        """PlayerDataset lengkap satu musim; paling banyak max_loaded disimpan"""
+        if season in self._datasets:
+            self._datasets.move_to_end(season)
+            return self._datasets[season]
+        dataset = load_dataset(self.path(season))
+        self._datasets[season] = dataset
+        while len(self._datasets) > self.max_loaded:
+            self._datasets.popitem(last=False)
+        return dataset
+
+    def query(self, season):
+        """PlayerQuery atas satu musim"""
+        return self.dataset(season).query()
+
+    def columns(self, season, columns):
+        """Beberapa kolom satu musim, terurut menurut sofifa_id.
+
+        Hanya kolom yang diminta yang dibuka (memory-map dari snapshot).
+        Mengembalikan (ids, {kolom: array}); id ganda diambil yang pertama.
+        """
+        df = read_columns(self.path(season), [PLAYER_ID_COLUMN] + list(columns))
+        ids, first = np.unique(df[PLAYER_ID_COLUMN].to_numpy(), return_index=True)
+        return ids, {col: df[col].to_numpy()[first] for col in columns}
+
+    def trajectory(self, player_id, column='potential', seasons=None):
+        """Nilai satu kolom untuk satu pemain di setiap musim (Series per musim)"""
+        values = {}
+        for season in self.select(seasons):
+            ids, data = self.columns(season, [column])
+            i = np.searchsorted(ids, player_id)
+            if i < len(ids) and ids[i] == player_id:
+                values[season] = data[column][i]
+        return pd.Series(values, name=column, dtype=float)
+
+    def compare(self, column, season_from, season_to, extra=('age', 'short_name')):
+        """Join dua musim pada sofifa_id untuk pemain yang ada di keduanya.
+
+        Kolom `extra` diambil dari musim `season_to`.
+        """
+        ids_from, data_from = self.columns(season_from, [column])
+        ids_to, data_to = self.columns(season_to, [column] + list(extra))
+        common, i_from, i_to = np.intersect1d(ids_from, ids_to, assume_unique=True,
+                                              return_indices=True)
+        before = data_from[column][i_from].astype(np.float64)
+        after = data_to[column][i_to].astype(np.float64)
+        frame = pd.DataFrame({
+            PLAYER_ID_COLUMN: common,
+            'season_from': season_from,
+            'season_to': season_to,
+            column + '_from': before,
+            column + '_to': after,
+            'delta': after - before,
+        })
+        for col in extra:
+            frame[col] = data_to[col][i_to]
+        return frame
+
+    def risers(self, column='overall', min_delta=5, max_age=None, seasons=None):
+        """Pemain yang nilai `column`-nya naik >= min_delta dari musim ke musim berikutnya.
+
+        `max_age` dicek pada umur di musim yang lebih baru.
+        """
+        chosen = self.select(seasons)
+        frames = []
+        for season_from, season_to in zip(chosen, chosen[1:]):
+            frame = self.compare(column, season_from, season_to)
+            keep = frame['delta'] >= min_delta
+            if max_age is not None:
+                keep &= frame['age'] <= max_age
+            frames.append(frame[keep])
+        if not frames:
+            return pd.DataFrame(columns=[PLAYER_ID_COLUMN, 'season_from', 'season_to',
+                                         column + '_from', column + '_to', 'delta'])
+        result = pd.concat(frames, ignore_index=True)
+        return result.sort_values(['delta', PLAYER_ID_COLUMN], ascending=[False, True],
+                                  ignore_index=True)